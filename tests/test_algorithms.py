@@ -4,16 +4,33 @@ test_algorithms.py
 Unit tests for the multi-lift scheduling algorithms:
   - SCAN_lift
   - LOOK_lift
-  - MYLIFT_lift
+  - MYLIFT_lift (and MyLiftScheduler)
 
 Each function is tested on a single Lift instance (from lift.py).
 We check that the lift ends up on the correct floor, and that 
 all requests are serviced by the end of the algorithm.
 """
 
+import random
 import unittest
+from unittest.mock import patch
+import algorithms
 from lift import Lift
-from algorithms import SCAN_lift, LOOK_lift, MYLIFT_lift
+from algorithms import SCAN_lift, LOOK_lift, MYLIFT_lift, MyLiftScheduler
+
+
+def brute_force_best(lift, timeWaited):
+    """
+    The original MYLIFT choice: first floor in list order with the lowest
+    distance - wait_time.
+    """
+    best_priority, best_floor = float('inf'), None
+    for floor_req in lift.requests:
+        priority = abs(floor_req - lift.current_floor) - timeWaited.get(floor_req, 0)
+        if priority < best_priority:
+            best_priority, best_floor = priority, floor_req
+    return best_floor
+
 
 class TestAlgorithms(unittest.TestCase):
 
@@ -88,5 +105,95 @@ class TestAlgorithms(unittest.TestCase):
         self.assertEqual(lift.serviced_requests, 3, 
                          "Should have serviced exactly 3 requests.")
 
+    def test_MyLiftScheduler_matches_brute_force(self):
+        """
+        Step by step, the heap-based scheduler picks the same floor as the
+        full scan, with requests added and withdrawn while the lift moves.
+        """
+        rng = random.Random(5)
+        for trial in range(30):
+            top = rng.randint(2, 40)
+            lift = Lift(lift_id=0, start_floor=rng.randint(1, top), top_floor=top)
+            for _ in range(rng.randint(1, 15)):
+                lift.add_request(rng.randint(1, top))
+            waited = {f: rng.randint(0, 5) for f in lift.requests}
+            scheduler = MyLiftScheduler(lift, waited)
+            for _ in range(300):
+                if rng.random() < 0.2:
+                    floor = rng.randint(1, top)
+                    if floor not in lift.requests:
+                        waited[floor] = 0
+                    lift.add_request(floor)
+                if rng.random() < 0.05 and lift.requests:
+                    lift.requests.remove(rng.choice(list(lift.requests)))
+                if not lift.requests:
+                    continue
+                expected = brute_force_best(lift, waited)
+                self.assertEqual(scheduler.best_floor(), expected)
+                for f in lift.requests:
+                    self.assertEqual(scheduler.wait_time(f), waited[f])
+                scheduler.step()
+                for f in lift.requests:
+                    waited[f] += 1
+
+    def test_MY_LIFT_lift_records_wait_times(self):
+        """
+        timeWaited ends up holding each floor's wait when it was serviced,
+        as if every pending floor were aged by one per step (2 is serviced
+        in the first step, before it ever waits, so it gets no entry).
+        """
+        lift = Lift(lift_id=0, start_floor=1, top_floor=10)
+        for floor in (9, 2, 6):
+            lift.add_request(floor)
+        timeWaited = {9: 4}
+        MYLIFT_lift(lift, timeWaited)
+        # 2 goes first (priority 1), then 9 (7 - 5 = 2 beats 4 - 1 = 3),
+        # then back down to 6
+        self.assertEqual(timeWaited, {9: 11, 6: 10})
+        self.assertEqual(lift.floors_traveled, 1 + 7 + 3)
+
+    def test_MY_LIFT_lift_wait_times_when_interrupted(self):
+        """
+        If MYLIFT_lift stops part-way, timeWaited holds what ageing every
+        pending floor by one per step would have left: the current wait of
+        each pending floor and the wait of each serviced one.
+        """
+        rng = random.Random(5)
+        floors = rng.sample(range(1, 31), 12)
+        reference = Lift(lift_id=0, start_floor=15, top_floor=30)
+        lift = Lift(lift_id=0, start_floor=15, top_floor=30)
+        for floor in floors:
+            reference.add_request(floor)
+            lift.add_request(floor)
+        steps = 9
+        expected = {floors[0]: 3}
+        for _ in range(steps):
+            best_floor = brute_force_best(reference, expected)
+            if best_floor > reference.current_floor:
+                reference.current_floor += 1
+            elif best_floor < reference.current_floor:
+                reference.current_floor -= 1
+            if reference.current_floor == best_floor:
+                reference.requests.remove(best_floor)
+            for floor in reference.requests:
+                expected[floor] = expected.get(floor, 0) + 1
+
+        real_run_step = algorithms.run_step
+        calls = []
+
+        def interrupted_run_step(lift, step, *args):
+            if len(calls) == steps:
+                raise KeyboardInterrupt
+            calls.append(step)
+            return real_run_step(lift, step, *args)
+
+        timeWaited = {floors[0]: 3}
+        with patch("algorithms.run_step", interrupted_run_step):
+            with self.assertRaises(KeyboardInterrupt):
+                MYLIFT_lift(lift, timeWaited)
+        self.assertEqual(lift.current_floor, reference.current_floor)
+        self.assertEqual(list(lift.requests), list(reference.requests))
+        self.assertEqual(timeWaited, expected)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+test_animation.py
+
+Unit tests for animation.py: the simulation clock (speed, pause) and the
+step animator that drives MultiLiftGUI's frame loop.
+"""
+
+import math
+import random
+import unittest
+
+from animation import MAX_SPEED, MIN_SPEED, FrameClock, StepAnimator
+from lift import Lift
+
+
+def make_lifts(num_lifts=50, num_floors=100, seed=0):
+    rng = random.Random(seed)
+    lifts = []
+    for i in range(num_lifts):
+        lf = Lift(lift_id=i, start_floor=rng.randint(1, num_floors), top_floor=num_floors)
+        lf.requests = sorted(rng.sample(range(1, num_floors + 1), 5))
+        lifts.append(lf)
+    return lifts
+
+
+def step_all(lifts):
+    for lf in lifts:
+        if lf.requests:
+            lf.next_step()
+
+
+class TestFrameClock(unittest.TestCase):
+
+    def test_advances_by_wall_time_times_speed(self):
+        clock = FrameClock(tick_seconds=0.5, speed=2.0)
+        self.assertEqual(clock.advance(10.0), 0.0)  # first reading only sets the origin
+        self.assertAlmostEqual(clock.advance(10.25), 1.0)
+        clock.set_speed(4.0)
+        self.assertAlmostEqual(clock.advance(10.5), 3.0)
+
+    def test_pause_freezes_time(self):
+        clock = FrameClock()
+        clock.advance(0.0)
+        clock.advance(1.0)
+        self.assertTrue(clock.toggle_pause())
+        self.assertAlmostEqual(clock.advance(5.0), 1.0)
+        clock.resume()
+        self.assertAlmostEqual(clock.advance(6.0), 2.0)  # paused wall time is not caught up
+
+    def test_speed_is_clamped(self):
+        clock = FrameClock()
+        self.assertEqual(clock.set_speed(1e9), MAX_SPEED)
+        self.assertEqual(clock.set_speed(0), MIN_SPEED)
+
+
+class TestStepAnimator(unittest.TestCase):
+
+    def test_matches_plain_stepping(self):
+        lifts, expected = make_lifts(), make_lifts()
+        animator = StepAnimator(lifts, lambda: step_all(lifts))
+        t = 0.0
+        while not animator.finished(t):
+            t += 0.3
+            animator.sync(t)
+            self.assertLessEqual(animator.ticks_done, math.ceil(t))
+        while any(lf.requests for lf in expected):
+            step_all(expected)
+        self.assertEqual([lf.current_floor for lf in lifts], [lf.current_floor for lf in expected])
+        self.assertEqual([lf.floors_traveled for lf in lifts], [lf.floors_traveled for lf in expected])
+
+    def test_positions_interpolate_within_a_step(self):
+        lf = Lift(lift_id=0, start_floor=1, top_floor=10)
+        lf.requests = [4]
+        animator = StepAnimator([lf], lf.next_step)
+        self.assertEqual(animator.positions(0.0), [1.0])
+        animator.sync(0.25)
+        self.assertEqual(animator.ticks_done, 1)
+        self.assertAlmostEqual(animator.positions(0.25)[0], 1.25)
+        self.assertAlmostEqual(animator.positions(1.0)[0], 2.0)
+        animator.sync(2.5)
+        self.assertAlmostEqual(animator.positions(2.5)[0], 3.5)
+
+    def test_frame_budget_and_behind(self):
+        lifts = make_lifts(num_lifts=3)
+        animator = StepAnimator(lifts, lambda: step_all(lifts), max_steps_per_frame=4)
+        self.assertEqual(animator.sync(100.0), 4)
+        self.assertTrue(animator.behind(100.0))
+        self.assertFalse(animator.behind(4.0))
+
+    def test_step_target_moves_one_tick(self):
+        lf = Lift(lift_id=0, start_floor=1, top_floor=10)
+        lf.requests = [3]
+        animator = StepAnimator([lf], lf.next_step)
+        t = animator.step_target(0.0)
+        animator.sync(t)
+        self.assertEqual((t, animator.ticks_done), (1.0, 1))
+        self.assertEqual(animator.positions(t), [2.0])
+        animator.sync(1.5)  # mid-way through the next step
+        self.assertEqual(animator.step_target(1.5), 2.0)
+
+    def test_finished_waits_for_last_step_to_be_drawn(self):
+        lf = Lift(lift_id=0, start_floor=1, top_floor=10)
+        lf.requests = [2]
+        animator = StepAnimator([lf], lf.next_step)
+        t = 0.1
+        while lf.requests:
+            animator.sync(t)
+            t += 0.1
+        self.assertFalse(animator.finished(animator.ticks_done - 0.5))
+        self.assertTrue(animator.finished(float(animator.ticks_done)))
+
+
+if __name__ == "__main__":
+    unittest.main()
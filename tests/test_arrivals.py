@@ -0,0 +1,95 @@
+"""
+test_arrivals.py
+
+Unit tests for streaming request ingestion (arrivals.py):
+  - JSONL and CSV timestamped arrivals
+  - the original text format as a t=0 stream
+  - validation of ordering, same-floor and out-of-building requests
+"""
+
+import os
+import shutil
+import tempfile
+import types
+import unittest
+
+from arrivals import Arrival, is_timestamped, iter_arrivals, read_building
+
+INPUT_MIXED = os.path.join(os.path.dirname(__file__), "..", "inputs", "input_mixed.txt")
+
+class TestArrivals(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_jsonl(self):
+        path = self.write("day.jsonl",
+                          '{"num_floors": 12, "capacity": 8}\n'
+                          '{"t": 0, "origin": 1, "destination": 5}\n'
+                          '\n'
+                          '{"t": 2.5, "origin": 9, "destination": 3}\n')
+        self.assertTrue(is_timestamped(path))
+        self.assertEqual(read_building(path), (12, 8))
+        stream = iter_arrivals(path)
+        self.assertIsInstance(stream, types.GeneratorType)
+        self.assertEqual(list(stream), [Arrival(0.0, 1, 5), Arrival(2.5, 9, 3)])
+
+    def test_csv(self):
+        path = self.write("day.csv", "# building\n10,4\nt,origin,destination\n0,1,4\n3,6,2\n")
+        self.assertEqual(read_building(path), (10, 4))
+        self.assertEqual(list(iter_arrivals(path)), [Arrival(0.0, 1, 4), Arrival(3.0, 6, 2)])
+
+    def test_text_format_arrives_at_zero(self):
+        self.assertFalse(is_timestamped(INPUT_MIXED))
+        self.assertEqual(read_building(INPUT_MIXED), (7, 4))
+        arrivals = list(iter_arrivals(INPUT_MIXED))
+        self.assertEqual(len(arrivals), 10)
+        self.assertTrue(all(a.t == 0 for a in arrivals))
+        self.assertEqual(arrivals[0], Arrival(0, 1, 3))
+
+    def test_unsorted_times_rejected(self):
+        path = self.write("bad.csv", "0,1,4\n5,2,3\n4,6,2\n")
+        with self.assertRaises(ValueError):
+            list(iter_arrivals(path))
+
+    def test_same_floor_rejected(self):
+        path = self.write("bad.jsonl", '{"t": 0, "origin": 3, "destination": 3}\n')
+        with self.assertRaises(ValueError):
+            list(iter_arrivals(path))
+
+    def test_outside_building_rejected(self):
+        path = self.write("far.jsonl", '{"num_floors": 10, "capacity": 4}\n'
+                                       '{"t": 0, "origin": 1, "destination": 50}\n')
+        self.assertEqual(len(list(iter_arrivals(path))), 1)  # bounds unknown
+        with self.assertRaisesRegex(ValueError, "outside the building"):
+            list(iter_arrivals(path, num_floors=10))
+        path = self.write("far.txt", "5, 4\n1: 3, 9\n")
+        with self.assertRaisesRegex(ValueError, "outside the building"):
+            list(iter_arrivals(path))
+
+    def test_csv_only_skips_header_rows(self):
+        path = self.write("bad.csv", "10,4\n0,1,4\n3,6\n5,2,3\n")
+        with self.assertRaises(ValueError):
+            list(iter_arrivals(path))
+        path = self.write("names.csv", "t,origin,destination\n0,1,4\nt,origin,destination\n")
+        with self.assertRaises(ValueError):
+            list(iter_arrivals(path))
+        path = self.write("names_only.csv", "t,origin,destination\n0,1,4\n")
+        self.assertEqual(list(iter_arrivals(path)), [Arrival(0.0, 1, 4)])
+
+    def test_missing_building_header(self):
+        path = self.write("nohdr.jsonl", '{"t": 0, "origin": 1, "destination": 3}\n')
+        with self.assertRaises(ValueError):
+            read_building(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+test_benchmark.py
+
+Unit tests for the benchmark suite (benchmark.py) and the traffic
+pattern generators it uses (workload.py).
+"""
+
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmark import compare, load_baseline, run_suite, save_baseline
+from main import parse_input_file
+from workload import GENERATORS, generate_config, write_input_file
+
+
+class TestTrafficPatterns(unittest.TestCase):
+
+    def pairs(self, pattern, floors=30, requests=2000):
+        config = generate_config(f"{pattern}:{floors}:{requests}", 0)
+        return [(origin, dest) for origin, dests in config["requests"].items() for dest in dests]
+
+    def test_every_pattern_is_seeded_and_valid(self):
+        for pattern in GENERATORS:
+            with self.subTest(pattern=pattern):
+                pairs = self.pairs(pattern)
+                self.assertEqual(len(pairs), 2000)
+                self.assertTrue(all(o != d and 1 <= o <= 30 and 1 <= d <= 30 for o, d in pairs))
+                self.assertEqual(generate_config(f"{pattern}:30:50", 1),
+                                 generate_config(f"{pattern}:30:50", 1))
+
+    def test_pattern_shapes(self):
+        up = self.pairs("up_peak")
+        self.assertGreater(sum(o == 1 for o, _ in up), 0.8 * len(up))
+        down = self.pairs("down_peak")
+        self.assertGreater(sum(d == 1 for _, d in down), 0.8 * len(down))
+        inter = self.pairs("inter_floor")
+        self.assertFalse(any(o == 1 or d == 1 for o, d in inter))
+
+    def test_written_input_file_round_trips(self):
+        config = generate_config("down_peak:12:100", 4)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "generated.txt")
+            write_input_file(config, path)
+            parsed = parse_input_file(path)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(parsed["num_floors"], 12)
+        self.assertEqual({f: d for f, d in parsed["requests"].items() if d}, config["requests"])
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_suite_baseline_and_compare(self):
+        document = run_suite("quick", patterns=["up_peak"], repeat=1)
+        self.assertEqual(len(document["results"]), 2 * 6)  # two building sizes x six benchmarks
+        for row in document["results"].values():
+            self.assertGreaterEqual(row["median_s"], row["best_s"])
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "baseline.json")
+            save_baseline(document, path)
+            baseline = load_baseline(path)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(baseline["results"], document["results"])
+        self.assertTrue(all(row["status"] == "ok" for row in compare(baseline, document)))
+
+        slower = copy.deepcopy(document)
+        key = next(iter(slower["results"]))
+        slower["results"][key]["best_s"] = baseline["results"][key]["best_s"] * 2 + 0.01
+        del slower["results"][sorted(slower["results"])[-1]]
+        statuses = {row["case"]: row["status"] for row in compare(baseline, slower, threshold=0.5)}
+        self.assertEqual(statuses[key], "regression")
+        self.assertEqual(statuses[sorted(baseline["results"])[-1]], "missing")
+        statuses = {row["case"]: row["status"] for row in compare(slower, baseline, threshold=0.5)}
+        self.assertEqual(statuses[key], "improvement")
+
+    def test_rejects_unknown_scale(self):
+        with self.assertRaises(ValueError):
+            run_suite("huge")
+
+if __name__ == '__main__':
+    unittest.main()
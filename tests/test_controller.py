@@ -0,0 +1,175 @@
+"""
+test_controller.py
+
+Unit tests for controller.py (the asyncio controller service) and the
+loadgen.py client, run against a service on a free localhost port.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import tempfile
+import unittest
+
+from controller import ControllerService, LiftController, encode
+from loadgen import run_load
+from simulation import prepare_lifts
+
+
+def make_controller(num_floors=10, num_lifts=2, algorithm="LOOK", dispatcher="least_loaded"):
+    return LiftController(prepare_lifts({"num_floors": num_floors, "num_lifts": num_lifts}),
+                          algorithm, dispatcher)
+
+
+class TestLiftController(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_hall_call_is_carried_to_destination(self):
+        for algorithm in ("SCAN", "LOOK", "MYLIFT"):
+            with self.subTest(algorithm=algorithm):
+                controller = make_controller(num_lifts=1, algorithm=algorithm)
+                lift = controller.lifts[controller.hall_call(4, destination=2)]
+                visited = []
+                while lift.requests:
+                    serviced = lift.serviced_requests
+                    controller.step()
+                    if lift.serviced_requests != serviced:
+                        visited.append(lift.current_floor)
+                self.assertEqual(visited, [4, 2])
+                self.assertEqual(controller.tick, 3 + 2)
+
+    def test_calls_are_spread_over_lifts(self):
+        controller = make_controller(num_floors=20, num_lifts=3)
+        lifts = {controller.hall_call(floor) for floor in (1, 10, 20)}
+        self.assertEqual(len(lifts), 3)
+
+    def test_invalid_calls_rejected(self):
+        controller = make_controller()
+        for floor, destination in ((0, None), (11, None), (3, 3), (3, 12), ("3", None),
+                                   (True, None), (3, True)):
+            with self.assertRaises(ValueError):
+                controller.hall_call(floor, destination)
+        for index, floor in ((5, 3), (True, 3), (1, False)):
+            with self.assertRaises(ValueError):
+                controller.car_call(index, floor)
+        self.assertEqual(controller.car_call(1, 7), 1)
+        self.assertIn(7, controller.lifts[1].requests)
+
+
+class TestControllerService(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def run_with_service(self, test, tick_seconds=0.01, **controller_args):
+        async def scenario():
+            service = ControllerService(make_controller(**controller_args), tick_seconds)
+            await service.start(port=0)
+            try:
+                return await test(service)
+            finally:
+                await service.close()
+        return asyncio.run(scenario())
+
+    def test_calls_subscriptions_and_errors(self):
+        async def test(service):
+            host, port = service.address
+            reader, writer = await asyncio.open_connection(host, port)
+            watcher_reader, watcher = await asyncio.open_connection(host, port)
+            watcher.write(encode({"type": "subscribe"}))
+            first = json.loads(await watcher_reader.readline())
+
+            writer.write(encode({"type": "hall", "floor": 6, "destination": 2, "id": 1}))
+            writer.write(b"not json\n")
+            writer.write(encode({"type": "car", "lift": 9, "floor": 2, "id": 2}))
+            writer.write(encode({"type": "teleport", "id": 3}))
+            writer.write(encode({"type": "stats"}))
+            replies = [json.loads(await reader.readline()) for _ in range(5)]
+            update = json.loads(await watcher_reader.readline())
+            for w in (writer, watcher):
+                w.close()
+            return first, replies, update
+
+        first, replies, update = self.run_with_service(test)
+        self.assertEqual(first["type"], "state")
+        self.assertEqual(len(first["lifts"]), 2)
+        by_id = {reply.get("id"): reply for reply in replies if reply["type"] in ("assigned", "error")}
+        self.assertEqual(by_id[1]["type"], "assigned")
+        self.assertIn(by_id[1]["lift"], (0, 1))
+        self.assertEqual(by_id[2]["type"], "error")
+        self.assertEqual(by_id[3]["type"], "error")
+        self.assertEqual(sum(reply["type"] == "error" for reply in replies), 3)
+        self.assertEqual(sum(reply["type"] == "stats" for reply in replies), 1)
+        self.assertEqual(update["type"], "state")
+        self.assertGreater(update["tick"], first["tick"])
+        self.assertEqual(update["lifts"][0]["pending"], 1)
+
+    def test_load_generator(self):
+        async def test(service):
+            host, port = service.address
+            result = await run_load(host=host, port=port, connections=3, rate=600, window=16,
+                                    duration=0.3)
+            return result, service.stats()
+
+        result, stats = self.run_with_service(test, num_floors=30, num_lifts=4)
+        self.assertGreater(result["sent"], 50)
+        self.assertEqual(result["answered"], result["sent"])
+        self.assertEqual(result["errors"] + result["unanswered"], 0)
+        self.assertEqual(result["latency_us"]["count"], result["answered"])
+        self.assertEqual(stats["hall_calls"], result["answered"])
+        self.assertEqual(stats["assign_latency_us"]["count"], result["answered"])
+        self.assertGreater(stats["tick"], 0)
+
+    def test_close_with_clients_connected(self):
+        """
+        close() closes client connections instead of waiting for them, and
+        a load generator whose connection is closed stops sending.
+        """
+        async def scenario():
+            service = ControllerService(make_controller(), 0.01)
+            await service.start(port=0)
+            host, port = service.address
+            reader, writer = await asyncio.open_connection(host, port)
+            load = asyncio.create_task(run_load(host=host, port=port, connections=2, rate=0,
+                                                window=4, duration=60))
+            await asyncio.sleep(0.2)
+            await asyncio.wait_for(service.close(), timeout=5)
+            eof = await asyncio.wait_for(reader.readline(), timeout=5)
+            writer.close()
+            return eof, await asyncio.wait_for(load, timeout=5)
+
+        eof, result = asyncio.run(scenario())
+        self.assertEqual(eof, b"")
+        self.assertGreater(result["answered"], 0)
+        self.assertLess(result["seconds"], 10)
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets not available")
+    def test_unix_socket(self):
+        async def scenario(path):
+            service = ControllerService(make_controller(), 0.01)
+            await service.start(path=path)
+            try:
+                return await run_load(path, connections=2, rate=0, window=8, duration=0.2)
+            finally:
+                await service.close()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "lift.sock")
+            result = asyncio.run(scenario(path))
+            self.assertFalse(os.path.exists(path))
+        self.assertGreater(result["answered"], 0)
+        self.assertEqual(result["answered"], result["sent"])
+
+
+if __name__ == "__main__":
+    unittest.main()
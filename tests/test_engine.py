@@ -0,0 +1,277 @@
+"""
+test_engine.py
+
+Unit tests for the headless event-driven engine (engine.py).
+We check that jumping between stops gives exactly the same results as
+stepping each lift one floor per tick with the existing single-step code.
+"""
+
+import contextlib
+import io
+import math
+import random
+import time
+import unittest
+
+from lift import Lift
+from algorithms import single_step
+from arrivals import Arrival
+from engine import SimulationEngine, run_engine
+from simulation import prepare_lifts
+
+
+def random_config(seed, num_floors, num_lifts, num_requests):
+    rng = random.Random(seed)
+    requests = {}
+    for _ in range(num_requests):
+        origin = rng.randint(1, num_floors)
+        dest = rng.randint(1, num_floors)
+        if dest != origin:
+            requests.setdefault(origin, []).append(dest)
+    return {"num_floors": num_floors, "num_lifts": num_lifts, "requests": requests}
+
+
+def random_arrivals(seed, num_floors, num_requests, spread):
+    rng = random.Random(seed)
+    times = sorted(rng.uniform(0, spread) for _ in range(num_requests))
+    arrivals = []
+    for t in times:
+        origin, dest = rng.sample(range(1, num_floors + 1), 2)
+        arrivals.append(Arrival(t, origin, dest))
+    return arrivals
+
+
+def mylift_reference_step(lift, timeWaited):
+    """
+    The original O(n) MYLIFT step: scan every request for the lowest
+    distance - wait_time, move one floor, then age every request.
+    """
+    best_priority = float('inf')
+    best_floor = None
+    for floor_req in lift.requests[:]:
+        priority = abs(floor_req - lift.current_floor) - timeWaited.get(floor_req, 0)
+        if priority < best_priority:
+            best_priority = priority
+            best_floor = floor_req
+    old_floor = lift.current_floor
+    if best_floor > lift.current_floor:
+        lift.current_floor += 1
+        lift.direction = "UP"
+    elif best_floor < lift.current_floor:
+        lift.current_floor -= 1
+        lift.direction = "DOWN"
+    lift.floors_traveled += abs(lift.current_floor - old_floor)
+    if lift.current_floor == best_floor:
+        lift.requests.remove(best_floor)
+        lift.serviced_requests += 1
+    for fr in lift.requests:
+        timeWaited[fr] = timeWaited.get(fr, 0) + 1
+
+
+def step_reference(lifts, algorithm, arrivals=(), samples=None):
+    """
+    Per-floor stepping, one tick per floor, using the same single-step
+    code as MultiLiftGUI.simulation_step for SCAN/LOOK and the original
+    MYLIFT rule (each lift keeps its own waiting times). Arrivals with
+    time t are given to the least-loaded lift before the step that starts
+    at tick ceil(t): the lift gets the origin as a stop, and the
+    destination once it has stopped at the origin. Floors already in
+    lift.requests are plain stops with no passenger.
+    Appends (lift_id, wait, ride) per completed request to 'samples'.
+    Returns the number of ticks until every lift is idle.
+    """
+    ticks = 0
+    pending = list(arrivals)
+    waited = [{} for _ in lifts]
+    waiting = [{} for _ in lifts]   # floor -> [arrival time, destination]
+    riding = [{} for _ in lifts]    # floor -> [(wait, pickup tick)]
+    samples = [] if samples is None else samples
+
+    def add_stop(i, floor):
+        if floor not in lifts[i].requests:
+            # the engine counts waiting from when a floor is requested
+            waited[i].pop(floor, None)
+        lifts[i].add_request(floor)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        while pending or any(lf.requests for lf in lifts):
+            while pending and math.ceil(pending[0].t) <= ticks:
+                arrival = pending.pop(0)
+                i = min(range(len(lifts)), key=lambda j: len(lifts[j].requests))
+                waiting[i].setdefault(arrival.origin, []).append((arrival.t, arrival.destination))
+                add_stop(i, arrival.origin)
+            if not any(lf.requests for lf in lifts):
+                ticks = math.ceil(pending[0].t)
+                continue
+            ticks += 1
+            for i, lf in enumerate(lifts):
+                if not lf.requests:
+                    continue
+                serviced = lf.serviced_requests
+                if algorithm == "SCAN":
+                    lf.next_step()
+                elif algorithm == "LOOK":
+                    single_step(lf, "LOOK", {})
+                else:
+                    mylift_reference_step(lf, waited[i])
+                if lf.serviced_requests == serviced:
+                    continue
+                floor = lf.current_floor
+                for wait, picked_up in riding[i].pop(floor, ()):
+                    samples.append((lf.lift_id, wait, ticks - picked_up))
+                for t, destination in waiting[i].pop(floor, ()):
+                    riding[i].setdefault(destination, []).append((ticks - t, ticks))
+                    add_stop(i, destination)
+    return ticks
+
+
+class TestEngine(unittest.TestCase):
+
+    def assert_same_as_stepping(self, config, algorithm, arrivals=()):
+        stepped = prepare_lifts(config)
+        jumped = prepare_lifts(config)
+        samples = []
+        ticks = step_reference(stepped, algorithm, arrivals, samples)
+        engine = SimulationEngine(jumped, algorithm, iter(arrivals))
+        results = engine.run()
+
+        self.assertEqual(results["total_time"], ticks)
+        self.assertEqual(results["completed_requests"], len(samples))
+        for kind, values in (("wait", [w for _, w, _ in samples]),
+                             ("ride", [r for _, _, r in samples])):
+            histogram = engine.latency.overall[kind]
+            self.assertEqual(histogram.count, len(values))
+            self.assertAlmostEqual(histogram.total, sum(values))
+            if values:
+                self.assertEqual(histogram.max, max(values))
+        for a, b in zip(stepped, jumped):
+            self.assertEqual(a.floors_traveled, b.floors_traveled)
+            self.assertEqual(a.serviced_requests, b.serviced_requests)
+            self.assertEqual(a.current_floor, b.current_floor)
+            self.assertEqual(a.direction, b.direction)
+            self.assertEqual(len(b.requests), 0)
+
+    def test_matches_per_floor_stepping(self):
+        """
+        Random buildings and request sets give the same per-lift results
+        for every algorithm.
+        """
+        for seed in range(30):
+            config = random_config(seed, num_floors=3 + seed % 12,
+                                   num_lifts=1 + seed % 4, num_requests=25)
+            for algorithm in ("SCAN", "LOOK", "MYLIFT"):
+                with self.subTest(seed=seed, algorithm=algorithm):
+                    self.assert_same_as_stepping(config, algorithm)
+
+    def test_online_arrivals_match_per_floor_stepping(self):
+        """
+        Requests streamed in over time interrupt legs in progress and still
+        give the same results as stepping one floor per tick.
+        """
+        for seed in range(30):
+            num_floors = 4 + seed % 15
+            config = random_config(seed, num_floors, num_lifts=1 + seed % 3, num_requests=5)
+            arrivals = random_arrivals(seed, num_floors, num_requests=40, spread=60)
+            for algorithm in ("SCAN", "LOOK", "MYLIFT"):
+                with self.subTest(seed=seed, algorithm=algorithm):
+                    self.assert_same_as_stepping(config, algorithm, arrivals)
+
+    def test_arrivals_after_idle_period(self):
+        lift = Lift(lift_id=0, start_floor=1, top_floor=10)
+        results = run_engine([lift], "LOOK", [Arrival(0, 2, 4), Arrival(20.5, 1, 9)])
+        self.assertEqual(results["requests_received"], 2)
+        # 1 -> 2 -> 4, idle until tick 21, then 4 -> 1 -> 9
+        self.assertEqual(results["total_time"], 21 + 3 + 8)
+        self.assertEqual(lift.floors_traveled, 1 + 2 + 3 + 8)
+        self.assertEqual(results["completed_requests"], 2)
+        self.assertEqual(results["latency"]["wait"]["max"], 24 - 20.5)
+        self.assertEqual(results["latency"]["ride"]["max"], 8)
+
+    def test_unsorted_arrivals_rejected(self):
+        with self.assertRaises(ValueError):
+            run_engine([Lift(0, top_floor=10)], "SCAN",
+                       [Arrival(0, 1, 9), Arrival(9, 1, 5), Arrival(2, 1, 3)])
+
+    def test_request_on_current_floor(self):
+        """
+        A lone request for the floor the lift is on takes one tick to service.
+        """
+        lift = Lift(lift_id=0, start_floor=1, top_floor=5)
+        lift.add_request(1)
+        results = run_engine([lift], "SCAN")
+        self.assertEqual(results["total_time"], 1)
+        self.assertEqual(lift.serviced_requests, 1)
+        self.assertEqual(lift.floors_traveled, 0)
+        self.assertEqual(lift.direction, "DOWN")
+
+    def test_full_lift_leaves_passengers_behind(self):
+        lift = Lift(lift_id=0, start_floor=1, top_floor=10, capacity=1)
+        results = run_engine([lift], "LOOK", [Arrival(0, 1, 5), Arrival(0, 1, 3)])
+        # stop at 1 (t=1) takes one passenger to 5 (t=5), comes back for
+        # the other (t=9) and takes them to 3 (t=11)
+        self.assertEqual(results["total_time"], 11)
+        self.assertEqual(results["left_behind"], 1)
+        self.assertEqual(results["completed_requests"], 2)
+        self.assertEqual(results["latency"]["wait"]["max"], 9)
+        self.assertEqual(results["latency"]["ride"]["max"], 4)
+        self.assertEqual(results["lifts"][0]["peak_load"], 1)
+
+    def test_full_lift_bypasses_hall_calls(self):
+        arrivals = [Arrival(0, 1, 10), Arrival(1, 5, 6)]
+        free = run_engine([Lift(lift_id=0, start_floor=1, top_floor=10)], "SCAN", arrivals)
+        lift = Lift(lift_id=0, start_floor=1, top_floor=10, capacity=1)
+        full = run_engine([lift], "SCAN", arrivals)
+        # without a limit the lift stops at 5 on the way up; when full it
+        # goes to 10 first (t=10), then back to 5 (t=15) and on to 6
+        self.assertEqual(free["latency"]["wait"]["max"], 4)
+        self.assertEqual(full["bypassed_calls"], 1)
+        self.assertEqual(full["total_time"], 16)
+        self.assertEqual(full["latency"]["wait"]["max"], 14)
+        self.assertEqual(lift.serviced_requests, 4)
+
+    def test_capacity_is_never_exceeded(self):
+        for seed in range(20):
+            num_floors = 4 + seed % 15
+            arrivals = random_arrivals(seed, num_floors, num_requests=200, spread=40)
+            for algorithm in ("SCAN", "LOOK", "MYLIFT"):
+                with self.subTest(seed=seed, algorithm=algorithm):
+                    config = {"num_floors": num_floors, "num_lifts": 1 + seed % 3,
+                              "capacity": 1 + seed % 4, "requests": {}}
+                    lifts = prepare_lifts(config)
+                    engine = SimulationEngine(lifts, algorithm, iter(arrivals), reassign=seed % 2 == 0)
+                    results = engine.run()
+                    self.assertEqual(results["completed_requests"], len(arrivals))
+                    self.assertTrue(all(r["peak_load"] <= config["capacity"] for r in results["lifts"]))
+                    self.assertTrue(all(lf.load == 0 and not lf.requests for lf in lifts))
+                    self.assertEqual(len(engine.passengers), 0)
+                    self.assertLessEqual(engine.passengers.slots, engine.passengers.peak)
+
+    def test_large_capacity_changes_nothing(self):
+        arrivals = random_arrivals(3, 12, num_requests=100, spread=30)
+        for algorithm in ("SCAN", "LOOK", "MYLIFT"):
+            free = run_engine(prepare_lifts({"num_floors": 12, "num_lifts": 2}), algorithm, arrivals)
+            roomy = run_engine(prepare_lifts({"num_floors": 12, "num_lifts": 2, "capacity": 1000}),
+                               algorithm, arrivals)
+            self.assertEqual(free["total_time"], roomy["total_time"])
+            self.assertEqual(free["total_distance"], roomy["total_distance"])
+            self.assertEqual(roomy["left_behind"], 0)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            SimulationEngine([Lift(0)], "ELEVATOR")
+
+    def test_large_building_is_fast(self):
+        """
+        A 100-floor, 10k-request run finishes well inside a second.
+        """
+        config = random_config(1, num_floors=100, num_lifts=4, num_requests=10000)
+        for algorithm in ("SCAN", "LOOK", "MYLIFT"):
+            lifts = prepare_lifts(config)
+            start = time.perf_counter()
+            results = run_engine(lifts, algorithm)
+            self.assertLess(time.perf_counter() - start, 1.0)
+            self.assertTrue(all(not lf.requests for lf in lifts))
+            self.assertGreater(results["serviced_requests"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+test_fleet.py
+
+Unit tests for the vectorized Fleet stepper (fleet.py).
+A fleet built from Lift objects is stepped with NumPy and compared against
+stepping the same lifts one at a time with Lift.next_step / LOOK_lift.
+Skipped when NumPy is not installed.
+"""
+
+import contextlib
+import io
+import random
+import unittest
+
+from lift import Lift
+from algorithms import SCAN_lift, LOOK_lift
+
+try:
+    from fleet import Fleet
+except ImportError:  # NumPy not installed
+    Fleet = None
+
+
+def random_lifts(seed, count):
+    rng = random.Random(seed)
+    lifts = []
+    for i in range(count):
+        top = rng.randint(2, 20)
+        lf = Lift(lift_id=i, start_floor=rng.randint(1, top), top_floor=top)
+        lf.direction = rng.choice(["UP", "DOWN"])
+        for _ in range(rng.randint(0, 8)):
+            lf.add_request(rng.randint(1, top))
+        lifts.append(lf)
+    return lifts
+
+
+@unittest.skipIf(Fleet is None, "NumPy is required for fleet.py")
+class TestFleet(unittest.TestCase):
+
+    def test_single_steps_match_next_step(self):
+        """
+        Every vectorized step leaves each lift where Lift.next_step would.
+        """
+        lifts = random_lifts(seed=7, count=200)
+        fleet = Fleet.from_lifts(lifts)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(60):
+                fleet.step("SCAN")
+                for lf in lifts:
+                    lf.next_step()
+                for i, lf in enumerate(lifts):
+                    self.assertEqual(fleet.floor[i], lf.current_floor)
+                    self.assertEqual(fleet.direction[i] == 1, lf.direction == "UP")
+                    self.assertEqual(fleet.traveled[i], lf.floors_traveled)
+                    self.assertEqual(fleet.serviced[i], lf.serviced_requests)
+
+    def test_full_runs_match_algorithms(self):
+        for algorithm, run_one in (("SCAN", lambda lf: SCAN_lift(lf, lf.top_floor)),
+                                   ("LOOK", LOOK_lift)):
+            with self.subTest(algorithm=algorithm):
+                lifts = random_lifts(seed=11, count=300)
+                fleet = Fleet.from_lifts(lifts)
+                fleet.run(algorithm)
+                for lf in lifts:
+                    run_one(lf)
+                for got, expected in zip(fleet.to_lifts(), lifts):
+                    self.assertEqual(got.current_floor, expected.current_floor)
+                    self.assertEqual(got.floors_traveled, expected.floors_traveled)
+                    self.assertEqual(got.serviced_requests, expected.serviced_requests)
+                    self.assertEqual(len(got.requests), 0)
+
+    def test_round_trip(self):
+        lifts = random_lifts(seed=3, count=5)
+        for lf, capacity in zip(lifts, (None, 4, 0, 1, 12)):
+            lf.capacity = capacity or None
+        back = Fleet.from_lifts(lifts).to_lifts()
+        for a, b in zip(lifts, back):
+            self.assertEqual(sorted(a.requests), list(b.requests))
+            self.assertEqual((a.current_floor, a.direction, a.top_floor, a.capacity),
+                             (b.current_floor, b.direction, b.top_floor, b.capacity))
+
+    def test_rejects_other_algorithms(self):
+        fleet = Fleet(2, top_floor=5)
+        with self.assertRaises(ValueError):
+            fleet.step("MYLIFT")
+        with self.assertRaises(ValueError):
+            fleet.add_request(0, 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+test_instrumentation.py
+
+Unit tests for instrumentation.py:
+  - level-gated trace events and the ring buffer
+  - per-lift counters and step timers fed by lift / algorithm steps
+    and by the event-driven engine
+"""
+
+import contextlib
+import io
+import unittest
+
+from instrumentation import DEBUG, INFO, OFF, METRICS, TRACE, Metrics, Tracer, parse_level
+from lift import Lift
+from algorithms import LOOK_lift, MYLIFT_lift
+from arrivals import Arrival
+from engine import SimulationEngine
+from utils import get_serviced_count, get_total_distance
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_levels_gate_events(self):
+        tracer = Tracer()
+        self.assertFalse(tracer.info or tracer.debug)
+        tracer.event(INFO, "ignored")
+        self.assertEqual(tracer.recent(), [])
+
+        tracer.set_level(INFO)
+        self.assertTrue(tracer.info)
+        self.assertFalse(tracer.debug)
+        tracer.event(DEBUG, "too.low")
+        tracer.event(INFO, "kept", lift=1)
+        self.assertEqual([(name, fields) for _, _, name, fields in tracer.recent()],
+                         [("kept", {"lift": 1})])
+
+    def test_ring_buffer_keeps_newest(self):
+        tracer = Tracer(level=DEBUG, capacity=3)
+        for i in range(10):
+            tracer.event(DEBUG, "tick", i=i)
+        self.assertEqual([event[3]["i"] for event in tracer.recent()], [7, 8, 9])
+        out = io.StringIO()
+        self.assertEqual(tracer.dump(out, count=2), 2)
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+        self.assertIn("tick i=9", out.getvalue())
+
+        tracer.configure(capacity=2)
+        self.assertEqual([event[3]["i"] for event in tracer.recent()], [8, 9])
+
+    def test_parse_level(self):
+        self.assertEqual(parse_level("DEBUG"), DEBUG)
+        self.assertEqual(parse_level("off"), OFF)
+        with self.assertRaises(ValueError):
+            parse_level("verbose")
+
+    def test_lift_steps_are_silent_when_tracing_is_off(self):
+        lift = Lift(lift_id=0, start_floor=1, top_floor=10)
+        lift.requests = [7, 3]
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            while lift.requests:
+                lift.next_step()
+        self.assertEqual(out.getvalue(), "")
+
+    def test_lift_steps_traced_when_enabled(self):
+        TRACE.configure(level=DEBUG)
+        TRACE.clear()
+        try:
+            lift = Lift(lift_id=4, start_floor=1, top_floor=5)
+            lift.add_request(3)
+            while lift.requests:
+                lift.next_step()
+            names = [name for _, _, name, _ in TRACE.recent()]
+        finally:
+            TRACE.configure(level=OFF)
+            TRACE.clear()
+        self.assertEqual(names.count("lift.move"), 2)
+        self.assertEqual(names.count("lift.service"), 1)
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        METRICS.reset()
+        METRICS.enabled = True
+
+    def tearDown(self):
+        METRICS.enabled = False
+        METRICS.reset()
+
+    def test_counters_follow_the_lifts(self):
+        lifts = [Lift(lift_id=i, start_floor=1, top_floor=12) for i in range(3)]
+        lifts[0].requests = [5, 2, 9]
+        lifts[1].requests = [12, 1, 6]
+        lifts[2].requests = [4, 11]
+        while lifts[0].requests:
+            lifts[0].next_step()
+        LOOK_lift(lifts[1])
+        MYLIFT_lift(lifts[2], {})
+
+        snapshot = METRICS.snapshot()
+        for lift in lifts:
+            counters = snapshot[lift.lift_id]
+            self.assertEqual(counters["floors"], lift.floors_traveled)
+            self.assertEqual(counters["serviced"], lift.serviced_requests)
+            self.assertGreaterEqual(counters["steps"], lift.floors_traveled)
+            self.assertGreater(counters["step_time"], 0)
+            self.assertGreaterEqual(counters["max_step_time"], counters["mean_step_time"])
+        self.assertEqual(snapshot[1]["reversals"], 1)  # up to 12, then back down to 1
+        self.assertEqual(METRICS.total_distance, sum(lf.floors_traveled for lf in lifts))
+        self.assertEqual(METRICS.total_serviced, 8)
+
+    def test_engine_feeds_counters(self):
+        arrivals = [Arrival(t, 1 + (7 * t) % 15, 1 + (7 * t + 5) % 15) for t in range(40)]
+        for algorithm in ("SCAN", "MYLIFT"):
+            with self.subTest(algorithm=algorithm):
+                METRICS.reset()
+                lifts = [Lift(lift_id=i, start_floor=1, top_floor=15) for i in range(3)]
+                results = SimulationEngine(lifts, algorithm, arrivals=iter(arrivals)).run()
+                snapshot = METRICS.snapshot()
+                for lift in lifts:
+                    self.assertEqual(snapshot[lift.lift_id]["floors"], lift.floors_traveled)
+                    self.assertEqual(snapshot[lift.lift_id]["serviced"], lift.serviced_requests)
+                self.assertEqual(sum(c["assigned"] for c in snapshot.values()), 40)
+                self.assertGreater(sum(c["reversals"] for c in snapshot.values()), 0)
+                self.assertEqual(get_total_distance(), results["total_distance"])
+                self.assertEqual(get_serviced_count(), results["serviced_requests"])
+
+    def test_dump(self):
+        METRICS.record(0, floors=3, serviced=1, assigned=2)
+        METRICS.record(1, floors=4, reversals=1)
+        stream = io.StringIO()
+        self.assertEqual(METRICS.dump(stream), 2)
+        lines = stream.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("lift 0: steps=0 floors=3 serviced=1 reversals=0 assigned=2"))
+        self.assertEqual(lines[-1], "total: floors=7 serviced=1")
+
+    def test_disabled_metrics_record_nothing(self):
+        METRICS.enabled = False
+        lift = Lift(lift_id=0, start_floor=1, top_floor=5)
+        lift.add_request(4)
+        LOOK_lift(lift)
+        self.assertEqual(METRICS.snapshot(), {})
+        self.assertEqual(Metrics().total_distance, 0)
+
+if __name__ == '__main__':
+    unittest.main()
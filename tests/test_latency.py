@@ -0,0 +1,124 @@
+"""
+test_latency.py
+
+Unit tests for latency.py (streaming histograms and per-lift latency
+recording) and the latency panels of plotter.plot_metrics.
+"""
+
+import math
+import os
+import random
+import tempfile
+import unittest
+
+from latency import LatencyRecorder, StreamingHistogram, merge_by_algorithm
+
+try:
+    from plotter import plot_metrics
+except ImportError:  # matplotlib not installed
+    plot_metrics = None
+
+
+def exact_percentile(values, q):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+class TestStreamingHistogram(unittest.TestCase):
+
+    def test_small_integers_are_exact(self):
+        rng = random.Random(0)
+        values = [rng.randint(0, 31) for _ in range(5000)]
+        histogram = StreamingHistogram()
+        for value in values:
+            histogram.add(value)
+        for q in (1, 50, 95, 99, 100):
+            self.assertEqual(histogram.percentile(q), exact_percentile(values, q))
+        self.assertEqual(histogram.count, len(values))
+        self.assertAlmostEqual(histogram.mean(), sum(values) / len(values))
+
+    def test_large_values_within_relative_error(self):
+        rng = random.Random(1)
+        values = [rng.expovariate(1 / 500) for _ in range(20000)]
+        histogram = StreamingHistogram()
+        for value in values:
+            histogram.add(value)
+        for q in (50, 95, 99):
+            expected = exact_percentile(values, q)
+            self.assertLessEqual(histogram.percentile(q), expected)
+            self.assertGreaterEqual(histogram.percentile(q), expected * (1 - 1 / 32) - 1)
+        self.assertEqual(histogram.percentile(100), max(values))
+        # constant memory: a few hundred buckets for 20k samples
+        self.assertLess(len(histogram.counts), 400)
+
+    def test_buckets_cover_samples(self):
+        histogram = StreamingHistogram()
+        for value in (0, 3.5, 31.9, 32, 100, 1000.25, 1e6):
+            histogram.add(value)
+        buckets = histogram.buckets()
+        self.assertEqual(sum(count for _, _, count in buckets), 7)
+        for lower, upper, _ in buckets:
+            self.assertLess(lower, upper)
+        self.assertEqual([lower for lower, _, _ in buckets][:4], [0, 3, 31, 32])
+
+    def test_merge_and_empty(self):
+        a, b = StreamingHistogram(), StreamingHistogram()
+        self.assertIsNone(a.percentile(50))
+        self.assertIsNone(a.summary()["max"])
+        for value in range(10):
+            a.add(value)
+        for value in range(10, 20):
+            b.add(value)
+        a.merge(b)
+        self.assertEqual((a.count, a.min, a.max), (20, 0, 19))
+        self.assertEqual(a.percentile(50), 9)
+        with self.assertRaises(ValueError):
+            a.add(-1)
+        with self.assertRaises(ValueError):
+            a.merge(StreamingHistogram(precision_bits=3))
+
+
+class TestLatencyRecorder(unittest.TestCase):
+
+    def test_summary_per_lift_and_overall(self):
+        recorder = LatencyRecorder("LOOK")
+        for wait in range(1, 11):
+            recorder.record(0, wait, 2)
+        recorder.record(1, 40, 5)
+        summary = recorder.summary()
+        self.assertEqual(summary["algorithm"], "LOOK")
+        self.assertEqual(summary["requests"], 11)
+        self.assertEqual(summary["wait"]["max"], 40)
+        self.assertEqual(summary["wait"]["p50"], 6)
+        self.assertEqual(summary["lifts"][0]["wait"]["p99"], 10)
+        self.assertEqual(summary["lifts"][1]["total"]["max"], 45)
+        self.assertEqual(summary["ride"]["p95"], 5)
+
+    def test_merge_by_algorithm(self):
+        runs = []
+        for algorithm, seed in (("SCAN", 0), ("SCAN", 1), ("LOOK", 0)):
+            recorder = LatencyRecorder(algorithm)
+            recorder.record(seed, seed + 1, 1)
+            runs.append(recorder)
+        merged = merge_by_algorithm(runs)
+        self.assertEqual(sorted(merged), ["LOOK", "SCAN"])
+        self.assertEqual(merged["SCAN"].count, 2)
+        self.assertEqual(sorted(merged["SCAN"].by_lift), [0, 1])
+
+    @unittest.skipIf(plot_metrics is None, "matplotlib is required for plotter.py")
+    def test_plot_metrics_with_latency(self):
+        recorders = {}
+        rng = random.Random(2)
+        for algorithm in ("SCAN", "MYLIFT"):
+            recorder = recorders[algorithm] = LatencyRecorder(algorithm)
+            for _ in range(500):
+                recorder.record(rng.randrange(3), rng.expovariate(0.1), rng.randint(1, 20))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.png")
+            plot_metrics(100, 250, 1000, 10.0, path, latency=recorders)
+            self.assertGreater(os.path.getsize(path), 0)
+            plot_metrics(100, 250, 1000, 10.0, path, latency=recorders["SCAN"])
+            plot_metrics(100, 250, 1000, 10.0, path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+test_lift.py
+
+Unit tests for lift.py:
+  - RequestIndex ordered lookups and list compatibility
+  - Lift.requests backed by a RequestIndex
+"""
+
+import contextlib
+import io
+import unittest
+
+from lift import Lift, RequestIndex
+
+class TestRequestIndex(unittest.TestCase):
+
+    def test_next_above_and_below(self):
+        index = RequestIndex([7, 2, 9, 4])
+        self.assertEqual(index.next_above(4), 7)
+        self.assertEqual(index.next_above(1), 2)
+        self.assertIsNone(index.next_above(9))
+        self.assertEqual(index.next_below(7), 4)
+        self.assertEqual(index.next_below(10), 9)
+        self.assertIsNone(index.next_below(2))
+        self.assertTrue(index.has_above(8))
+        self.assertFalse(index.has_above(9))
+        self.assertTrue(index.has_below(3))
+        self.assertFalse(index.has_below(2))
+        self.assertEqual((index.lowest(), index.highest()), (2, 9))
+
+    def test_list_compatibility(self):
+        """
+        Iteration, indexing, equality and repr keep insertion order,
+        and duplicates are ignored like Lift.add_request.
+        """
+        index = RequestIndex()
+        for floor in (5, 3, 5, 8):
+            index.append(floor)
+        self.assertEqual(index, [5, 3, 8])
+        self.assertEqual(index[:], [5, 3, 8])
+        self.assertEqual(index[0], 5)
+        self.assertEqual(len(index), 3)
+        self.assertIn(3, index)
+        self.assertEqual(repr(index), "[5, 3, 8]")
+
+        index.remove(3)
+        self.assertNotIn(3, index)
+        self.assertEqual(index.next_below(5), None)
+        with self.assertRaises(ValueError):
+            index.remove(3)
+        index.discard(3)  # no error
+
+    def test_empty(self):
+        index = RequestIndex()
+        self.assertFalse(index)
+        self.assertIsNone(index.next_above(1))
+        self.assertFalse(index.has_below(5))
+        self.assertIsNone(index.lowest())
+
+
+class TestLift(unittest.TestCase):
+
+    def test_requests_assignment_and_add(self):
+        lift = Lift(lift_id=0, start_floor=1, top_floor=5)
+        lift.requests = [3, 5, 3]
+        self.assertIsInstance(lift.requests, RequestIndex)
+        self.assertEqual(lift.requests, [3, 5])
+        lift.add_request(5)
+        lift.add_request(2)
+        self.assertEqual(lift.requests, [3, 5, 2])
+
+    def test_next_step_services_in_scan_order(self):
+        lift = Lift(lift_id=0, start_floor=3, top_floor=6)
+        for floor in (1, 5, 2):
+            lift.add_request(floor)
+        visited = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            while lift.requests:
+                before = len(lift.requests)
+                lift.next_step()
+                if len(lift.requests) < before:
+                    visited.append(lift.current_floor)
+        self.assertEqual(visited, [5, 2, 1])
+        self.assertEqual(lift.floors_traveled, 2 + 4)
+        self.assertEqual(lift.serviced_requests, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,10 +6,13 @@ We primarily test that 'main()' can parse an input file (or use default config)
 and invoke run_simulation without crashing.
 """
 
+import contextlib
+import io
 import unittest
 import os
 import sys
 from unittest.mock import patch
+from instrumentation import METRICS
 from main import main
 from utils import log_event
 
@@ -62,5 +65,43 @@ class TestMain(unittest.TestCase):
             if os.path.exists(temp_filename):
                 os.remove(temp_filename)
 
+    def test_main_headless_with_metrics(self):
+        """
+        --metrics turns on instrumentation.METRICS for the run and prints
+        the per-lift counters to stderr at the end.
+        """
+        input_file = os.path.join(os.path.dirname(__file__), "..", "inputs", "input_low.txt")
+        stderr = io.StringIO()
+        with patch.object(sys, "argv", ["main.py", input_file, "--headless", "--metrics"]):
+            with self.assertLogs(level='INFO'), contextlib.redirect_stderr(stderr):
+                main()
+        dumped = stderr.getvalue()
+        self.assertIn("lift 0: steps=0 floors=", dumped)
+        self.assertIn("total: floors=", dumped)
+        self.assertNotIn("total: floors=0 ", dumped)
+        self.assertFalse(METRICS.enabled)
+
+    def test_main_headless_rejects_bad_input(self):
+        """
+        Requests outside the building are logged as [ERROR] and exit with
+        status 1, whether they are found while parsing or while streaming.
+        """
+        inputs = {"temp_test_far.txt": "5, 4\n1: 3, 9\n",
+                  "temp_test_far.jsonl": '{"num_floors": 10, "capacity": 4}\n'
+                                         '{"t": 0, "origin": 1, "destination": 50}\n'}
+        for temp_filename, text in inputs.items():
+            with self.subTest(input=temp_filename):
+                with open(temp_filename, "w") as f:
+                    f.write(text)
+                try:
+                    with patch.object(sys, "argv", ["main.py", temp_filename, "--headless"]):
+                        with self.assertLogs(level='INFO') as log, self.assertRaises(SystemExit) as exit:
+                            main()
+                    self.assertEqual(exit.exception.code, 1)
+                    self.assertIn("[ERROR]", "\n".join(log.output))
+                    self.assertIn("outside the building", "\n".join(log.output))
+                finally:
+                    os.remove(temp_filename)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+test_passengers.py
+
+Unit tests for passengers.py (array-backed passenger records).
+"""
+
+import math
+import random
+import unittest
+
+from passengers import PassengerTable
+
+
+class TestPassengerTable(unittest.TestCase):
+
+    def test_lifecycle(self):
+        table = PassengerTable()
+        pid = table.add(origin=2, destination=9, arrival_time=3.5)
+        self.assertEqual((table.origin[pid], table.destination[pid]), (2, 9))
+        self.assertTrue(math.isnan(table.boarded_at[pid]))
+        self.assertEqual(table.board(pid, now=6), 2.5)
+        self.assertEqual(table.alight(pid, now=13), (2.5, 7))
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.total, 1)
+
+    def test_alight_before_board_rejected(self):
+        table = PassengerTable()
+        pid = table.add(1, 4, 0)
+        with self.assertRaises(ValueError):
+            table.alight(pid, 5)
+        with self.assertRaises(ValueError):
+            table.add(3, 3, 0)
+
+    def test_ids_are_reused(self):
+        """
+        Memory follows the peak number in flight, not the number served.
+        """
+        rng = random.Random(0)
+        table = PassengerTable()
+        in_flight = []
+        for t in range(100000):
+            if len(in_flight) < 50 and rng.random() < 0.5:
+                pid = table.add(1, 2, t)
+                table.board(pid, t)
+                in_flight.append(pid)
+            elif in_flight:
+                table.alight(in_flight.pop(rng.randrange(len(in_flight))), t)
+        self.assertEqual(len(table), len(in_flight))
+        self.assertLessEqual(table.slots, 50)
+        self.assertEqual(table.slots, table.peak)
+        self.assertGreater(table.total, 10000)
+        self.assertLess(table.nbytes, 50 * 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
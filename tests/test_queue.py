@@ -1,15 +1,15 @@
 """
 test_queue.py
 
-Unit tests for the custom FIFO Queue implementation in queue.py.
+Unit tests for the custom FIFO Queue implementation in fifo_queue.py.
 We no longer reference single-lift PriorityQueue logic (if removed).
 
-If you're no longer using queue.py, you can remove this test file entirely.
+If you're no longer using fifo_queue.py, you can remove this test file entirely.
 Otherwise, here's a minimal test that confirms enqueue/dequeue behavior.
 """
 
 import unittest
-from queue import Queue  # the minimal queue you may have
+from fifo_queue import Queue  # the minimal queue you may have
 
 class TestQueue(unittest.TestCase):
 
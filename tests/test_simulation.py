@@ -7,10 +7,17 @@ handles multiple lifts and requests, and logs the final messages.
 """
 
 import unittest
+import random
 import sys
 import os
 from unittest.mock import patch
-from simulation import run_simulation
+from lift import Lift
+from algorithms import single_step
+from arrivals import Arrival
+from engine import SimulationEngine
+from main import parse_input_file
+from simulation import (run_simulation, prepare_lifts, make_dispatcher, Request,
+                        ETADispatcher, NearestCarDispatcher)
 from utils import log_event
 
 class TestSimulation(unittest.TestCase):
@@ -79,5 +86,191 @@ class TestSimulation(unittest.TestCase):
         self.assertIn("Total serviced requests:", logs_joined)
         self.assertIn("Throughput:", logs_joined)
 
+
+def random_lifts(rng, count, top_floor=30):
+    lifts = []
+    for i in range(count):
+        lf = Lift(lift_id=i, start_floor=rng.randint(1, top_floor), top_floor=top_floor)
+        lf.direction = rng.choice(["UP", "DOWN"])
+        for _ in range(rng.randint(0, 6)):
+            lf.add_request(rng.randint(1, top_floor))
+        lifts.append(lf)
+    return lifts
+
+
+class TestDispatchers(unittest.TestCase):
+
+    def test_least_loaded_matches_original_rule(self):
+        """
+        The heap-based default gives the same assignment as the old
+        min(lifts, key=len(requests)) scan.
+        """
+        rng = random.Random(0)
+        requests = {}
+        for _ in range(300):
+            origin, dest = rng.sample(range(1, 21), 2)
+            requests.setdefault(origin, []).append(dest)
+        config = {"num_floors": 20, "num_lifts": 7, "requests": requests}
+
+        expected = [Lift(lift_id=i, start_floor=1, top_floor=20) for i in range(7)]
+        for origin, destinations in requests.items():
+            for dest in destinations:
+                min(expected, key=lambda lf: len(lf.requests)).add_request(dest)
+
+        got = prepare_lifts(config)
+        self.assertEqual([lf.requests for lf in got], [lf.requests for lf in expected])
+
+    def test_load_heaps_track_updates(self):
+        rng = random.Random(1)
+        lifts = random_lifts(rng, 40)
+        dispatcher = make_dispatcher("least_loaded", lifts)
+        for _ in range(500):
+            i = rng.randrange(len(lifts))
+            floor = rng.randint(1, 30)
+            if floor in lifts[i].requests:
+                lifts[i].requests.remove(floor)
+            else:
+                lifts[i].add_request(floor)
+            dispatcher.update(i)
+            loads = [len(lf.requests) for lf in lifts]
+            self.assertEqual(dispatcher.least_loaded(), loads.index(min(loads)))
+            self.assertEqual(dispatcher.most_loaded(), loads.index(max(loads)))
+
+    def test_nearest_and_eta_match_brute_force(self):
+        rng = random.Random(2)
+        for trial in range(50):
+            lifts = random_lifts(rng, rng.randint(1, 60))
+            nearest = NearestCarDispatcher(lifts)
+            eta = ETADispatcher(lifts)
+            for i in range(len(lifts)):
+                if rng.random() < 0.5:
+                    # busy: committed to a leg ending after any 'now' below
+                    target = rng.randint(1, 30)
+                    nearest.update(i, target, available_at=rng.randint(6, 15))
+                    eta.update(i, target, available_at=rng.randint(6, 15))
+            for _ in range(20):
+                origin, dest = rng.sample(range(1, 31), 2)
+                request = Request(origin=origin, destination=dest)
+                now = rng.randint(0, 5)
+                self.assertEqual(
+                    nearest.select(request, now),
+                    min(range(len(lifts)), key=lambda i: (abs(nearest._floors[i] - origin), i)))
+                self.assertEqual(
+                    eta.select(request, now),
+                    min(range(len(lifts)), key=lambda i: (eta.eta(i, origin, now), i)))
+
+    def test_eta_accounts_for_direction(self):
+        lift = Lift(lift_id=0, start_floor=5, top_floor=10)
+        lift.add_request(9)
+        dispatcher = ETADispatcher([lift], stop_penalty=0)
+        dispatcher.update(0, 5, "UP")
+        # behind the lift: up to 9, then back down to 3
+        self.assertEqual(dispatcher.eta(0, 3), 4 + 6)
+        self.assertEqual(dispatcher.eta(0, 7), 2)
+
+    def test_unknown_dispatcher(self):
+        with self.assertRaises(ValueError):
+            make_dispatcher("random", [Lift(0)])
+
+    def test_capacity_applies_to_static_input_file(self):
+        """
+        With config['passengers'] a static request map from an input file
+        is streamed in as t=0 arrivals, so passengers board at their origin
+        and a small capacity leaves some of them behind, exactly as the
+        same file read with iter_arrivals does.
+        """
+        input_file = os.path.join(os.path.dirname(__file__), "..", "inputs", "input_high.txt")
+        config = parse_input_file(input_file)
+        config.update(num_lifts=1, capacity=1, passengers=True)
+        streamed = dict(config, requests={}, arrivals_file=input_file)
+        with self.assertLogs(level='INFO'):
+            results = run_simulation(config)
+            expected = run_simulation(streamed)
+        self.assertGreater(results["left_behind"], 0)
+        self.assertEqual(results["lifts"][0]["peak_load"], 1)
+        self.assertEqual(results["completed_requests"], results["requests_received"])
+        for key in ("left_behind", "bypassed_calls", "total_time", "total_distance", "completed_requests"):
+            self.assertEqual(results[key], expected[key])
+
+    def test_invalid_static_request_is_skipped(self):
+        for passengers in (False, True):
+            with self.subTest(passengers=passengers):
+                config = {"num_floors": 5, "num_lifts": 1, "passengers": passengers,
+                          "requests": {2: [2, 4, 9], 7: [1]}}
+                with self.assertLogs(level='INFO') as log:
+                    results = run_simulation(config)
+                logs_joined = "\n".join(log.output)
+                self.assertIn("[ERROR] Invalid request: origin 2", logs_joined)
+                self.assertIn("[ERROR] Invalid request: floor 2 to floor 9 is outside", logs_joined)
+                self.assertIn("[ERROR] Invalid request: floor 7 to floor 1 is outside", logs_joined)
+                # a passenger also makes the lift stop at its origin
+                self.assertEqual(results["serviced_requests"], 2 if passengers else 1)
+                self.assertEqual(results["completed_requests"], 1 if passengers else 0)
+
+    def test_headless_matches_gui_stepping(self):
+        """
+        By default run_simulation gives the same floors travelled, stops
+        serviced and ticks as stepping prepare_lifts' lifts one floor at a
+        time the way MultiLiftGUI.simulation_step does.
+        """
+        inputs = os.path.join(os.path.dirname(__file__), "..", "inputs")
+        for name in ("input_high.txt", "input_mixed.txt"):
+            for algorithm in ("SCAN", "LOOK", "MYLIFT"):
+                with self.subTest(input=name, algorithm=algorithm):
+                    config = parse_input_file(os.path.join(inputs, name))
+                    config.update(num_lifts=2, algorithm=algorithm)
+                    with self.assertLogs(level='INFO'):
+                        lifts = prepare_lifts(config)
+                        results = run_simulation(config)
+                    schedulers, ticks = {}, 0
+                    while any(lf.requests for lf in lifts):
+                        for lf in lifts:
+                            if lf.requests:
+                                single_step(lf, algorithm, schedulers)
+                        ticks += 1
+                    self.assertEqual(results["total_time"], ticks)
+                    self.assertEqual(results["total_distance"], sum(lf.floors_traveled for lf in lifts))
+                    self.assertEqual(results["serviced_requests"], sum(lf.serviced_requests for lf in lifts))
+                    self.assertEqual([(r["floor"], r["floors_traveled"], r["serviced_requests"])
+                                      for r in results["lifts"]],
+                                     [(lf.current_floor, lf.floors_traveled, lf.serviced_requests)
+                                      for lf in lifts])
+
+    def test_engine_with_each_dispatcher(self):
+        """
+        Every strategy, with and without online reassignment, services all
+        streamed requests.
+        """
+        rng = random.Random(3)
+        arrivals = []
+        t = 0.0
+        for _ in range(400):
+            t += rng.expovariate(2.0)
+            origin, dest = rng.sample(range(1, 41), 2)
+            arrivals.append(Arrival(t, origin, dest))
+        for name in ("least_loaded", "nearest", "eta"):
+            for reassign in (False, True):
+                with self.subTest(dispatcher=name, reassign=reassign):
+                    with self.assertLogs(level='INFO'):
+                        lifts = prepare_lifts({"num_floors": 40, "num_lifts": 6})
+                    results = SimulationEngine(lifts, "LOOK", arrivals=iter(arrivals),
+                                               dispatcher=name, reassign=reassign).run()
+                    self.assertEqual(results["requests_received"], 400)
+                    self.assertEqual(results["completed_requests"], 400)
+                    for lf in lifts:
+                        self.assertFalse(lf.requests)
+                        self.assertEqual(lf.load, 0)
+                    if not reassign:
+                        self.assertEqual(results["reassignments"], 0)
+
+    def test_reassignment_moves_work_to_idle_lift(self):
+        lifts = [Lift(lift_id=i, start_floor=1, top_floor=20) for i in range(2)]
+        for floor in (10, 12, 14, 16):
+            lifts[0].add_request(floor)
+        results = SimulationEngine(lifts, "SCAN", reassign=True).run()
+        self.assertGreater(results["reassignments"], 0)
+        self.assertGreater(lifts[1].serviced_requests, 0)
+        self.assertEqual(results["serviced_requests"], 4)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
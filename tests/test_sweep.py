@@ -0,0 +1,113 @@
+"""
+test_sweep.py
+
+Unit tests for the parallel parameter sweep (sweep.py) and the seeded
+workload generator it uses (workload.py).
+"""
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from sweep import build_grid, completed_keys, read_rows, run_job, run_sweep
+from workload import generate_config
+
+INPUT_LOW = os.path.join(os.path.dirname(__file__), "..", "inputs", "input_low.txt")
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_build_grid(self):
+        jobs = build_grid(["scan", "LOOK"], [1, 2], ["uniform:10:50"], [0, 1, 2])
+        self.assertEqual(len(jobs), 12)
+        self.assertEqual(jobs[0], {"algorithm": "SCAN", "num_lifts": 1,
+                                   "workload": "uniform:10:50", "seed": 0})
+
+    def test_generated_workload_is_deterministic(self):
+        self.assertEqual(generate_config("uniform:20:200", 3), generate_config("uniform:20:200", 3))
+        self.assertNotEqual(generate_config("uniform:20:200", 3)["requests"],
+                            generate_config("uniform:20:200", 4)["requests"])
+        with self.assertRaises(ValueError):
+            generate_config("uniform:20", 0)
+
+    def test_run_job_reports_errors(self):
+        row = run_job({"algorithm": "SCAN", "num_lifts": 1, "workload": "missing.txt", "seed": 0})
+        self.assertIn("ValueError", row["error"])
+
+    def test_parallel_sweep_and_resume(self):
+        """
+        A pooled sweep writes one CSV row per job; running it again after
+        losing some rows only re-runs the missing jobs.
+        """
+        out = os.path.join(self.tmpdir, "sweep.csv")
+        jobs = build_grid(["SCAN", "MYLIFT"], [1, 3], ["uniform:15:100", INPUT_LOW], [0, 1])
+        self.assertEqual(run_sweep(jobs, out, workers=2), len(jobs))
+        with open(out, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), len(jobs))
+        self.assertTrue(all(row["error"] == "" for row in rows))
+
+        # simulate an interrupted sweep: keep only the first 5 rows
+        with open(out, "w", newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows[:5])
+        self.assertEqual(run_sweep(jobs, out, workers=2), len(jobs) - 5)
+        self.assertEqual(len(completed_keys(out)), len(jobs))
+        self.assertEqual(run_sweep(jobs, out, workers=2), 0)
+
+    def test_resume_retries_failed_jobs(self):
+        out = os.path.join(self.tmpdir, "sweep.csv")
+        workload = os.path.join(self.tmpdir, "late_input.txt")
+        jobs = build_grid(["LOOK"], [1], ["uniform:10:30", workload], [0])
+        self.assertEqual(run_sweep(jobs, out, workers=1), 2)
+        self.assertEqual(len(completed_keys(out)), 1)
+
+        shutil.copy(INPUT_LOW, workload)
+        self.assertEqual(run_sweep(jobs, out, workers=1), 1)
+        with open(out, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(all(row["error"] == "" for row in rows))
+        self.assertEqual(run_sweep(jobs, out, workers=1), 0)
+
+    def test_resume_reruns_truncated_last_row(self):
+        """
+        A row cut off by a crash is dropped from the file and its job run
+        again, for both CSV and JSON lines output.
+        """
+        jobs = build_grid(["SCAN"], [1, 2], ["uniform:10:30"], [0])
+        for name in ("sweep.csv", "sweep.jsonl"):
+            with self.subTest(output=name):
+                out = os.path.join(self.tmpdir, name)
+                self.assertEqual(run_sweep(jobs, out, workers=1), 2)
+                with open(out, newline='') as f:
+                    text = f.read()
+                with open(out, "w", newline='') as f:
+                    f.write(text[:-20])
+                self.assertEqual(len(completed_keys(out)), 1)
+                self.assertEqual(run_sweep(jobs, out, workers=1), 1)
+                self.assertEqual(len(read_rows(out)), 2)
+                self.assertEqual(run_sweep(jobs, out, workers=1), 0)
+                # no temporary files left behind by the rewrite
+                self.assertLessEqual(set(os.listdir(self.tmpdir)), {"sweep.csv", "sweep.jsonl"})
+
+    def test_json_lines_output(self):
+        out = os.path.join(self.tmpdir, "sweep.jsonl")
+        jobs = build_grid(["LOOK"], [2], ["uniform:8:40"], [5])
+        run_sweep(jobs, out, workers=1)
+        with open(out) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(len(rows), 1)
+        self.assertGreater(rows[0]["serviced_requests"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
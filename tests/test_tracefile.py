@@ -0,0 +1,203 @@
+"""
+test_tracefile.py
+
+Unit tests for tracefile.py (binary step traces, written by stepping the
+lifts or by the event-driven engine) and the replay animator MultiLiftGUI
+uses to play them back.
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from algorithms import single_step
+from animation import ReplayAnimator, StepAnimator
+from arrivals import Arrival
+from engine import SimulationEngine
+from simulation import build_engine, prepare_lifts
+from tracefile import (FLAG_MOVED, FLAG_SERVICED, FLAG_UP, HEADER, RECORD, TraceReader,
+                       TraceWriter, record_engine, record_trace)
+
+
+
+def random_config(seed, num_floors, num_lifts, num_requests):
+    rng = random.Random(seed)
+    requests = {}
+    for _ in range(num_requests):
+        origin, dest = rng.sample(range(1, num_floors + 1), 2)
+        requests.setdefault(origin, []).append(dest)
+    return {"num_floors": num_floors, "num_lifts": num_lifts, "requests": requests}
+
+
+def step_states(config, algorithm):
+    """
+    Per-step (floor, direction, floors_traveled, serviced) of every lift,
+    stepped with single_step like MultiLiftGUI.
+    """
+    lifts = prepare_lifts(config)
+    schedulers = {}
+    states = [[(lf.current_floor, lf.direction, lf.floors_traveled, lf.serviced_requests) for lf in lifts]]
+    while any(lf.requests for lf in lifts):
+        for lf in lifts:
+            if lf.requests:
+                single_step(lf, algorithm, schedulers)
+        states.append([(lf.current_floor, lf.direction, lf.floors_traveled, lf.serviced_requests)
+                       for lf in lifts])
+    return states
+
+
+class TestTraceFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "run.ltrc")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_matches_stepping(self):
+        for seed in range(10):
+            config = random_config(seed, num_floors=4 + seed, num_lifts=1 + seed % 3, num_requests=20)
+            for algorithm in ("SCAN", "LOOK", "MYLIFT"):
+                with self.subTest(seed=seed, algorithm=algorithm):
+                    expected = step_states(config, algorithm)
+                    steps = record_trace(prepare_lifts(config), algorithm, self.path, config["num_floors"])
+                    with TraceReader(self.path) as trace:
+                        self.assertEqual(steps + 1, trace.num_steps)
+                        self.assertEqual(len(expected), trace.num_steps)
+                        self.assertEqual((trace.num_lifts, trace.num_floors, trace.algorithm),
+                                         (config["num_lifts"], config["num_floors"], algorithm))
+                        for step in reversed(range(trace.num_steps)):  # any order: random access
+                            got = [(floor, "UP" if flags & FLAG_UP else "DOWN", traveled, serviced)
+                                   for floor, flags, traveled, serviced in trace.frame(step)]
+                            self.assertEqual(got, expected[step])
+
+    def test_event_flags(self):
+        config = {"num_floors": 5, "num_lifts": 1, "requests": {1: [3]}}
+        record_trace(prepare_lifts(config), "SCAN", self.path)
+        with TraceReader(self.path) as trace:
+            flags = [trace.frame(step)[0][1] for step in range(trace.num_steps)]
+        self.assertEqual(flags[0] & (FLAG_MOVED | FLAG_SERVICED), 0)
+        self.assertTrue(flags[1] & FLAG_MOVED and not flags[1] & FLAG_SERVICED)
+        self.assertTrue(flags[2] & FLAG_MOVED and flags[2] & FLAG_SERVICED)
+
+    def test_file_is_fixed_width(self):
+        config = random_config(3, num_floors=30, num_lifts=4, num_requests=200)
+        steps = record_trace(prepare_lifts(config), "LOOK", self.path)
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + (steps + 1) * 4 * RECORD.size)
+
+    def test_partial_last_frame_ignored(self):
+        config = random_config(4, num_floors=10, num_lifts=2, num_requests=20)
+        steps = record_trace(prepare_lifts(config), "SCAN", self.path)
+        with open(self.path, 'ab') as f:
+            f.write(b"\0" * (RECORD.size + 3))
+        with TraceReader(self.path) as trace:
+            self.assertEqual(trace.num_steps, steps + 1)
+            with self.assertRaises(IndexError):
+                trace.frame(trace.num_steps)
+
+    def test_not_a_trace(self):
+        with open(self.path, 'wb') as f:
+            f.write(b"5, 4\n1: 3, 5\n2: 4\n4: 1\n")
+        with self.assertRaises(ValueError):
+            TraceReader(self.path)
+
+    def test_writer_checks_lift_count(self):
+        lifts = prepare_lifts({"num_floors": 5, "num_lifts": 2})
+        with TraceWriter(self.path, lifts, 5) as writer:
+            with self.assertRaises(ValueError):
+                writer.write(lifts[:1])
+
+    def test_engine_trace_matches_stepping(self):
+        """
+        The engine jumps between stops but writes every tick; for lifts
+        given their floors up front the frames are the ones stepping
+        floor by floor writes.
+        """
+        stepped = os.path.join(self.directory.name, "stepped.ltrc")
+        for seed in range(8):
+            config = random_config(seed, num_floors=5 + seed, num_lifts=1 + seed % 3, num_requests=25)
+            for algorithm in ("SCAN", "LOOK", "MYLIFT"):
+                with self.subTest(seed=seed, algorithm=algorithm):
+                    record_trace(prepare_lifts(config), algorithm, stepped, config["num_floors"])
+                    results = record_engine(SimulationEngine(prepare_lifts(config), algorithm),
+                                            self.path, config["num_floors"])
+                    with TraceReader(stepped) as expected, TraceReader(self.path) as trace:
+                        self.assertEqual(trace.num_steps, results["total_time"] + 1)
+                        self.assertEqual(trace.num_steps, expected.num_steps)
+                        for step in range(trace.num_steps):
+                            self.assertEqual(trace.frame(step), expected.frame(step))
+
+    def test_engine_run_with_arrivals_round_trips(self):
+        rng = random.Random(11)
+        times = sorted(rng.uniform(0, 150) for _ in range(120))
+        arrivals = [Arrival(t, *rng.sample(range(1, 26), 2)) for t in times]
+        config = {"num_floors": 25, "num_lifts": 3, "capacity": 2, "requests": {1: [20, 7]},
+                  "passengers": True, "arrivals": iter(arrivals), "algorithm": "LOOK", "dispatcher": "eta"}
+        engine = build_engine(config)
+        results = record_engine(engine, self.path, config["num_floors"])
+        self.assertIsNone(engine.trace)
+        self.assertEqual(results["completed_requests"], 122)
+        with TraceReader(self.path) as trace:
+            self.assertEqual((trace.num_lifts, trace.num_floors, trace.algorithm), (3, 25, "LOOK"))
+            self.assertEqual(trace.num_steps, results["total_time"] + 1)
+            self.assertEqual(trace.frame(0), [(1, FLAG_UP, 0, 0)] * 3)
+            last = trace.frame(trace.num_steps - 1)
+            self.assertEqual([(floor, traveled, serviced) for floor, _, traveled, serviced in last],
+                             [(lf.current_floor, lf.floors_traveled, lf.serviced_requests)
+                              for lf in engine.lifts])
+            for step in range(1, trace.num_steps):
+                for before, after in zip(trace.frame(step - 1), trace.frame(step)):
+                    moved = abs(after[0] - before[0])
+                    self.assertLessEqual(moved, 1)
+                    self.assertEqual(after[2] - before[2], moved)
+                    self.assertEqual(bool(after[1] & FLAG_MOVED), moved == 1)
+                    self.assertIn(after[3] - before[3], (0, 1))
+                    self.assertEqual(bool(after[1] & FLAG_SERVICED), after[3] != before[3])
+
+
+class TestReplayAnimator(unittest.TestCase):
+
+    def test_replay_draws_what_live_stepping_draws(self):
+        config = random_config(7, num_floors=20, num_lifts=3, num_requests=40)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.ltrc")
+            record_trace(prepare_lifts(config), "LOOK", path)
+            lifts = prepare_lifts(config)
+            schedulers = {}
+            live = StepAnimator(lifts, lambda: [single_step(lf, "LOOK", schedulers)
+                                                for lf in lifts if lf.requests])
+            with TraceReader(path) as trace:
+                shown = trace.lifts(0)
+                replay = ReplayAnimator(trace, shown)
+                t = 0.0
+                while not live.finished(t):
+                    t += 0.35
+                    live.sync(t)
+                    replay.sync(t)
+                    self.assertEqual(replay.ticks_done, live.ticks_done)
+                    self.assertEqual(replay.positions(t), live.positions(t))
+                self.assertTrue(replay.finished(t))
+                self.assertEqual([lf.floors_traveled for lf in shown], [lf.floors_traveled for lf in lifts])
+
+    def test_seek_backwards_and_forwards(self):
+        config = random_config(8, num_floors=15, num_lifts=2, num_requests=30)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.ltrc")
+            record_trace(prepare_lifts(config), "SCAN", path)
+            with TraceReader(path) as trace:
+                shown = trace.lifts(0)
+                replay = ReplayAnimator(trace, shown)
+                last = trace.num_steps - 1
+                for step in (last, 3, 0, last // 2, last):
+                    replay.sync(float(step))
+                    self.assertEqual(replay.positions(float(step)), [float(f) for f in trace.floors(step)])
+                    self.assertEqual([lf.current_floor for lf in shown], trace.floors(step))
+                self.assertEqual(replay.step_target(float(last)), float(last))
+                replay.sync(2.0)
+                self.assertEqual(replay.step_target(2.0), 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,346 @@
+"""
+algorithms.py
+
+Implements single-lift scheduling algorithms (SCAN_lift, LOOK_lift, MYLIFT_lift)
+for a multi-lift scenario. Each function operates on a Lift instance.
+scan_step / look_step / MyLiftScheduler.step move a lift by one floor and
+are shared with the GUI (single_step picks one by algorithm name);
+run_step times them when metrics are enabled.
+
+We do not import 'calculatePriority' from utils anymore.
+MYLIFT priority logic lives in MyLiftScheduler, which keeps per-lift
+state and is shared by MYLIFT_lift, the GUI and the headless engine.
+"""
+
+import heapq
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from instrumentation import DEBUG, METRICS, TRACE
+from lift import Lift
+
+def run_step(lift: Lift, step: Callable[..., Any], *args: Any) -> Any:
+    """
+    Calls step(*args) for one lift, timed and counted by
+    instrumentation.METRICS when it is enabled.
+    """
+    if METRICS.enabled:
+        return METRICS.time_step(lift, step, *args)
+    return step(*args)
+
+
+def scan_step(lift: Lift, top_floor: int) -> None:
+    """
+    One SCAN step (at most one floor) for a lift with pending requests.
+    """
+    up_requests = lift.requests.has_above(lift.current_floor)
+    down_requests = lift.requests.has_below(lift.current_floor)
+
+    if lift.direction == "UP":
+        if up_requests:
+            old_floor = lift.current_floor
+            if lift.current_floor < top_floor:
+                lift.current_floor += 1
+                lift.floors_traveled += abs(lift.current_floor - old_floor)
+        else:
+            lift.direction = "DOWN"
+            if down_requests:
+                old_floor = lift.current_floor
+                if lift.current_floor > 1:
+                    lift.current_floor -= 1
+                    lift.floors_traveled += abs(lift.current_floor - old_floor)
+
+    elif lift.direction == "DOWN":
+        if down_requests:
+            old_floor = lift.current_floor
+            if lift.current_floor > 1:
+                lift.current_floor -= 1
+                lift.floors_traveled += abs(lift.current_floor - old_floor)
+        else:
+            lift.direction = "UP"
+            if up_requests:
+                old_floor = lift.current_floor
+                if lift.current_floor < top_floor:
+                    lift.current_floor += 1
+                    lift.floors_traveled += abs(lift.current_floor - old_floor)
+
+    # If we arrived at a request floor, remove it
+    if lift.current_floor in lift.requests:
+        lift.requests.remove(lift.current_floor)
+        lift.serviced_requests += 1
+        if TRACE.debug:
+            TRACE.event(DEBUG, "scan.service", lift=lift.lift_id, floor=lift.current_floor)
+
+
+def SCAN_lift(lift: Lift, top_floor: int) -> None:
+    """
+    Implements a full SCAN scheduling algorithm for a single Lift object.
+    Blocks until lift.requests is empty.
+    """
+    while lift.requests:
+        run_step(lift, scan_step, lift, top_floor)
+
+
+def look_step(lift: Lift) -> None:
+    """
+    One LOOK step (at most one floor) for a lift with pending requests.
+    """
+    # nearest request in each direction (None if there is none)
+    up_target = lift.requests.next_above(lift.current_floor)
+    down_target = lift.requests.next_below(lift.current_floor)
+
+    if lift.direction == "UP":
+        if up_target is not None:
+            old_floor = lift.current_floor
+            target_floor = up_target
+            if lift.current_floor < target_floor:
+                lift.current_floor += 1
+                lift.floors_traveled += abs(lift.current_floor - old_floor)
+        else:
+            lift.direction = "DOWN"
+            if down_target is not None:
+                old_floor = lift.current_floor
+                target_floor = down_target
+                if lift.current_floor > target_floor:
+                    lift.current_floor -= 1
+                    lift.floors_traveled += abs(lift.current_floor - old_floor)
+
+    elif lift.direction == "DOWN":
+        if down_target is not None:
+            old_floor = lift.current_floor
+            target_floor = down_target
+            if lift.current_floor > target_floor:
+                lift.current_floor -= 1
+                lift.floors_traveled += abs(lift.current_floor - old_floor)
+        else:
+            lift.direction = "UP"
+            if up_target is not None:
+                old_floor = lift.current_floor
+                target_floor = up_target
+                if lift.current_floor < target_floor:
+                    lift.current_floor += 1
+                    lift.floors_traveled += abs(lift.current_floor - old_floor)
+
+    # Remove serviced request if we've landed on it
+    if lift.current_floor in lift.requests:
+        lift.requests.remove(lift.current_floor)
+        lift.serviced_requests += 1
+        if TRACE.debug:
+            TRACE.event(DEBUG, "look.service", lift=lift.lift_id, floor=lift.current_floor)
+
+
+def LOOK_lift(lift: Lift) -> None:
+    """
+    Full LOOK scheduling for a single Lift object.
+    Similar to SCAN but reverses direction immediately if 
+    no requests exist in the current direction.
+    """
+    while lift.requests:
+        run_step(lift, look_step, lift)
+
+
+class MyLiftScheduler:
+    """
+    Per-lift MYLIFT state: picks the floor with the lowest
+    priority = distance - wait_time (ties go to the earliest request),
+    without rescanning or re-aging every pending request on each step.
+
+    - Waiting times age lazily: each floor stores the tick it was first
+      seen (added_at), and wait_time = now - added_at. Advancing the
+      clock ages every request at once.
+    - With c the current floor, priority + now is added_at + f - c for
+      floors f >= c and added_at - f + c for floors below, so floors sit
+      in an 'up' heap keyed (added_at + f, seq) or a 'down' heap keyed
+      (added_at - f, seq). seq is the RequestIndex insertion number, so
+      heap order also reproduces the list-order tie break.
+    - When the lift moves, floors it passes are left in the wrong heap and
+      moved over only when they reach the top. That is safe: a floor below
+      c read from the up heap scores 2 * (c - f) better than its real
+      priority (likewise for the down heap), so while it is not on top its
+      real priority cannot be the best either. Serviced or removed floors
+      are dropped lazily when their seq no longer matches lift.requests.
+
+    best_floor is O(log n) amortised; new requests are picked up from
+    lift.requests (RequestIndex.added_since) the next time it is called.
+    """
+
+    def __init__(self, lift: Lift, time_waited: Optional[Dict[int, int]] = None, now: int = 0):
+        """
+        :param lift: The lift to schedule.
+        :param time_waited: Optional starting wait times (floor -> ticks),
+                            as accepted by MYLIFT_lift.
+        :param now: Starting clock value.
+        """
+        self.lift = lift
+        self.now = now
+        self._reset()
+        self._sync(time_waited)
+
+    def _reset(self) -> None:
+        self._requests = self.lift.requests
+        self._seen_seq = 0
+        self._added_at: Dict[int, Tuple[int, int]] = {}  # floor -> (added_at, seq)
+        self._up: List[Tuple[int, int, int]] = []        # (added_at + floor, seq, floor)
+        self._down: List[Tuple[int, int, int]] = []      # (added_at - floor, seq, floor)
+
+    def add(self, floor: int, waited: int = 0, now: Optional[int] = None) -> None:
+        """
+        Requests a floor that has already been waiting for 'waited' ticks
+        (e.g. when it is handed over from another lift). No-op if the floor
+        is already requested.
+        """
+        if now is not None:
+            self.now = now
+        if floor in self.lift.requests:
+            return
+        self.lift.add_request(floor)
+        self._sync({floor: waited})
+
+    def wait_time(self, floor: int, now: Optional[int] = None) -> int:
+        """
+        Ticks a pending floor has waited (0 if it is not pending).
+        """
+        if now is not None:
+            self.now = now
+        self._sync()
+        entry = self._added_at.get(floor)
+        if entry is None or self.lift.requests.seq(floor) != entry[1]:
+            return 0
+        return self.now - entry[0]
+
+    def best_floor(self, now: Optional[int] = None) -> Optional[int]:
+        """
+        Returns the pending floor with the best priority, or None if idle.
+        """
+        if now is not None:
+            self.now = now
+        self._sync()
+        requests = self.lift.requests
+        floor = self.lift.current_floor
+        up, down = self._up, self._down
+
+        while up:
+            key, seq, f = up[0]
+            if requests.seq(f) != seq:
+                heapq.heappop(up)
+            elif f < floor:
+                heapq.heappop(up)
+                heapq.heappush(down, (key - 2 * f, seq, f))
+            else:
+                break
+        while down:
+            key, seq, f = down[0]
+            if requests.seq(f) != seq:
+                heapq.heappop(down)
+            elif f > floor:
+                heapq.heappop(down)
+                heapq.heappush(up, (key + 2 * f, seq, f))
+            else:
+                break
+
+        candidates = []
+        if up:
+            key, seq, f = up[0]
+            candidates.append((key - floor, seq, f))
+        if down:
+            key, seq, f = down[0]
+            candidates.append((key + floor, seq, f))
+        return min(candidates)[2] if candidates else None
+
+    def step(self) -> Optional[int]:
+        """
+        One MYLIFT step: moves the lift one floor towards the best floor
+        and services it on arrival, then advances the clock one tick
+        (ageing every remaining request).
+
+        :return: The wait time of the floor serviced in this step, or None.
+        """
+        best_floor = self.best_floor()
+        if best_floor is None:
+            return None
+        lift = self.lift
+        if TRACE.debug:
+            TRACE.event(DEBUG, "mylift.target", lift=lift.lift_id, floor=lift.current_floor,
+                        target=best_floor, pending=len(lift.requests))
+        old_floor = lift.current_floor
+        if best_floor > lift.current_floor:
+            lift.current_floor += 1
+            lift.direction = "UP"
+        elif best_floor < lift.current_floor:
+            lift.current_floor -= 1
+            lift.direction = "DOWN"
+        lift.floors_traveled += abs(lift.current_floor - old_floor)
+
+        serviced_wait = None
+        if lift.current_floor == best_floor:
+            serviced_wait = self.wait_time(best_floor)
+            lift.requests.remove(best_floor)
+            lift.serviced_requests += 1
+        self.now += 1
+        return serviced_wait
+
+    def _sync(self, waits: Optional[Dict[int, int]] = None) -> None:
+        """
+        Indexes floors added to lift.requests since the last call. A new
+        floor has waited 0 ticks unless 'waits' says otherwise.
+        """
+        if self.lift.requests is not self._requests:
+            self._reset()  # the whole request list was replaced
+        requests = self._requests
+        if requests.next_seq == self._seen_seq:
+            return
+        floor = self.lift.current_floor
+        for f, seq in requests.added_since(self._seen_seq):
+            added_at = self.now - (waits.get(f, 0) if waits else 0)
+            self._added_at[f] = (added_at, seq)
+            if f >= floor:
+                heapq.heappush(self._up, (added_at + f, seq, f))
+            else:
+                heapq.heappush(self._down, (added_at - f, seq, f))
+        self._seen_seq = requests.next_seq
+
+
+def MYLIFT_lift(lift: Lift, timeWaited: Dict[int, int]) -> None:
+    """
+    A custom MYLIFT algorithm for a single Lift instance.
+    priority = distance - wait_time (lower numeric value = higher priority),
+    selected with a MyLiftScheduler. timeWaited gives starting wait times.
+
+    On return timeWaited holds the same values as when every pending floor
+    was aged by one per step: each serviced floor's wait when it was
+    serviced (no entry if that was 0 and it had none). Pending floors are
+    aged lazily by the scheduler rather than rewritten each step, so if a
+    step raises, their current waits are written back before the exception
+    propagates.
+    """
+    scheduler = MyLiftScheduler(lift, timeWaited)
+    try:
+        while lift.requests:
+            serviced_wait = run_step(lift, scheduler.step)
+            if serviced_wait:  # a floor serviced before it ever aged gets no entry
+                timeWaited[lift.current_floor] = serviced_wait
+    finally:
+        for floor in lift.requests:
+            waited = scheduler.wait_time(floor)
+            if waited:
+                timeWaited[floor] = waited
+
+
+def single_step(lift: Lift, algorithm: str, schedulers: Dict[Any, MyLiftScheduler]) -> None:
+    """
+    Moves a lift with pending requests by one floor with the named
+    algorithm (SCAN, LOOK or MYLIFT): the step MultiLiftGUI animates.
+    MYLIFT waiting times are kept per lift in 'schedulers' (lift_id ->
+    MyLiftScheduler), created on first use.
+    """
+    algorithm = algorithm.upper()
+    if algorithm == "SCAN":
+        lift.next_step()
+    elif algorithm == "LOOK":
+        run_step(lift, look_step, lift)
+    elif algorithm == "MYLIFT":
+        scheduler = schedulers.get(lift.lift_id)
+        if scheduler is None:
+            scheduler = schedulers[lift.lift_id] = MyLiftScheduler(lift)
+        run_step(lift, scheduler.step)
+    else:
+        raise ValueError(f"Unknown algorithm '{algorithm}'. Expected SCAN, LOOK or MYLIFT.")
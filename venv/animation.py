@@ -0,0 +1,177 @@
+"""
+animation.py
+
+Decouples the simulation clock from rendering for MultiLiftGUI.
+
+- FrameClock turns wall-clock time into simulation time (in ticks), with a
+  speed multiplier and pause / single-step controls.
+- StepAnimator runs one simulation step each time the clock passes a tick
+  boundary and reports every lift's interpolated (fractional) floor for
+  the current instant, so a renderer can draw all lifts from one
+  fixed-rate frame loop no matter how many steps ran in between.
+- ReplayAnimator offers the same interface over a recorded trace
+  (tracefile.TraceReader): nothing is simulated, any step can be sought
+  by setting the clock, and only the frames being drawn are read.
+
+None of these classes touch Tk, so they can be driven and tested headless.
+"""
+
+import math
+from typing import Any, Callable, List, Optional
+
+from tracefile import apply_record
+
+MIN_SPEED = 0.125
+MAX_SPEED = 256.0
+
+class FrameClock:
+    """
+    Simulation time in ticks, advanced from wall-clock readings.
+    At speed 1 one tick lasts tick_seconds of wall time.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, speed: float = 1.0):
+        self.tick_seconds = tick_seconds
+        self.speed = speed
+        self.time = 0.0
+        self.paused = False
+        self._last_wall: Optional[float] = None
+
+    def advance(self, wall_now: float) -> float:
+        """
+        Moves simulation time forward by the wall time elapsed since the
+        previous call (nothing while paused). Returns the new time.
+        """
+        if self._last_wall is not None and not self.paused:
+            self.time += (wall_now - self._last_wall) * self.speed / self.tick_seconds
+        self._last_wall = wall_now
+        return self.time
+
+    def set_speed(self, speed: float) -> float:
+        self.speed = min(max(speed, MIN_SPEED), MAX_SPEED)
+        return self.speed
+
+    def pause(self) -> None:
+        self.paused = True
+
+    def resume(self) -> None:
+        self.paused = False
+
+    def toggle_pause(self) -> bool:
+        self.paused = not self.paused
+        return self.paused
+
+
+class StepAnimator:
+    """
+    Runs simulation steps as simulation time passes tick boundaries.
+
+    Step k runs as soon as the time is past k and is animated over the
+    interval [k, k + 1]: each lift's drawn floor moves linearly from where
+    it was before the step to where the step left it.
+    """
+
+    def __init__(self, lifts: List, step: Callable[[], None], max_steps_per_frame: int = 1000):
+        """
+        :param lifts: The Lift objects being simulated.
+        :param step: Advances every lift by one tick.
+        :param max_steps_per_frame: Upper bound on steps run by one sync()
+                                    call, so a high speed cannot stall a frame.
+        """
+        self.lifts = lifts
+        self.step = step
+        self.max_steps_per_frame = max_steps_per_frame
+        self.ticks_done = 0
+        self._from = [lf.current_floor for lf in lifts]
+        self._to = list(self._from)
+
+    def has_work(self) -> bool:
+        return any(lf.requests for lf in self.lifts)
+
+    def sync(self, time: float) -> int:
+        """
+        Runs every step due by 'time' (at most max_steps_per_frame).
+        Returns the number of steps run.
+        """
+        steps = 0
+        while self.ticks_done < time and steps < self.max_steps_per_frame and self.has_work():
+            self._from = [lf.current_floor for lf in self.lifts]
+            self.step()
+            self._to = [lf.current_floor for lf in self.lifts]
+            self.ticks_done += 1
+            steps += 1
+        return steps
+
+    def behind(self, time: float) -> bool:
+        """
+        True if steps are due that sync() has not run yet (the frame budget
+        ran out); the caller can then hold the clock back.
+        """
+        return self.has_work() and self.ticks_done + 1 < time
+
+    def positions(self, time: float) -> List[float]:
+        """
+        Every lift's floor at 'time', interpolated within the last step.
+        """
+        frac = min(max(time - (self.ticks_done - 1), 0.0), 1.0) if self.ticks_done else 1.0
+        return [start + (end - start) * frac for start, end in zip(self._from, self._to)]
+
+    def finished(self, time: float) -> bool:
+        """
+        True once there is no work left and the last step has been drawn.
+        """
+        return not self.has_work() and time >= self.ticks_done
+
+    def step_target(self, time: float) -> float:
+        """
+        Simulation time after one 'step' press: the end of the step being
+        animated, or the end of the next step if the current one is done.
+        """
+        if time < self.ticks_done:
+            return float(self.ticks_done)
+        return float(math.floor(time) + 1) if self.has_work() else time
+
+
+class ReplayAnimator(StepAnimator):
+    """
+    StepAnimator's interface over a recorded trace.
+
+    Frame k of the trace is the state after step k - 1 (frame 0 is the
+    start), so at time t in (k - 1, k] the lifts are drawn between frames
+    k - 1 and k, exactly as StepAnimator draws step k - 1. Seeking is
+    just setting the clock: sync() reads the frame due at any time
+    directly, forwards or backwards.
+    """
+
+    def __init__(self, trace: Any, lifts: Optional[List] = None):
+        """
+        :param trace: A tracefile.TraceReader (num_steps, floors(step), frame(step)).
+        :param lifts: Lift objects to keep in the recorded state of the
+                      current frame (e.g. the ones a GUI displays).
+        """
+        self.trace = trace
+        self.lifts = lifts
+        self.last_step = max(trace.num_steps - 1, 0)
+        self.ticks_done = 0
+        self.records = trace.frame(0) if trace.num_steps else []
+        self._from = self._to = [record[0] for record in self.records]
+
+    def has_work(self) -> bool:
+        return self.ticks_done < self.last_step
+
+    def sync(self, time: float) -> int:
+        """
+        Moves to the frame due at 'time'. Returns how many steps that skipped.
+        """
+        step = min(max(math.ceil(time), 0), self.last_step)
+        if step == self.ticks_done:
+            return 0
+        moved = abs(step - self.ticks_done)
+        self.ticks_done = step
+        self.records = self.trace.frame(step)
+        self._to = [record[0] for record in self.records]
+        self._from = self.trace.floors(step - 1) if step else self._to
+        if self.lifts is not None:
+            for lift, record in zip(self.lifts, self.records):
+                apply_record(lift, record)
+        return moved
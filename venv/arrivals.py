@@ -0,0 +1,172 @@
+"""
+arrivals.py
+
+Streaming request ingestion. Files are read one line at a time and turned
+into Arrival(t, origin, destination) tuples by generators, so day-long
+traces with millions of calls never have to be held in memory.
+
+Supported formats (picked by file extension):
+  - .jsonl  one JSON object per line: {"t": 12.5, "origin": 1, "destination": 7}
+  - .csv    rows of t,origin,destination (a 't,origin,destination' header is skipped)
+  - anything else: the original text format ('num_floors, capacity' followed
+    by 'floor: dest, dest' lines), where every request arrives at t=0.
+
+The timestamped formats may start with the building description:
+  - .jsonl  {"num_floors": 20, "capacity": 8}
+  - .csv    a two-column row: 20,8
+Arrivals must be in non-decreasing time order.
+"""
+
+import csv
+import json
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+TIMESTAMPED_EXTENSIONS = (".jsonl", ".csv")
+
+class Arrival(NamedTuple):
+    t: float          # arrival time in ticks (one tick = one floor moved)
+    origin: int
+    destination: int
+
+def is_timestamped(file_path: str) -> bool:
+    """
+    True for the JSONL/CSV arrival formats, False for the original text format.
+    """
+    return file_path.lower().endswith(TIMESTAMPED_EXTENSIONS)
+
+def _data_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Yields stripped lines, skipping blanks and '#' comments.
+    """
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+def _parse_header(line: str) -> Tuple[int, int]:
+    parts = line.split(',')
+    if len(parts) != 2:
+        raise ValueError("First line must be 'num_floors, capacity'.")
+    return int(parts[0].strip()), int(parts[1].strip())
+
+def read_building(file_path: str) -> Tuple[int, int]:
+    """
+    Returns (num_floors, capacity) from the start of an input file.
+    Raises ValueError if the file does not describe the building.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        first_line = next(_data_lines(f), None)
+    if first_line is None:
+        raise ValueError("Input file is empty or only comments.")
+
+    if file_path.lower().endswith(".jsonl"):
+        header = json.loads(first_line)
+        if "num_floors" not in header:
+            raise ValueError("JSONL input must start with {\"num_floors\": N, \"capacity\": C}.")
+        return int(header["num_floors"]), int(header.get("capacity", 0))
+    if file_path.lower().endswith(".csv") and first_line.count(',') != 1:
+        raise ValueError("CSV input must start with a 'num_floors,capacity' row.")
+    return _parse_header(first_line)
+
+def iter_text_floor_requests(file_path: str) -> Iterator[Tuple[int, List[int]]]:
+    """
+    Streams (floor, [destinations]) pairs from the original text format,
+    one line at a time. Floors listed with no destinations yield an empty list.
+    Raises ValueError for requests to the same floor or outside the building.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = _data_lines(f)
+        first_line = next(lines, None)
+        if first_line is None:
+            raise ValueError("Input file is empty or only comments.")
+        num_floors = _parse_header(first_line)[0]
+        for line in lines:
+            if ':' not in line:
+                continue
+            floor_part, dest_part = line.split(':', 1)
+            floor = int(floor_part.strip())
+            dest_part = dest_part.strip()
+            destinations = []
+            if dest_part != "":
+                for d in dest_part.split(','):
+                    dest_floor = int(d.strip())
+                    if dest_floor == floor:
+                        raise ValueError(f"Request from floor {floor} to same floor {dest_floor} not allowed.")
+                    if not (1 <= floor <= num_floors and 1 <= dest_floor <= num_floors):
+                        raise ValueError(f"Request from floor {floor} to floor {dest_floor} is outside "
+                                         f"the building (floors 1..{num_floors}).")
+                    destinations.append(dest_floor)
+            yield floor, destinations
+
+def iter_request_map_arrivals(floor_requests: Iterable[Tuple[int, List[int]]]) -> Iterator[Arrival]:
+    """
+    A static request map, as (floor, [destinations]) pairs (e.g. the
+    items() of config['requests']), as an arrival stream: everything
+    arrives at t=0.
+    """
+    for floor, destinations in floor_requests:
+        for dest_floor in destinations:
+            yield Arrival(0, floor, dest_floor)
+
+def iter_text_arrivals(file_path: str) -> Iterator[Arrival]:
+    """
+    The original text format as an arrival stream: everything arrives at t=0.
+    """
+    return iter_request_map_arrivals(iter_text_floor_requests(file_path))
+
+def iter_jsonl_arrivals(file_path: str) -> Iterator[Arrival]:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in _data_lines(f):
+            record = json.loads(line)
+            if "num_floors" in record:
+                continue  # building header
+            yield Arrival(float(record["t"]), int(record["origin"]), int(record["destination"]))
+
+def iter_csv_arrivals(file_path: str) -> Iterator[Arrival]:
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        in_header = True
+        for number, row in enumerate(csv.reader(_data_lines(f))):
+            if in_header:
+                if number == 0 and len(row) == 2:
+                    continue  # building header
+                in_header = False
+                if row and row[0].strip().lower() == "t":
+                    continue  # column names
+            if len(row) != 3:
+                raise ValueError(f"CSV rows must be 't,origin,destination', got {row}.")
+            yield Arrival(float(row[0]), int(row[1]), int(row[2]))
+
+def iter_arrivals(file_path: str, num_floors: Optional[int] = None) -> Iterator[Arrival]:
+    """
+    Streams validated arrivals from any supported format.
+
+    Raises ValueError (naming the file and record) for out-of-order times,
+    negative times, requests to the same floor or, when num_floors is
+    given, floors outside 1..num_floors.
+    """
+    if file_path.lower().endswith(".jsonl"):
+        source = iter_jsonl_arrivals(file_path)
+    elif file_path.lower().endswith(".csv"):
+        source = iter_csv_arrivals(file_path)
+    else:
+        source = iter_text_arrivals(file_path)
+    return _validated(source, file_path, num_floors)
+
+def _validated(arrivals: Iterable[Arrival], file_path: str,
+               num_floors: Optional[int] = None) -> Iterator[Arrival]:
+    last_t: Optional[float] = None
+    for number, arrival in enumerate(arrivals, start=1):
+        if arrival.t < 0:
+            raise ValueError(f"{file_path}: arrival {number} has negative time {arrival.t}.")
+        if last_t is not None and arrival.t < last_t:
+            raise ValueError(f"{file_path}: arrival {number} at t={arrival.t} is earlier "
+                             f"than the previous one (t={last_t}); arrivals must be sorted.")
+        if arrival.origin == arrival.destination:
+            raise ValueError(f"{file_path}: arrival {number} goes from floor "
+                             f"{arrival.origin} to the same floor.")
+        if num_floors is not None and not (1 <= arrival.origin <= num_floors
+                                           and 1 <= arrival.destination <= num_floors):
+            raise ValueError(f"{file_path}: arrival {number} from floor {arrival.origin} to floor "
+                             f"{arrival.destination} is outside the building (floors 1..{num_floors}).")
+        last_t = arrival.t
+        yield arrival
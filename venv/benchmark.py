@@ -0,0 +1,246 @@
+"""
+benchmark.py
+
+Timing suite for the core modules, with JSON baselines for spotting
+performance regressions.
+
+Each benchmark is run on seeded synthetic buildings (workload.py) for
+every traffic pattern (uniform, up_peak, down_peak, inter_floor) and
+building scale:
+  - parse_input_file  reading the generated workload from a text input file
+  - prepare_lifts     building lifts and distributing the requests
+  - SCAN_lift / LOOK_lift / MYLIFT_lift   running each lift to completion
+  - Lift.next_step    stepping each lift one floor at a time until idle
+
+Set-up (generating the workload, preparing fresh lifts) is not timed.
+Each case is repeated and the best and median wall times are kept.
+
+Examples:
+    python benchmark.py --out results/baseline.json
+    python benchmark.py --compare results/baseline.json --threshold 0.2
+    python benchmark.py --current results/new.json --compare results/baseline.json
+
+With --compare the exit status is 1 if any case got slower than the
+baseline by more than the threshold (and by more than --min-seconds).
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from algorithms import LOOK_lift, MYLIFT_lift, SCAN_lift
+from simulation import prepare_lifts
+from utils import log_event
+from workload import GENERATORS, generate_config, write_input_file
+
+# (num_floors, num_requests) per scale
+SCALES = {
+    "quick": [(20, 200), (50, 2000)],
+    "full": [(20, 500), (100, 5000), (500, 50000), (2000, 200000)],
+}
+
+BENCHMARKS = ("parse_input_file", "prepare_lifts", "SCAN_lift", "LOOK_lift", "MYLIFT_lift", "Lift.next_step")
+
+BASELINE_VERSION = 1
+
+def _run_lifts(run_one: Callable[[Any], None]) -> Callable[[List[Any]], None]:
+    def run(lifts):
+        for lf in lifts:
+            run_one(lf)
+    return run
+
+def _step_until_idle(lift) -> None:
+    while lift.requests:
+        lift.next_step()
+
+def _benchmark_calls(name: str, config: Dict[str, Any], input_path: str) -> Tuple[Callable[[], Any], Callable[[Any], None]]:
+    """
+    Returns (setup, run) for one benchmark; only run(setup()) is timed.
+    """
+    if name == "parse_input_file":
+        from main import parse_input_file  # main imports tkinter; keep it lazy
+        return (lambda: input_path), parse_input_file
+    if name == "prepare_lifts":
+        return (lambda: config), prepare_lifts
+    setup = lambda: prepare_lifts(config)
+    if name == "SCAN_lift":
+        return setup, _run_lifts(lambda lf: SCAN_lift(lf, lf.top_floor))
+    if name == "LOOK_lift":
+        return setup, _run_lifts(LOOK_lift)
+    if name == "MYLIFT_lift":
+        return setup, _run_lifts(lambda lf: MYLIFT_lift(lf, {}))
+    if name == "Lift.next_step":
+        return setup, _run_lifts(_step_until_idle)
+    raise ValueError(f"Unknown benchmark '{name}'. Expected one of {BENCHMARKS}.")
+
+def time_case(setup: Callable[[], Any], run: Callable[[Any], None], repeat: int) -> List[float]:
+    """
+    Runs run(setup()) 'repeat' times and returns the wall time of each run.
+    """
+    samples = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def case_key(benchmark: str, pattern: str, num_floors: int, num_requests: int, num_lifts: int) -> str:
+    return f"{benchmark}|{pattern}:{num_floors}:{num_requests}|lifts={num_lifts}"
+
+@contextlib.contextmanager
+def _quiet() -> Iterator[None]:
+    # prepare_lifts logs once per call; keep the timings free of log I/O
+    logger = logging.getLogger()
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+def run_suite(scale: str = "quick", patterns: Optional[Sequence[str]] = None,
+              benchmarks: Optional[Sequence[str]] = None, num_lifts: int = 4,
+              repeat: int = 5, seed: int = 0) -> Dict[str, Any]:
+    """
+    Runs every benchmark x pattern x building size and returns a baseline
+    document: {"version", "created", "python", "machine", "repeat",
+    "results": {case_key: row}}.
+    """
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale '{scale}'. Expected one of {sorted(SCALES)}.")
+    patterns = list(patterns or GENERATORS)
+    benchmarks = list(benchmarks or BENCHMARKS)
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as directory, _quiet():
+        for pattern in patterns:
+            for num_floors, num_requests in SCALES[scale]:
+                config = generate_config(f"{pattern}:{num_floors}:{num_requests}", seed)
+                config["num_lifts"] = num_lifts
+                input_path = os.path.join(directory, f"{pattern}_{num_floors}_{num_requests}.txt")
+                write_input_file(config, input_path)
+                for name in benchmarks:
+                    setup, run = _benchmark_calls(name, config, input_path)
+                    samples = time_case(setup, run, repeat)
+                    results[case_key(name, pattern, num_floors, num_requests, num_lifts)] = {
+                        "benchmark": name,
+                        "pattern": pattern,
+                        "num_floors": num_floors,
+                        "num_requests": num_requests,
+                        "num_lifts": num_lifts,
+                        "best_s": min(samples),
+                        "median_s": statistics.median(samples),
+                    }
+    return {
+        "version": BASELINE_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+def save_baseline(document: Dict[str, Any], path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    if document.get("version") != BASELINE_VERSION or "results" not in document:
+        raise ValueError(f"{path} is not a version {BASELINE_VERSION} benchmark baseline.")
+    return document
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.2,
+            min_seconds: float = 0.001) -> List[Dict[str, Any]]:
+    """
+    Compares best times case by case.
+
+    A case is a 'regression' when it is more than 'threshold' (a fraction)
+    slower than the baseline and the difference exceeds min_seconds (so
+    sub-millisecond noise is not flagged), an 'improvement' in the mirror
+    case, and 'ok' otherwise. Cases only in one document are 'new' or
+    'missing'.
+    """
+    base, cur = baseline["results"], current["results"]
+    rows = []
+    for key in sorted(set(base) | set(cur)):
+        if key not in base:
+            rows.append({"case": key, "status": "new", "current_s": cur[key]["best_s"]})
+            continue
+        if key not in cur:
+            rows.append({"case": key, "status": "missing", "baseline_s": base[key]["best_s"]})
+            continue
+        before, after = base[key]["best_s"], cur[key]["best_s"]
+        ratio = after / before if before > 0 else float("inf")
+        status = "ok"
+        if abs(after - before) > min_seconds:
+            if ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold):
+                status = "improvement"
+        rows.append({"case": key, "status": status, "baseline_s": before,
+                     "current_s": after, "ratio": ratio})
+    return rows
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'status':<12} {'baseline':>10} {'current':>10} {'ratio':>7}  case"]
+    for row in rows:
+        before = f"{row['baseline_s']:.4f}" if "baseline_s" in row else "-"
+        after = f"{row['current_s']:.4f}" if "current_s" in row else "-"
+        ratio = f"{row['ratio']:.2f}" if "ratio" in row else "-"
+        lines.append(f"{row['status']:<12} {before:>10} {after:>10} {ratio:>7}  {row['case']}")
+    return "\n".join(lines)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the lift algorithms and compare against a baseline.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="quick")
+    parser.add_argument("--patterns", nargs="+", choices=sorted(GENERATORS), default=None)
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=None)
+    parser.add_argument("--lifts", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="save this run as a JSON baseline")
+    parser.add_argument("--current", default=None,
+                        help="compare this saved run instead of running the suite")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown as a fraction (0.2 = 20%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.001,
+                        help="ignore differences smaller than this many seconds")
+    args = parser.parse_args()
+
+    if args.current:
+        current = load_baseline(args.current)
+    else:
+        current = run_suite(args.scale, args.patterns, args.benchmarks, args.lifts, args.repeat, args.seed)
+        for key, row in current["results"].items():
+            log_event(f"{row['best_s']:.4f}s (median {row['median_s']:.4f}s)  {key}")
+    if args.out:
+        save_baseline(current, args.out)
+        log_event(f"Benchmark results saved to {args.out}")
+
+    if args.compare:
+        rows = compare(load_baseline(args.compare), current, args.threshold, args.min_seconds)
+        print(format_comparison(rows))
+        regressions = [row for row in rows if row["status"] == "regression"]
+        if regressions:
+            log_event(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}.")
+            sys.exit(1)
+        log_event("No regressions.")
+
+if __name__ == "__main__":
+    main()
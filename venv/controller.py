@@ -0,0 +1,369 @@
+"""
+controller.py
+
+Real-time lift controller service built on asyncio.
+
+LiftController is the synchronous core: it owns the Lift objects, hands
+hall calls to a Dispatcher (simulation.py) and moves every lift one
+floor per tick with the same single step as MultiLiftGUI
+(algorithms.single_step). A hall call with a destination becomes a car
+call once the lift has stopped at the hall call's floor.
+
+ControllerService puts it behind a local socket (a Unix socket by
+default, or TCP on localhost):
+  - every connection is read by its own task; calls go into a bounded
+    queue (a full queue stops reading from the busiest clients instead
+    of growing without limit);
+  - one dispatcher task drains the queue between ticks and answers each
+    call with the lift it was given;
+  - one stepping task advances the lifts every tick_seconds and streams
+    the lifts that changed to subscribers. A subscriber that does not
+    keep up misses updates rather than holding up the loop.
+The time from receiving a call to assigning it is kept in a
+latency.StreamingHistogram (microseconds).
+
+Protocol: one JSON object per line, in both directions.
+  client -> service
+    {"type": "hall", "floor": 3, "destination": 9, "id": 17}   destination is optional
+    {"type": "car", "lift": 0, "floor": 7, "id": 18}
+    {"type": "subscribe"}      full state now, then changed lifts every tick
+    {"type": "stats"}
+  service -> client
+    {"type": "assigned", "id": 17, "lift": 2}
+    {"type": "state", "tick": 120, "lifts": [{"lift": 0, "floor": 4, "direction": "UP", "pending": 3}]}
+    {"type": "stats", "tick": 120, "num_floors": 20, "num_lifts": 4, ...}
+    {"type": "error", "id": 17, "error": "..."}
+
+Examples:
+    python controller.py --floors 20 --lifts 4 --algorithm LOOK --dispatcher eta
+    python controller.py --port 8765 --tick 0.05
+    python loadgen.py --connections 8 --rate 5000 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from algorithms import single_step
+from arrivals import Arrival
+from latency import StreamingHistogram
+from lift import Lift
+from simulation import make_dispatcher, prepare_lifts
+from utils import log_event
+
+DEFAULT_SOCKET = "/tmp/lift-controller.sock"
+QUEUE_SIZE = 10000              # calls waiting for the dispatcher
+MAX_SUBSCRIBER_BUFFER = 1 << 20  # bytes queued for a subscriber before updates are dropped
+
+def encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+class LiftController:
+    """
+    Lifts, dispatcher and calls in flight, advanced one tick at a time.
+
+    Usage:
+        controller = LiftController(prepare_lifts({"num_floors": 20, "num_lifts": 4}), "LOOK")
+        lift = controller.hall_call(3, destination=12)
+        changed = controller.step()
+    """
+
+    def __init__(self, lifts: List[Lift], algorithm: str = "LOOK", dispatcher="least_loaded"):
+        self.lifts = lifts
+        self.algorithm = algorithm.upper()
+        self.num_floors = max((lf.top_floor for lf in lifts), default=1)
+        self.dispatcher = make_dispatcher(dispatcher, lifts)
+        self.tick = 0
+        self.hall_calls = 0
+        self.car_calls = 0
+        self._schedulers: Dict[Any, Any] = {}  # lift_id -> MyLiftScheduler
+        # per lift: floor -> destinations to request once the lift stops there
+        self._destinations: List[Dict[int, List[int]]] = [{} for _ in lifts]
+
+    def hall_call(self, floor: int, destination: Optional[int] = None) -> int:
+        """
+        Assigns a call from 'floor' (optionally going to 'destination') to
+        a lift and returns its index.
+        """
+        self._check_floor(floor)
+        if destination is not None:
+            self._check_floor(destination)
+            if destination == floor:
+                raise ValueError(f"Destination {destination} is the floor the call was made from.")
+        index = self.dispatcher.select(Arrival(self.tick, floor, floor if destination is None else destination),
+                                       self.tick)
+        lift = self.lifts[index]
+        if destination is not None:
+            self._destinations[index].setdefault(floor, []).append(destination)
+        lift.add_request(floor)
+        self.dispatcher.update(index)
+        self.hall_calls += 1
+        return index
+
+    def car_call(self, index: int, floor: int) -> int:
+        """
+        Requests a floor from inside lift 'index'. Returns the index.
+        """
+        if isinstance(index, bool) or not 0 <= index < len(self.lifts):
+            raise ValueError(f"Unknown lift {index}; there are {len(self.lifts)} lifts.")
+        self._check_floor(floor)
+        self.lifts[index].add_request(floor)
+        self.dispatcher.update(index)
+        self.car_calls += 1
+        return index
+
+    def step(self) -> List[int]:
+        """
+        Moves every lift with requests by one floor. Returns the indices
+        of the lifts that were stepped.
+        """
+        self.tick += 1
+        changed = []
+        for index, lift in enumerate(self.lifts):
+            if not lift.requests:
+                continue
+            serviced = lift.serviced_requests
+            single_step(lift, self.algorithm, self._schedulers)
+            if lift.serviced_requests != serviced:
+                for destination in self._destinations[index].pop(lift.current_floor, ()):
+                    lift.add_request(destination)
+            self.dispatcher.update(index)
+            changed.append(index)
+        return changed
+
+    def snapshot(self, indices: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        State of the given lifts (all lifts by default).
+        """
+        if indices is None:
+            indices = range(len(self.lifts))
+        return [{"lift": i, "floor": self.lifts[i].current_floor, "direction": self.lifts[i].direction,
+                 "pending": len(self.lifts[i].requests)} for i in indices]
+
+    def _check_floor(self, floor: Any) -> None:
+        # bool is an int subclass, but true/false is not a floor
+        if isinstance(floor, bool) or not isinstance(floor, int) or not 1 <= floor <= self.num_floors:
+            raise ValueError(f"Floor {floor!r} is outside the building (1..{self.num_floors}).")
+
+
+class ControllerService:
+    """
+    Serves a LiftController over a local socket (see the module docstring).
+
+    Usage:
+        service = ControllerService(controller, tick_seconds=0.1)
+        await service.start(path="/tmp/lift.sock")   # or start(port=8765)
+        await service.serve_forever()
+    """
+
+    def __init__(self, controller: LiftController, tick_seconds: float = 0.1,
+                 queue_size: int = QUEUE_SIZE):
+        self.controller = controller
+        self.tick_seconds = tick_seconds
+        self.queue_size = queue_size
+        self.assign_latency = StreamingHistogram()  # microseconds from receipt to assignment
+        self.dropped_updates = 0
+        self.errors = 0
+        self._calls: Optional[asyncio.Queue] = None
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self._subscribers: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: List[asyncio.Task] = []
+        self.path: Optional[str] = None
+        self.address: Optional[Tuple[str, int]] = None
+
+    async def start(self, path: Optional[str] = None, host: str = "127.0.0.1",
+                    port: Optional[int] = None) -> None:
+        """
+        Starts listening (on a Unix socket at 'path', or TCP host:port if a
+        port is given; port 0 picks a free one) and starts the dispatcher
+        and stepping tasks.
+        """
+        self._calls = asyncio.Queue(self.queue_size)
+        if port is not None:
+            self._server = await asyncio.start_server(self._handle, host, port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+            where = f"{self.address[0]}:{self.address[1]}"
+        else:
+            self.path = path or DEFAULT_SOCKET
+            if os.path.exists(self.path):
+                os.unlink(self.path)  # left over from a previous run
+            self._server = await asyncio.start_unix_server(self._handle, self.path)
+            where = self.path
+        self._tasks = [asyncio.create_task(self._dispatch_calls()),
+                       asyncio.create_task(self._step_lifts())]
+        log_event(f"Lift controller listening on {where} ({len(self.controller.lifts)} lifts, "
+                  f"{self.controller.num_floors} floors, {self.controller.algorithm}, "
+                  f"tick {self.tick_seconds}s)")
+
+    async def serve_forever(self) -> None:
+        await asyncio.gather(*self._tasks)
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            # wait_closed waits for open connections too, so close them first
+            for writer in list(self._clients):
+                writer.close()
+            await self._server.wait_closed()
+        self._clients.clear()
+        self._subscribers.clear()
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        controller = self.controller
+        return {
+            "type": "stats",
+            "tick": controller.tick,
+            "num_floors": controller.num_floors,
+            "num_lifts": len(controller.lifts),
+            "algorithm": controller.algorithm,
+            "hall_calls": controller.hall_calls,
+            "car_calls": controller.car_calls,
+            "queued": self._calls.qsize() if self._calls is not None else 0,
+            "subscribers": len(self._subscribers),
+            "dropped_updates": self.dropped_updates,
+            "errors": self.errors,
+            "assign_latency_us": self.assign_latency.summary(),
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Reads one client's messages until it disconnects.
+        """
+        self._clients.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("Each line must be a JSON object.")
+                except ValueError as e:
+                    self._reply(writer, {"type": "error", "error": f"Invalid message: {e}"})
+                    continue
+                kind = message.get("type")
+                if kind in ("hall", "car"):
+                    # blocks this client only, and only while the queue is full
+                    await self._calls.put((time.perf_counter(), message, writer))
+                elif kind == "subscribe":
+                    self._subscribers.add(writer)
+                    self._reply(writer, {"type": "state", "tick": self.controller.tick,
+                                         "lifts": self.controller.snapshot()})
+                elif kind == "stats":
+                    self._reply(writer, self.stats())
+                else:
+                    self._reply(writer, {"type": "error", "id": message.get("id"),
+                                         "error": f"Unknown message type {kind!r}."})
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(writer)
+            self._subscribers.discard(writer)
+            writer.close()
+
+    async def _dispatch_calls(self) -> None:
+        """
+        Assigns queued calls in arrival order and answers each one.
+        """
+        controller = self.controller
+        while True:
+            received, message, writer = await self._calls.get()
+            batch = [(received, message, writer)]
+            while not self._calls.empty() and len(batch) < 1000:
+                batch.append(self._calls.get_nowait())
+            for received, message, writer in batch:
+                try:
+                    if message["type"] == "hall":
+                        index = controller.hall_call(message.get("floor"), message.get("destination"))
+                    else:
+                        index = controller.car_call(message.get("lift"), message.get("floor"))
+                    reply = {"type": "assigned", "id": message.get("id"), "lift": index}
+                except (ValueError, TypeError) as e:
+                    self.errors += 1
+                    reply = {"type": "error", "id": message.get("id"), "error": str(e)}
+                self.assign_latency.add((time.perf_counter() - received) * 1e6)
+                self._reply(writer, reply)
+            # let readers and the stepping task run between batches
+            await asyncio.sleep(0)
+
+    async def _step_lifts(self) -> None:
+        """
+        Advances the lifts every tick_seconds and publishes what changed.
+        """
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            changed = self.controller.step()
+            if changed and self._subscribers:
+                self._publish(encode({"type": "state", "tick": self.controller.tick,
+                                      "lifts": self.controller.snapshot(changed)}))
+            next_tick += self.tick_seconds
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick = loop.time()  # fell behind; do not try to catch up in a burst
+            await asyncio.sleep(max(delay, 0))
+
+    def _publish(self, line: bytes) -> None:
+        for writer in list(self._subscribers):
+            if writer.is_closing():
+                self._subscribers.discard(writer)
+            elif writer.transport.get_write_buffer_size() > MAX_SUBSCRIBER_BUFFER:
+                self.dropped_updates += 1
+            else:
+                writer.write(line)
+
+    def _reply(self, writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+        if not writer.is_closing():
+            writer.write(encode(message))
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    lifts = prepare_lifts({"num_floors": args.floors, "num_lifts": args.lifts})
+    service = ControllerService(LiftController(lifts, args.algorithm, args.dispatcher), args.tick)
+    await service.start(path=args.socket, port=args.port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # e.g. Windows; Ctrl+C still raises KeyboardInterrupt
+            pass
+    serving = asyncio.ensure_future(service.serve_forever())
+    stopping = asyncio.ensure_future(stop.wait())
+    try:
+        await asyncio.wait({serving, stopping}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stopping.cancel()
+        await service.close()
+        stats = service.stats()
+        log_event(f"Lift controller stopped after {stats['tick']} ticks: {stats['hall_calls']} hall calls, "
+                  f"{stats['car_calls']} car calls, {stats['errors']} errors.")
+    if serving.done() and not serving.cancelled():
+        serving.result()  # re-raise a crash in the dispatcher or stepping task
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the lift controller service.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--port", type=int, default=None, help="listen on TCP localhost:PORT instead")
+    parser.add_argument("--floors", type=int, default=20)
+    parser.add_argument("--lifts", type=int, default=4)
+    parser.add_argument("--algorithm", choices=("SCAN", "LOOK", "MYLIFT"), default="LOOK")
+    parser.add_argument("--dispatcher", default="least_loaded")
+    parser.add_argument("--tick", type=float, default=0.1, help="seconds per tick (one floor)")
+    args = parser.parse_args()
+    asyncio.run(_serve(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+"""
+engine.py
+
+A headless, discrete-event simulation engine for the multi-lift system.
+
+It takes the lifts produced by simulation.prepare_lifts and runs SCAN, LOOK
+or MYLIFT on an integer clock, where one tick is one floor moved (the same
+unit as one MultiLiftGUI.simulation_step). Instead of moving every lift one
+floor per tick, each lift jumps straight to its next stop and the engine
+pops the earliest pending stop from a heap.
+
+The per-lift results (floors_traveled, serviced_requests, final floor and
+direction) match stepping the lifts with Lift.next_step, LOOK_lift and
+MYLIFT_lift one floor at a time.
+
+Requests can also arrive online: pass an iterable of Arrival(t, origin,
+destination) (e.g. arrivals.iter_arrivals(path)) and the engine pulls one
+arrival at a time. An arrival with time t is handed to a lift at tick
+ceil(t). If that lift is part-way through a leg, the engine works out
+where it is at that tick and plans again from there. The lift first gets
+the origin as a stop; when it stops there the request is picked up and
+the destination is added.
+
+Each completed request's wait (call to pickup) and ride (pickup to
+destination) are recorded in streaming histograms (latency.py), overall
+and per lift. Floors put straight into lift.requests (e.g. a static
+request map spread by prepare_lifts, as the GUI uses and
+simulation.run_simulation does by default) are plain stops with no
+passenger. With config['passengers'] set, simulation.build_engine streams
+a static map in as t=0 arrivals instead, so its requests are picked up,
+timed and limited by capacity like any other.
+
+Streamed passengers are kept in a passengers.PassengerTable (parallel
+arrays, ids reused once a passenger alights) and lifts enforce
+Lift.capacity: at a stop riders alight first, then waiting passengers
+board while there is room and the rest wait for the lift to come back.
+A full lift bypasses its hall calls (they are set aside, keeping their
+MYLIFT waiting time) until someone gets off. Plain stops in
+lift.requests have no passenger and do not count against capacity.
+
+Which lift gets a request is decided by a Dispatcher from simulation.py
+(least-loaded by default). The engine keeps it informed of every lift's
+load and committed floor, and with reassign=True lets a lift that runs out
+of work take a pending floor over from the busiest lift.
+
+With a trace writer attached (engine.trace, see tracefile.record_engine)
+the engine writes one frame per tick, working out where each lift is
+part-way through a leg the same way it does when a leg is cut short.
+
+When instrumentation.METRICS is enabled, every leg (floors moved, stop
+serviced, reversal) and every assignment is added to the lift's counters.
+"""
+
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from algorithms import MyLiftScheduler
+from arrivals import Arrival
+from instrumentation import DEBUG, METRICS, TRACE
+from latency import LatencyRecorder
+from lift import Lift
+from passengers import PassengerTable
+
+ALGORITHMS = ("SCAN", "LOOK", "MYLIFT")
+
+
+def scan_next_stop(lift: Lift) -> Tuple[int, int, str]:
+    """
+    Returns (target_floor, ticks, direction) for the next stop of a lift
+    driven by SCAN or LOOK. Both step the same way in this project: keep
+    going while requests exist in the current direction, otherwise reverse.
+
+    A lift whose only request is its current floor spends one tick
+    reversing before it services it, exactly like Lift.next_step.
+    """
+    floor = lift.current_floor
+    up_target = lift.requests.next_above(floor)
+    down_target = lift.requests.next_below(floor)
+
+    if lift.direction == "UP":
+        if up_target is not None:
+            target, direction = up_target, "UP"
+        elif down_target is not None:
+            target, direction = down_target, "DOWN"
+        else:
+            target, direction = floor, "DOWN"
+    else:
+        if down_target is not None:
+            target, direction = down_target, "DOWN"
+        elif up_target is not None:
+            target, direction = up_target, "UP"
+        else:
+            target, direction = floor, "UP"
+
+    return target, max(1, abs(target - floor)), direction
+
+
+def mylift_next_stop(scheduler: MyLiftScheduler, now: int) -> Tuple[int, int, str]:
+    """
+    Returns (target_floor, ticks, direction) for the next MYLIFT stop.
+
+    Uses the same rule as MYLIFT_lift: priority = distance - wait_time,
+    lowest wins, ties go to the earliest request in the list. Every pending
+    request ages by one per tick, so the chosen floor stays the best one
+    until the lift reaches it and the whole leg can be taken in one jump.
+
+    :param scheduler: The lift's MyLiftScheduler (waiting times are derived
+                      lazily from the tick each floor was first seen).
+    :param now: The current engine time in ticks.
+    """
+    lift = scheduler.lift
+    floor = lift.current_floor
+    best_floor = scheduler.best_floor(now)
+    if best_floor is None:
+        best_floor = floor
+
+    if best_floor > floor:
+        direction = "UP"
+    elif best_floor < floor:
+        direction = "DOWN"
+    else:
+        direction = lift.direction
+    return best_floor, max(1, abs(best_floor - floor)), direction
+
+
+class SimulationEngine:
+    """
+    Runs one scheduling algorithm over a list of lifts without any display.
+
+    Usage:
+        engine = SimulationEngine(prepare_lifts(config), algorithm="LOOK")
+        results = engine.run()
+
+        # requests streamed in over time, sent to the lift with the best ETA
+        engine = SimulationEngine(lifts, "SCAN", arrivals=iter_arrivals("day.jsonl"),
+                                  dispatcher="eta", reassign=True)
+    """
+
+    def __init__(self, lifts: List[Lift], algorithm: str = "SCAN",
+                 arrivals: Optional[Iterable[Arrival]] = None,
+                 dispatcher="least_loaded", reassign: bool = False):
+        """
+        :param dispatcher: A simulation.Dispatcher or one of the names in
+                           simulation.DISPATCHERS.
+        :param reassign: Let lifts that run out of work take over pending
+                         floors from the busiest lift.
+        """
+        # simulation.py imports this module, so import it here
+        from simulation import make_dispatcher
+
+        self.lifts = lifts
+        self.algorithm = algorithm.upper()
+        if self.algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{algorithm}'. Expected one of {ALGORITHMS}.")
+
+        self.now = 0
+        # heap of (stop_time, lift_index, version); an entry is stale once
+        # the lift's version moves on (its leg was cut short by a new request)
+        self._events: List[Tuple[int, int, int]] = []
+        self._versions = [0] * len(lifts)
+        # lift_index -> (target_floor, direction, start_time, start_floor)
+        # for the leg in progress
+        self._plans: Dict[int, Tuple[int, str, int, int]] = {}
+        # per-lift MYLIFT state (waiting times, priority heaps)
+        self._mylift = [MyLiftScheduler(lf) for lf in lifts] if self.algorithm == "MYLIFT" else []
+
+        # passengers in flight, per lift: floor -> ids of passengers
+        # waiting there to be picked up / riding in the lift to that floor
+        self.passengers = PassengerTable()
+        self._waiting: List[Dict[int, List[int]]] = [{} for _ in lifts]
+        self._riding: List[Dict[int, List[int]]] = [{} for _ in lifts]
+        # hall calls set aside while a lift is full: floor -> tick called
+        self._deferred: List[Dict[int, int]] = [{} for _ in lifts]
+        self._peak_load = [lf.load for lf in lifts]
+        self.left_behind = 0     # boardings refused because the lift was full
+        self.bypassed_calls = 0  # hall calls set aside by a full lift
+        self.latency = LatencyRecorder(self.algorithm)
+        self.completed_requests = 0
+
+        self._arrivals = iter(arrivals) if arrivals is not None else iter(())
+        self._next_arrival: Optional[Arrival] = next(self._arrivals, None)
+        self.requests_received = 0
+
+        self.dispatcher = make_dispatcher(dispatcher, lifts)
+        self.reassign = reassign
+        self.reassignments = 0
+
+        # optional tracefile.TraceWriter; frames are written up to _traced
+        self.trace = None
+        self._traced = -1
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Processes stop events (and arrivals, if any) until the arrival stream
+        is exhausted and every lift has serviced all requests.
+        Returns the summary produced by results().
+        """
+        for index in range(len(self.lifts)):
+            self._plan(index)
+        if self.reassign:
+            for index, lift in enumerate(self.lifts):
+                if not lift.requests:
+                    self._rebalance(index)
+
+        while self._events or self._next_arrival is not None:
+            # stops at tick T happen before requests arriving at tick T
+            if self._next_arrival is not None and (
+                    not self._events or math.ceil(self._next_arrival.t) < self._events[0][0]):
+                self._admit_arrivals()
+                continue
+
+            time, index, version = heapq.heappop(self._events)
+            if version != self._versions[index]:
+                continue
+            if self.trace is not None:
+                self._trace_to(time - 1)
+            self.now = time
+            self._arrive(index)
+            self._plan(index)
+            if self.reassign and not self.lifts[index].requests:
+                self._rebalance(index)
+
+        if self.trace is not None:
+            self._trace_to(self.now)
+        return self.results()
+
+    def _admit_arrivals(self) -> None:
+        """
+        Advances the clock to the next arrival tick and assigns every request
+        arriving at that tick.
+        """
+        tick = math.ceil(self._next_arrival.t)
+        if tick < self.now:
+            raise ValueError(f"Arrival at t={self._next_arrival.t} is earlier than the "
+                             f"simulation clock ({self.now}); arrivals must be sorted by time.")
+        if self.trace is not None:
+            self._trace_to(tick - 1)
+        self.now = tick
+        while self._next_arrival is not None and math.ceil(self._next_arrival.t) == tick:
+            arrival = self._next_arrival
+            self._next_arrival = next(self._arrivals, None)
+            self._assign(arrival)
+
+    def _assign(self, arrival: Arrival) -> None:
+        """
+        Gives a new request to the lift chosen by the dispatcher and
+        re-plans that lift. (Dispatchers only look at the origin, so the
+        arrival is passed to select() as is.)
+        """
+        index = self.dispatcher.select(arrival, self.now)
+        if TRACE.debug:
+            TRACE.event(DEBUG, "engine.assign", t=self.now, lift=index,
+                        origin=arrival.origin, destination=arrival.destination)
+        self._interrupt(index)
+        passenger = self.passengers.add(arrival.origin, arrival.destination, arrival.t)
+        self._waiting[index].setdefault(arrival.origin, []).append(passenger)
+        lift = self.lifts[index]
+        if METRICS.enabled:
+            METRICS.record(lift.lift_id, assigned=1)
+        if lift.is_full and arrival.origin not in lift.requests:
+            self._deferred[index].setdefault(arrival.origin, self.now)
+            self.bypassed_calls += 1
+        else:
+            lift.add_request(arrival.origin)
+        self.requests_received += 1
+        self._plan(index)
+
+    def _rebalance(self, index: int) -> None:
+        """
+        Lets an idle lift take over a pending floor from the busiest lift.
+        """
+        move = self.dispatcher.rebalance(index)
+        if move is None:
+            return
+        floor, donor = move
+        if floor in self._riding[donor]:
+            return  # passengers on board the donor are going there
+        self._interrupt(donor)
+        if self._mylift:
+            # the floor keeps the waiting time it built up on the donor
+            waited = self._mylift[donor].wait_time(floor, self.now)
+            self.lifts[donor].requests.remove(floor)
+            self._mylift[index].add(floor, waited, self.now)
+        else:
+            self.lifts[donor].requests.remove(floor)
+            self.lifts[index].add_request(floor)
+        waiting = self._waiting[donor].pop(floor, [])
+        if waiting:
+            self._waiting[index].setdefault(floor, []).extend(waiting)
+        self.reassignments += 1
+        self._plan(donor)
+        self._plan(index)
+
+    def _interrupt(self, index: int) -> None:
+        """
+        Cancels a lift's leg in progress and moves it to where it is at the
+        current tick, as if it had been stepped one floor per tick.
+        """
+        plan = self._plans.pop(index, None)
+        if plan is None:
+            return
+        self._versions[index] += 1
+        target, direction, start_time, start_floor = plan
+        elapsed = self.now - start_time
+        if elapsed == 0:
+            return  # nothing has happened yet (direction is only set on the first tick)
+
+        lift = self.lifts[index]
+        if METRICS.enabled:
+            METRICS.record(lift.lift_id, floors=elapsed, reversals=int(direction != lift.direction))
+        step = 1 if target > start_floor else -1
+        lift.current_floor = start_floor + step * elapsed
+        lift.floors_traveled += elapsed
+        lift.direction = direction
+
+    def _plan(self, index: int) -> None:
+        """
+        Works out the next stop of a lift and schedules its arrival event.
+        """
+        lift = self.lifts[index]
+        if not lift.requests:
+            self.dispatcher.update(index)
+            return
+
+        if self.algorithm == "MYLIFT":
+            target, ticks, direction = mylift_next_stop(self._mylift[index], self.now)
+        else:
+            target, ticks, direction = scan_next_stop(lift)
+
+        if not 1 <= target <= lift.top_floor:
+            raise ValueError(f"Lift {lift.lift_id} cannot reach floor {target} "
+                             f"(building has floors 1..{lift.top_floor}).")
+
+        self._plans[index] = (target, direction, self.now, lift.current_floor)
+        heapq.heappush(self._events, (self.now + ticks, index, self._versions[index]))
+        self.dispatcher.update(index, target, direction, self.now + ticks)
+
+    def _arrive(self, index: int) -> None:
+        """
+        Moves a lift to the target of its current leg and services it.
+        """
+        lift = self.lifts[index]
+        target, direction, _, _ = self._plans.pop(index)
+        if METRICS.enabled:
+            METRICS.record(lift.lift_id, floors=abs(target - lift.current_floor), serviced=1,
+                           reversals=int(direction != lift.direction))
+
+        lift.floors_traveled += abs(target - lift.current_floor)
+        lift.current_floor = target
+        lift.direction = direction
+        lift.requests.remove(target)
+        lift.serviced_requests += 1
+        if TRACE.debug:
+            TRACE.event(DEBUG, "engine.stop", t=self.now, lift=index, floor=target)
+        self._exchange(index, target)
+
+    def _exchange(self, index: int, floor: int) -> None:
+        """
+        At a stop: passengers riding to this floor alight, then passengers
+        waiting here board while there is room and their destinations
+        become stops. Anyone left behind keeps the floor as a hall call.
+        """
+        lift = self.lifts[index]
+        riders = self._riding[index].pop(floor, ())
+        for passenger in riders:
+            wait, ride = self.passengers.alight(passenger, self.now)
+            self._complete(lift, wait, ride)
+        lift.load -= len(riders)
+
+        self._deferred[index].pop(floor, None)
+        waiting = self._waiting[index].pop(floor, None)
+        if waiting:
+            room = len(waiting) if lift.capacity is None else max(0, lift.capacity - lift.load)
+            boarding = waiting[:room]
+            for passenger in boarding:
+                self.passengers.board(passenger, self.now)
+                destination = self.passengers.destination[passenger]
+                self._riding[index].setdefault(destination, []).append(passenger)
+                lift.add_request(destination)
+            lift.load += len(boarding)
+            if lift.load > self._peak_load[index]:
+                self._peak_load[index] = lift.load
+            if len(boarding) < len(waiting):
+                self._waiting[index][floor] = waiting[len(boarding):]
+                self._deferred[index][floor] = self.now
+                self.left_behind += len(waiting) - len(boarding)
+                if TRACE.debug:
+                    TRACE.event(DEBUG, "engine.full", t=self.now, lift=index, floor=floor,
+                                left_behind=len(waiting) - len(boarding))
+
+        if lift.is_full:
+            self._bypass_hall_calls(index)
+        elif self._deferred[index]:
+            self._restore_hall_calls(index)
+
+    def _bypass_hall_calls(self, index: int) -> None:
+        """
+        Sets aside the hall calls of a full lift, so it only stops where
+        riders get off. Floors riders are going to stay requested.
+        """
+        lift = self.lifts[index]
+        deferred = self._deferred[index]
+        for floor in self._waiting[index]:
+            if floor in lift.requests and floor not in self._riding[index]:
+                waited = self._mylift[index].wait_time(floor, self.now) if self._mylift else 0
+                lift.requests.remove(floor)
+                deferred[floor] = self.now - waited
+                self.bypassed_calls += 1
+
+    def _restore_hall_calls(self, index: int) -> None:
+        """
+        Requests the set-aside hall calls again once the lift has room.
+        MYLIFT waiting times count from the original call.
+        """
+        lift = self.lifts[index]
+        for floor, called_at in self._deferred[index].items():
+            if self._mylift:
+                self._mylift[index].add(floor, self.now - called_at, self.now)
+            else:
+                lift.add_request(floor)
+        self._deferred[index].clear()
+
+    def _trace_to(self, tick: int) -> None:
+        """
+        Writes a trace frame for every tick up to 'tick' not written yet.
+        Called before the clock moves past them, so nothing else happens
+        at those ticks: lifts part-way through a leg are interpolated.
+        """
+        lifts, plans = self.lifts, self._plans
+        for t in range(self._traced + 1, tick + 1):
+            states = []
+            for index, lf in enumerate(lifts):
+                plan = plans.get(index)
+                if plan is None or t == plan[2]:
+                    states.append((lf.current_floor, lf.direction, lf.floors_traveled, lf.serviced_requests))
+                    continue
+                target, direction, start_time, start_floor = plan
+                moved = min(t - start_time, abs(target - start_floor))
+                floor = start_floor + moved if target >= start_floor else start_floor - moved
+                states.append((floor, direction, lf.floors_traveled + moved, lf.serviced_requests))
+            self.trace.write_states(states)
+        self._traced = max(self._traced, tick)
+
+    def _complete(self, lift: Lift, wait: float, ride: float) -> None:
+        self.completed_requests += 1
+        self.latency.record(lift.lift_id, wait, ride)
+
+    def results(self) -> Dict[str, Any]:
+        """
+        Summarises the run: total time in ticks, floors traveled, stops
+        serviced and throughput (stops per tick), completed requests and
+        their latency percentiles (see latency.LatencyRecorder.summary),
+        plus per-lift figures.
+        """
+        total_distance = sum(lf.floors_traveled for lf in self.lifts)
+        serviced = sum(lf.serviced_requests for lf in self.lifts)
+        return {
+            "algorithm": self.algorithm,
+            "total_time": self.now,
+            "total_distance": total_distance,
+            "serviced_requests": serviced,
+            "throughput": serviced / self.now if self.now else 0.0,
+            "requests_received": self.requests_received,
+            "reassignments": self.reassignments,
+            "completed_requests": self.completed_requests,
+            "left_behind": self.left_behind,
+            "bypassed_calls": self.bypassed_calls,
+            "peak_passengers_in_flight": self.passengers.peak,
+            "latency": self.latency.summary(),
+            "lifts": [
+                {
+                    "lift_id": lf.lift_id,
+                    "floor": lf.current_floor,
+                    "floors_traveled": lf.floors_traveled,
+                    "serviced_requests": lf.serviced_requests,
+                    "peak_load": peak_load,
+                }
+                for lf, peak_load in zip(self.lifts, self._peak_load)
+            ],
+        }
+
+
+def run_engine(lifts: List[Lift], algorithm: str = "SCAN",
+               arrivals: Optional[Iterable[Arrival]] = None,
+               dispatcher="least_loaded", reassign: bool = False) -> Dict[str, Any]:
+    """
+    Convenience wrapper: runs a SimulationEngine to completion.
+    """
+    return SimulationEngine(lifts, algorithm, arrivals, dispatcher, reassign).run()
@@ -0,0 +1,155 @@
+"""
+fleet.py
+
+A struct-of-arrays representation of many independent lifts, for
+capacity-planning studies with thousands of lift/building instances.
+
+Instead of one Lift object per car, a Fleet keeps one NumPy array per
+field (current floor, direction, floors traveled, requests serviced) and
+a boolean request bitmap with one row per lift. Fleet.step advances every
+lift by one SCAN or LOOK step at once, with the same rules as
+Lift.next_step / LOOK_lift, so results can be checked against
+algorithms.py via from_lifts / to_lifts.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+from lift import Lift
+
+UP = 1
+DOWN = -1
+
+class Fleet:
+    def __init__(self, num_lifts: int, top_floor, start_floor=1, capacity=None):
+        """
+        :param num_lifts: Number of independent lifts (one per building instance if you like).
+        :param top_floor: Highest floor, either one int or one value per lift.
+        :param start_floor: Starting floor, either one int or one value per lift.
+        :param capacity: Passengers per lift (0 or None: no limit), either one value
+                         or one per lift. Only carried to and from Lift objects;
+                         the vectorized steps do not model passengers.
+        """
+        self.top_floor = np.broadcast_to(np.asarray(top_floor, dtype=np.int64), (num_lifts,)).copy()
+        self.floor = np.broadcast_to(np.asarray(start_floor, dtype=np.int64), (num_lifts,)).copy()
+        if capacity is None:
+            capacity = 0
+        elif not np.isscalar(capacity):
+            capacity = [c or 0 for c in capacity]
+        self.capacity = np.broadcast_to(np.asarray(capacity, dtype=np.int64), (num_lifts,)).copy()
+        self.direction = np.full(num_lifts, UP, dtype=np.int64)
+        self.traveled = np.zeros(num_lifts, dtype=np.int64)
+        self.serviced = np.zeros(num_lifts, dtype=np.int64)
+
+        # requests[i, f] is True when lift i must still visit floor f
+        # (column 0 is unused so floors index the bitmap directly)
+        width = int(self.top_floor.max()) + 1 if num_lifts else 1
+        self.requests = np.zeros((num_lifts, width), dtype=bool)
+
+        self._rows = np.arange(num_lifts)
+        self._floors = np.arange(width)
+
+    def __len__(self) -> int:
+        return len(self.floor)
+
+    def add_request(self, lift_index: int, dest_floor: int) -> None:
+        """
+        Marks dest_floor as requested for one lift.
+        """
+        if not 1 <= dest_floor <= self.top_floor[lift_index]:
+            raise ValueError(f"Floor {dest_floor} is outside 1..{self.top_floor[lift_index]} "
+                             f"for lift {lift_index}.")
+        self.requests[lift_index, dest_floor] = True
+
+    def active(self) -> np.ndarray:
+        """
+        Boolean mask of lifts that still have requests.
+        """
+        return self.requests.any(axis=1)
+
+    def step(self, algorithm: str = "SCAN") -> np.ndarray:
+        """
+        Advances every lift by one SCAN or LOOK step (at most one floor).
+
+        Per lift, like Lift.next_step: if nothing is requested ahead in the
+        current direction, reverse; then move one floor if something is
+        requested ahead; then service the floor we are on.
+        Lifts without requests do nothing.
+
+        :return: Mask of lifts that had requests at the start of the step.
+        """
+        if algorithm.upper() not in ("SCAN", "LOOK"):
+            raise ValueError(f"Fleet supports SCAN and LOOK, not '{algorithm}'.")
+
+        active = self.active()
+        floor_col = self.floor[:, None]
+        above = (self.requests & (self._floors > floor_col)).any(axis=1)
+        below = (self.requests & (self._floors < floor_col)).any(axis=1)
+
+        going_up = self.direction == UP
+        reverse = active & np.where(going_up, ~above, ~below)
+        self.direction = np.where(reverse, -self.direction, self.direction)
+
+        going_up = self.direction == UP
+        ahead = np.where(going_up, above & (self.floor < self.top_floor),
+                         below & (self.floor > 1))
+        move = np.where(ahead, self.direction, 0)
+        self.floor += move
+        self.traveled += np.abs(move)
+
+        arrived = self.requests[self._rows, self.floor]
+        self.serviced += arrived
+        self.requests[self._rows, self.floor] = False
+        return active
+
+    def run(self, algorithm: str = "SCAN", max_steps: Optional[int] = None) -> int:
+        """
+        Steps the whole fleet until every lift is idle (or max_steps is reached).
+        Returns the number of steps taken.
+        """
+        steps = 0
+        while self.requests.any() and (max_steps is None or steps < max_steps):
+            self.step(algorithm)
+            steps += 1
+        return steps
+
+    @classmethod
+    def from_lifts(cls, lifts: List[Lift]) -> "Fleet":
+        """
+        Builds a Fleet holding the current state of existing Lift objects.
+        """
+        fleet = cls(len(lifts),
+                    top_floor=[lf.top_floor for lf in lifts],
+                    start_floor=[lf.current_floor for lf in lifts],
+                    capacity=[lf.capacity for lf in lifts])
+        for i, lf in enumerate(lifts):
+            fleet.direction[i] = UP if lf.direction == "UP" else DOWN
+            fleet.traveled[i] = lf.floors_traveled
+            fleet.serviced[i] = lf.serviced_requests
+            for dest_floor in lf.requests:
+                fleet.add_request(i, dest_floor)
+        return fleet
+
+    def to_lifts(self) -> List[Lift]:
+        """
+        Creates Lift objects mirroring the fleet state. Pending requests
+        come back in ascending floor order (the bitmap has no arrival order).
+        """
+        lifts = []
+        for i in range(len(self)):
+            lf = Lift(lift_id=i, start_floor=int(self.floor[i]), top_floor=int(self.top_floor[i]),
+                      capacity=int(self.capacity[i]))
+            self.apply_to(lf, i)
+            lifts.append(lf)
+        return lifts
+
+    def apply_to(self, lift: Lift, lift_index: int) -> None:
+        """
+        Copies the state of one fleet lift onto an existing Lift object.
+        """
+        lift.current_floor = int(self.floor[lift_index])
+        lift.direction = "UP" if self.direction[lift_index] == UP else "DOWN"
+        lift.floors_traveled = int(self.traveled[lift_index])
+        lift.serviced_requests = int(self.serviced[lift_index])
+        lift.requests = np.flatnonzero(self.requests[lift_index]).tolist()
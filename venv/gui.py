@@ -0,0 +1,334 @@
+"""
+gui.py
+
+A Tkinter GUI for multiple lifts in a multi-lift scenario.
+- One fixed-rate frame loop (root.after(FRAME_MS)) draws every lift; the
+  simulation clock is decoupled from it (animation.FrameClock), so each
+  frame runs however many simulation steps are due and draws each lift at
+  its interpolated position between floors.
+- Only lifts whose pixel position changed are redrawn, so 50 lifts in a
+  100-floor building cost one canvas update per moving lift per frame.
+- Speed multiplier, pause and single-step controls (buttons, or the keys
+  '+' / '-', space and Right).
+- Integrates single-step scheduling logic so each lift moves one floor per tick.
+- Replay mode (MultiLiftGUI.from_trace) plays a binary trace recorded by
+  tracefile.record_trace instead of simulating: the trace is memory-mapped,
+  the slider seeks to any step instantly and only drawn frames are read.
+- Per-step and per-frame messages go through instrumentation.TRACE (free
+  when tracing is off); press 't' to dump the recent trace events.
+"""
+
+import math
+import time
+import tkinter as tk
+from algorithms import single_step
+from animation import FrameClock, ReplayAnimator, StepAnimator
+from instrumentation import DEBUG, INFO, TRACE
+from tracefile import FLAG_SERVICED, TraceReader
+from utils import log_event
+
+FRAME_MS = 33  # ~30 frames per second
+TICK_SECONDS = 1.0  # wall time of one simulation tick at speed 1
+LIFT_WIDTH = 50
+
+class MultiLiftGUI:
+    def __init__(self, root, lifts, algorithm="SCAN", num_floors=5, num_lifts=2, speed=1.0,
+                 trace: TraceReader = None):
+        """
+        :param trace: Replay this recorded trace instead of simulating
+                      (see from_trace); 'lifts' are then only displayed.
+        """
+        self.root = root
+        self.root.title("Multi-Lift Simulation")
+        self.root.configure(bg="white")
+
+        self.lifts = lifts
+        self.num_floors = num_floors
+        self.num_lifts = num_lifts
+        self.algorithm = algorithm
+        self.mylift_schedulers = {}  # lift_id -> MyLiftScheduler
+
+        self.sim_running = False
+        self.sim_done = False
+        self.clock = FrameClock(TICK_SECONDS, speed)
+        self.trace = trace
+        if trace is not None:
+            self.animator = ReplayAnimator(trace, self.lifts)
+        else:
+            self.animator = StepAnimator(self.lifts, self.simulation_step)
+        self._at_end = False
+        self.results_label = None
+        self._status_text = self._status_shown = "Simulation ready"
+        self._frame_job = None
+
+        # Sizing parameters: the original 100px floors / 130px lift columns,
+        # shrunk to fit large buildings and fleets on screen
+        self.floor_height = max(6, min(100, 600 // max(1, self.num_floors)))
+        column = max(16, min(LIFT_WIDTH + 80, 1200 // max(1, self.num_lifts)))
+        self.lift_width = min(LIFT_WIDTH, column * 5 // 13)
+        self.lift_height = self.floor_height // 2
+        self.lift_offset = self.floor_height // 10
+        self.column_width = column
+        self.canvas_height = self.num_floors * self.floor_height
+        self.canvas_width = self.num_lifts * column
+        self.root.geometry(f"{max(800, self.canvas_width + 20)}x{max(600, self.canvas_height + 120)}")
+
+        self.canvas = tk.Canvas(self.root, width=self.canvas_width, height=self.canvas_height, bg="white")
+        self.canvas.pack()
+
+        # Draw floors and labels (every few floors when floors are thin)
+        label_every = max(1, math.ceil(20 / self.floor_height))
+        for f in range(self.num_floors):
+            y = self.canvas_height - f * self.floor_height
+            self.canvas.create_line(0, y, self.canvas_width, y, fill="red", width=2 if label_every == 1 else 1)
+            if f % label_every == 0:
+                self.canvas.create_text(20, y - min(15, self.floor_height // 2), text=f"Floor {f+1}",
+                                        fill="black", font=('Arial', 10 if label_every == 1 else 7))
+
+        # Draw lift rectangles and labels
+        self.lift_rects = []
+        self._lift_x = []
+        self._drawn_y = []
+        for i, lift_obj in enumerate(self.lifts):
+            x_offset = 40 + i * column
+            start_y = self._floor_y(lift_obj.current_floor)
+            rect = self.canvas.create_rectangle(
+                x_offset, start_y,
+                x_offset + self.lift_width, start_y + self.lift_height,
+                fill="yellow", outline="blue", width=3 if column >= 60 else 1
+            )
+            self.lift_rects.append(rect)
+            self._lift_x.append(x_offset)
+            self._drawn_y.append(start_y)
+            self.canvas.create_text(x_offset + self.lift_width // 2, start_y - 10,
+                                    text=f"Lift {i+1}" if column >= 60 else str(i + 1),
+                                    fill="blue", font=('Arial', 10 if column >= 60 else 7, 'bold'))
+
+        # Control frame with buttons and status labels
+        self.control_frame = tk.Frame(self.root, bg="white")
+        self.control_frame.pack(fill=tk.X, pady=10)
+
+        self.sim_button = tk.Button(self.control_frame, text="Start Replay" if trace else "Start Simulation",
+                                    command=self.run_simulation, bg="green", fg="white", font=('Arial', 12))
+        self.sim_button.pack(side=tk.LEFT, padx=10)
+
+        self.pause_button = tk.Button(self.control_frame, text="Pause", command=self.toggle_pause,
+                                      font=('Arial', 12))
+        self.pause_button.pack(side=tk.LEFT, padx=2)
+        tk.Button(self.control_frame, text="Step", command=self.step_once,
+                  font=('Arial', 12)).pack(side=tk.LEFT, padx=2)
+        tk.Button(self.control_frame, text="Slower", command=lambda: self.change_speed(0.5),
+                  font=('Arial', 12)).pack(side=tk.LEFT, padx=2)
+        tk.Button(self.control_frame, text="Faster", command=lambda: self.change_speed(2.0),
+                  font=('Arial', 12)).pack(side=tk.LEFT, padx=2)
+
+        self.status_label = tk.Label(self.control_frame, text=self._status_text,
+                                     bg="white", font=('Arial', 12))
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+        self.algo_label = tk.Label(self.control_frame, text=f"Algorithm: {self.algorithm}",
+                                   bg="white", font=('Arial', 12, 'bold'))
+        self.algo_label.pack(side=tk.RIGHT, padx=10)
+
+        self._clock_text = ""
+        self.clock_label = tk.Label(self.control_frame, bg="white", font=('Arial', 12))
+        self.clock_label.pack(side=tk.RIGHT, padx=10)
+        self._draw_clock()
+
+        self.seek_scale = None
+        self._slider_step = 0
+        if trace is not None:
+            # drag to jump to any recorded step
+            self.seek_scale = tk.Scale(self.root, from_=0, to=self.animator.last_step, orient=tk.HORIZONTAL,
+                                       length=max(300, min(self.canvas_width, 1200)), showvalue=False,
+                                       command=self._seek, bg="white")
+            self.seek_scale.pack(fill=tk.X, padx=10)
+
+        self.root.bind("<Key-t>", lambda event: TRACE.dump())
+        self.root.bind("<space>", lambda event: self.toggle_pause())
+        self.root.bind("<Right>", lambda event: self.step_once())
+        self.root.bind("<Key-plus>", lambda event: self.change_speed(2.0))
+        self.root.bind("<Key-equal>", lambda event: self.change_speed(2.0))
+        self.root.bind("<Key-minus>", lambda event: self.change_speed(0.5))
+
+    @classmethod
+    def from_trace(cls, root, path: str, speed=1.0):
+        """
+        Opens a trace written by tracefile.record_trace for replay.
+        """
+        trace = TraceReader(path)
+        log_event(f"[INFO] Replaying {path}: {trace.num_lifts} lifts, {trace.num_floors} floors, "
+                  f"{trace.num_steps - 1} steps ({trace.algorithm or 'unknown algorithm'}).")
+        return cls(root, trace.lifts(0), algorithm=trace.algorithm, num_floors=trace.num_floors,
+                   num_lifts=trace.num_lifts, speed=speed, trace=trace)
+
+    def run_simulation(self):
+        if self.sim_running or self.sim_done:
+            return
+        self.sim_running = True
+        self.sim_button.config(text="Replay Running..." if self.trace else "Simulation Running...",
+                               state=tk.DISABLED)
+        self._status_text = "Replay in progress" if self.trace else "Simulation in progress"
+        log_event("[INFO] Starting simulation loop (non-blocking).")
+        for i, lf in enumerate(self.lifts):
+            log_event(f"[INFO] Lift {i} initial: floor={lf.current_floor}, requests={lf.requests}")
+        self.clock.advance(time.perf_counter())
+        self._frame()
+
+    def toggle_pause(self):
+        paused = self.clock.toggle_pause()
+        self.pause_button.config(text="Resume" if paused else "Pause")
+        self._draw_clock()
+
+    def step_once(self):
+        """
+        Pauses and advances the simulation clock by one tick.
+        """
+        if not self.clock.paused:
+            self.toggle_pause()
+        self.clock.time = self.animator.step_target(self.clock.time)
+        if not self.sim_running:
+            self.run_simulation()
+
+    def _seek(self, value):
+        """
+        Slider callback (replay only): jump straight to a recorded step.
+        """
+        step = int(float(value))
+        if step == self.animator.ticks_done:
+            return  # the slider is only following playback
+        self.clock.time = float(step)
+        if not self.sim_running:
+            if not self.clock.paused:
+                self.toggle_pause()
+            self.run_simulation()
+
+    def change_speed(self, factor: float):
+        self.clock.set_speed(self.clock.speed * factor)
+        self._draw_clock()
+
+    def _frame(self):
+        """
+        One frame: advance the clock, run the steps that became due and draw
+        every lift at its interpolated position.
+        """
+        t = self.clock.advance(time.perf_counter())
+        steps = self.animator.sync(t)
+        if self.animator.behind(t):
+            # the frame's step budget ran out; slow down rather than jump ahead
+            self.clock.time = t = float(self.animator.ticks_done)
+        if TRACE.debug:
+            TRACE.event(DEBUG, "gui.frame", t=round(t, 3), steps=steps)
+        if steps and self.trace is not None:
+            self._replay_status()
+        finished = self.animator.finished(t)
+        if self.trace is not None and finished:
+            # hold the last frame; the replay can still be sought or stepped back
+            self.clock.time = t = float(self.animator.last_step)
+        self._draw(t)
+        if finished and not self._at_end:
+            self._finish()
+        self._at_end = finished
+        if finished and self.trace is None:
+            self._frame_job = None
+            return
+        self._frame_job = self.root.after(FRAME_MS, self._frame)
+
+    def simulation_step(self):
+        """
+        Advances every lift with requests by one tick (called by the animator).
+        """
+        if TRACE.debug:
+            TRACE.event(DEBUG, "gui.step")
+        for i, lift_obj in enumerate(self.lifts):
+            if lift_obj.requests:
+                old_floor = lift_obj.current_floor
+                # SCAN uses the Lift class's own single step
+                single_step(lift_obj, self.algorithm, self.mylift_schedulers)
+                if lift_obj.current_floor != old_floor:
+                    if TRACE.info:
+                        TRACE.event(INFO, "gui.move", lift=i, start=old_floor, floor=lift_obj.current_floor)
+                    self._status_text = f"Lift {i+1} -> Floor {lift_obj.current_floor}"
+            elif TRACE.debug:
+                TRACE.event(DEBUG, "gui.idle", lift=i)
+
+    def _finish(self):
+        log_event("[INFO] All lifts done servicing requests.")
+        self._status_text = self._status_shown = "All requests processed"
+        self.status_label.config(text=self._status_text)
+        if self.trace is not None:
+            self.sim_button.config(text="Replay Completed")
+            if not self.clock.paused:
+                self.toggle_pause()
+        else:
+            self.sim_button.config(text="Simulation Completed", state=tk.DISABLED)
+            self.sim_running = False
+            self.sim_done = True
+        total_floors = sum(l.floors_traveled for l in self.lifts)
+        total_req = sum(l.serviced_requests for l in self.lifts)
+        stats = f"Results: {total_req} requests serviced, {total_floors} floors traveled"
+        if self.results_label is None:
+            self.results_label = tk.Label(self.root, text=stats, bg="white", font=('Arial', 12, 'bold'))
+            self.results_label.pack(pady=10)
+        else:
+            self.results_label.config(text=stats)
+
+    def _replay_status(self):
+        """
+        Status line from the service events recorded in the current frame.
+        """
+        for i, (floor, flags, _, _) in enumerate(self.animator.records):
+            if flags & FLAG_SERVICED:
+                self._status_text = f"Lift {i+1} stopped at Floor {floor}"
+
+    def _floor_y(self, floor: float) -> int:
+        return round(self.canvas_height - floor * self.floor_height + self.lift_offset)
+
+    def _draw(self, t: float):
+        for i, floor in enumerate(self.animator.positions(t)):
+            self.update_lift_position(i, floor)
+        if self._status_text != self._status_shown:
+            self._status_shown = self._status_text
+            self.status_label.config(text=self._status_text)
+        if self.seek_scale is not None and self._slider_step != self.animator.ticks_done:
+            self._slider_step = self.animator.ticks_done
+            self.seek_scale.set(self._slider_step)
+        self._draw_clock()
+
+    def _draw_clock(self):
+        paused = " (paused)" if self.clock.paused else ""
+        total = f"/{self.animator.last_step}" if self.trace is not None else ""
+        text = f"Tick {int(self.clock.time)}{total}  x{self.clock.speed:g}{paused}"
+        if text != self._clock_text:
+            self._clock_text = text
+            self.clock_label.config(text=text)
+
+    def update_lift_position(self, lift_index: int, floor: float):
+        """
+        Draws a lift at a (possibly fractional) floor; skipped if its pixel
+        position has not changed since the last draw.
+        """
+        y = self._floor_y(floor)
+        if y == self._drawn_y[lift_index]:
+            return
+        self._drawn_y[lift_index] = y
+        x = self._lift_x[lift_index]
+        self.canvas.coords(self.lift_rects[lift_index], x, y, x + self.lift_width, y + self.lift_height)
+        if TRACE.debug:
+            TRACE.event(DEBUG, "gui.animate", lift=lift_index, floor=round(floor, 3), y=y)
+
+def main():
+    from lift import Lift
+    root = tk.Tk()
+    # For local testing: create two lifts and hardcode some requests
+    lifts = [
+        Lift(lift_id=0, start_floor=1, top_floor=5),
+        Lift(lift_id=1, start_floor=1, top_floor=5)
+    ]
+    lifts[0].requests = [3, 5]
+    lifts[1].requests = [4, 5]
+    gui = MultiLiftGUI(root, lifts=lifts, algorithm="SCAN", num_floors=5, num_lifts=len(lifts))
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
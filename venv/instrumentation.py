@@ -0,0 +1,234 @@
+"""
+instrumentation.py
+
+Low-overhead tracing and metrics for the lift simulation.
+
+- TRACE records level-gated trace events. Hot paths guard every call with
+  a plain attribute check, so with tracing off (the default) a step pays
+  one attribute lookup and never builds a message:
+
+      if TRACE.debug:
+          TRACE.event(DEBUG, "lift.move", lift=lift.lift_id, floor=lift.current_floor)
+
+  Events are stored unformatted in a fixed-size ring buffer (the most
+  recent `capacity` events) and only turned into text when dumped, or
+  when echo is on, in which case they are also passed to logging.
+
+- METRICS keeps per-lift counters (steps, floors moved, requests
+  serviced, direction reversals, requests assigned) and step-duration
+  timers, plus the process-wide distance / serviced totals behind the
+  utils.py counters. Collection is off by default; callers check
+  METRICS.enabled before timing a step (lift / algorithm steps) or
+  recording a leg (the event-driven engine, which has no per-floor
+  steps). python main.py --metrics turns it on and dumps the counters.
+"""
+
+import logging
+import sys
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, TextIO, Tuple
+
+OFF = logging.CRITICAL + 10
+INFO = logging.INFO
+DEBUG = logging.DEBUG
+
+LEVELS = {"off": OFF, "info": INFO, "debug": DEBUG}
+
+# (perf_counter seconds, level, event name, fields)
+TraceEvent = Tuple[float, int, str, Dict[str, Any]]
+
+def parse_level(name: str) -> int:
+    """
+    Converts 'off' / 'info' / 'debug' (any case) to a trace level.
+    """
+    try:
+        return LEVELS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown trace level '{name}'. Expected one of {sorted(LEVELS)}.")
+
+def format_event(event: TraceEvent) -> str:
+    timestamp, level, name, fields = event
+    details = " ".join(f"{key}={value}" for key, value in fields.items())
+    return f"{timestamp:.6f} {logging.getLevelName(level)} {name} {details}".rstrip()
+
+
+class Tracer:
+    """
+    Level-gated trace events kept in a ring buffer.
+
+    The `info` and `debug` attributes say whether that level is enabled;
+    check them before calling event() so disabled tracing costs nothing.
+    """
+
+    def __init__(self, level: int = OFF, capacity: int = 1024, echo: bool = False):
+        """
+        :param level: Lowest level recorded (OFF, INFO or DEBUG).
+        :param capacity: Number of recent events kept in the ring buffer.
+        :param echo: Also send each recorded event to logging.
+        """
+        self.buffer: Deque[TraceEvent] = deque(maxlen=capacity)
+        self.echo = echo
+        self.set_level(level)
+
+    def set_level(self, level: int) -> None:
+        self.level = level
+        self.info = level <= INFO
+        self.debug = level <= DEBUG
+
+    def configure(self, level: Optional[int] = None, capacity: Optional[int] = None,
+                  echo: Optional[bool] = None) -> None:
+        """
+        Changes any of level, ring buffer capacity (keeping the newest
+        events) and echo.
+        """
+        if level is not None:
+            self.set_level(level)
+        if capacity is not None:
+            self.buffer = deque(self.buffer, maxlen=capacity)
+        if echo is not None:
+            self.echo = echo
+
+    def event(self, level: int, name: str, **fields: Any) -> None:
+        """
+        Records one event if its level is enabled.
+        """
+        if level < self.level:
+            return
+        event = (time.perf_counter(), level, name, fields)
+        self.buffer.append(event)
+        if self.echo:
+            logging.log(level, format_event(event))
+
+    def recent(self, count: Optional[int] = None) -> List[TraceEvent]:
+        """
+        Returns the newest `count` buffered events (all if None), oldest first.
+        """
+        events = list(self.buffer)
+        return events if count is None else events[-count:]
+
+    def dump(self, stream: Optional[TextIO] = None, count: Optional[int] = None) -> int:
+        """
+        Writes buffered events to a stream (default stderr), one per line.
+        Returns the number of events written.
+        """
+        stream = stream or sys.stderr
+        events = self.recent(count)
+        for event in events:
+            stream.write(format_event(event) + "\n")
+        stream.flush()
+        return len(events)
+
+    def clear(self) -> None:
+        self.buffer.clear()
+
+
+class LiftCounters:
+    """
+    Counters and step timer for one lift.
+    """
+
+    __slots__ = ("steps", "floors", "serviced", "reversals", "assigned", "step_time", "max_step_time")
+
+    def __init__(self):
+        self.steps = 0
+        self.floors = 0
+        self.serviced = 0
+        self.reversals = 0
+        self.assigned = 0         # requests handed to the lift by a dispatcher
+        self.step_time = 0.0      # seconds spent in timed steps
+        self.max_step_time = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        result = {name: getattr(self, name) for name in self.__slots__}
+        result["mean_step_time"] = self.step_time / self.steps if self.steps else 0.0
+        return result
+
+
+class Metrics:
+    """
+    Per-lift counters and step timers, plus process-wide totals.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.lifts: Dict[Any, LiftCounters] = {}
+        self.total_distance = 0
+        self.total_serviced = 0
+
+    def lift(self, lift_id: Any) -> LiftCounters:
+        counters = self.lifts.get(lift_id)
+        if counters is None:
+            counters = self.lifts[lift_id] = LiftCounters()
+        return counters
+
+    def time_step(self, lift, step: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs step(*args) for one lift and records how long it took and what
+        it changed (floors traveled, requests serviced, direction).
+        Returns whatever step returns.
+        """
+        floors, serviced, direction = lift.floors_traveled, lift.serviced_requests, lift.direction
+        start = time.perf_counter()
+        result = step(*args)
+        elapsed = time.perf_counter() - start
+
+        counters = self.lift(lift.lift_id)
+        counters.steps += 1
+        counters.step_time += elapsed
+        if elapsed > counters.max_step_time:
+            counters.max_step_time = elapsed
+        moved = lift.floors_traveled - floors
+        done = lift.serviced_requests - serviced
+        counters.floors += moved
+        counters.serviced += done
+        if lift.direction != direction:
+            counters.reversals += 1
+        self.total_distance += moved
+        self.total_serviced += done
+        return result
+
+    def record(self, lift_id: Any, floors: int = 0, serviced: int = 0,
+               reversals: int = 0, assigned: int = 0) -> None:
+        """
+        Adds to a lift's counters (and the totals) without timing a step,
+        for code that moves lifts in larger jumps, such as the engine.
+        """
+        counters = self.lift(lift_id)
+        counters.floors += floors
+        counters.serviced += serviced
+        counters.reversals += reversals
+        counters.assigned += assigned
+        self.total_distance += floors
+        self.total_serviced += serviced
+
+    def snapshot(self) -> Dict[Any, Dict[str, Any]]:
+        """
+        Returns {lift_id: counters as a dict}.
+        """
+        return {lift_id: counters.as_dict() for lift_id, counters in self.lifts.items()}
+
+    def dump(self, stream: Optional[TextIO] = None) -> int:
+        """
+        Writes one line of counters per lift and a line of totals to a
+        stream (default stderr). Returns the number of lifts written.
+        """
+        stream = stream or sys.stderr
+        for lift_id, counters in sorted(self.snapshot().items(), key=lambda item: str(item[0])):
+            stream.write(f"lift {lift_id}: steps={counters['steps']} floors={counters['floors']} "
+                         f"serviced={counters['serviced']} reversals={counters['reversals']} "
+                         f"assigned={counters['assigned']} "
+                         f"mean_step_us={counters['mean_step_time'] * 1e6:.1f} "
+                         f"max_step_us={counters['max_step_time'] * 1e6:.1f}\n")
+        stream.write(f"total: floors={self.total_distance} serviced={self.total_serviced}\n")
+        stream.flush()
+        return len(self.lifts)
+
+    def reset(self) -> None:
+        self.lifts.clear()
+        self.total_distance = 0
+        self.total_serviced = 0
+
+
+TRACE = Tracer()
+METRICS = Metrics()
@@ -0,0 +1,191 @@
+"""
+latency.py
+
+Per-request latency accounting in constant memory.
+
+Every completed request contributes three samples (in ticks):
+  - wait:  from the call (arrival time) until a lift picks it up
+  - ride:  from pickup until the lift stops at the destination
+  - total: wait + ride
+
+Samples go into StreamingHistograms instead of lists, so a run with
+millions of requests keeps a few hundred bucket counters per histogram.
+LatencyRecorder keeps one set of histograms for the whole run (labelled
+with the algorithm) and one per lift.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+PERCENTILES = (50, 95, 99)
+
+class StreamingHistogram:
+    """
+    Log-linear histogram of non-negative values.
+
+    Values below 2**precision_bits fall in unit-wide buckets, so integer
+    tick counts are exact there. Above that, each power of two is split
+    into 2**precision_bits buckets (about 3% relative error for the
+    default of 5 bits). Count, sum, min and max are tracked exactly.
+    Percentiles are reported as the lower edge of the bucket holding the
+    ranked sample, clamped to the observed min and max.
+    """
+
+    __slots__ = ("precision_bits", "_sub", "counts", "count", "total", "min", "max")
+
+    def __init__(self, precision_bits: int = 5):
+        self.precision_bits = precision_bits
+        self._sub = 1 << precision_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value < 0:
+            raise ValueError(f"Histogram values must be non-negative, got {value}.")
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "StreamingHistogram") -> None:
+        """
+        Adds another histogram's samples (same precision) to this one.
+        """
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge histograms with different precision.")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Nearest-rank q-th percentile (0 < q <= 100), or None if empty.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q / 100 * self.count))
+        if rank >= self.count:
+            return self.max
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._lower(index), self.min), self.max)
+        return self.max
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def buckets(self) -> List[Tuple[float, float, int]]:
+        """
+        Returns (lower, upper, count) for every non-empty bucket, in order.
+        """
+        return [(self._lower(index), self._lower(index + 1), self.counts[index])
+                for index in sorted(self.counts)]
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        count, mean, min, p50, p95, p99 and max as a plain dictionary.
+        """
+        result: Dict[str, Any] = {"count": self.count, "mean": self.mean(),
+                                  "min": self.min if self.count else None}
+        for q in PERCENTILES:
+            result[f"p{q}"] = self.percentile(q)
+        result["max"] = self.max if self.count else None
+        return result
+
+    def _index(self, value: float) -> int:
+        sub = self._sub
+        if value < sub:
+            return int(value)
+        mantissa, exponent = math.frexp(value)  # value = mantissa * 2**exponent, 0.5 <= mantissa < 1
+        return sub + (exponent - 1 - self.precision_bits) * sub + int((mantissa * 2 - 1) * sub)
+
+    def _lower(self, index: int) -> float:
+        sub = self._sub
+        if index < sub:
+            return float(index)
+        octave, offset = divmod(index - sub, sub)
+        exponent = octave + self.precision_bits
+        return math.ldexp(1 + offset / sub, exponent)
+
+
+class LatencyRecorder:
+    """
+    Wait / ride / total histograms for one algorithm, overall and per lift.
+    """
+
+    KINDS = ("wait", "ride", "total")
+
+    def __init__(self, algorithm: str = "", precision_bits: int = 5):
+        self.algorithm = algorithm
+        self.precision_bits = precision_bits
+        self.overall = self._new_set()
+        self.by_lift: Dict[Any, Dict[str, StreamingHistogram]] = {}
+
+    def record(self, lift_id: Any, wait: float, ride: float) -> None:
+        """
+        Adds one completed request.
+        """
+        lift_set = self.by_lift.get(lift_id)
+        if lift_set is None:
+            lift_set = self.by_lift[lift_id] = self._new_set()
+        for histograms in (self.overall, lift_set):
+            histograms["wait"].add(wait)
+            histograms["ride"].add(ride)
+            histograms["total"].add(wait + ride)
+
+    @property
+    def count(self) -> int:
+        return self.overall["wait"].count
+
+    def merge(self, other: "LatencyRecorder") -> None:
+        """
+        Adds another recorder's samples (e.g. another seed of the same algorithm).
+        """
+        for kind in self.KINDS:
+            self.overall[kind].merge(other.overall[kind])
+        for lift_id, histograms in other.by_lift.items():
+            mine = self.by_lift.setdefault(lift_id, self._new_set())
+            for kind in self.KINDS:
+                mine[kind].merge(histograms[kind])
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Plain-dictionary view: percentiles per kind, overall and per lift.
+        """
+        result: Dict[str, Any] = {"algorithm": self.algorithm, "requests": self.count}
+        for kind in self.KINDS:
+            result[kind] = self.overall[kind].summary()
+        result["lifts"] = {
+            lift_id: {kind: histograms[kind].summary() for kind in self.KINDS}
+            for lift_id, histograms in sorted(self.by_lift.items())
+        }
+        return result
+
+    def _new_set(self) -> Dict[str, StreamingHistogram]:
+        return {kind: StreamingHistogram(self.precision_bits) for kind in self.KINDS}
+
+
+def merge_by_algorithm(recorders: Iterable[LatencyRecorder]) -> Dict[str, LatencyRecorder]:
+    """
+    Combines recorders (e.g. from several runs) into one per algorithm.
+    """
+    merged: Dict[str, LatencyRecorder] = {}
+    for recorder in recorders:
+        target = merged.get(recorder.algorithm)
+        if target is None:
+            target = merged[recorder.algorithm] = LatencyRecorder(recorder.algorithm,
+                                                                   recorder.precision_bits)
+        target.merge(recorder)
+    return merged
@@ -0,0 +1,271 @@
+"""
+lift.py
+
+This module defines a Lift class for a multi-lift approach.
+Each Lift object manages its own queue of requested floors and
+executes a simplified SCAN-like scheduling approach in next_step().
+
+Requests are held in a RequestIndex rather than a plain list, so finding
+the next floor above/below, checking membership and removing a serviced
+floor do not scan every pending request on each step.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable, Iterator, Optional, Tuple
+
+from instrumentation import DEBUG, METRICS, TRACE
+
+
+class RequestIndex:
+    """
+    Ordered index of requested floors that still behaves like the old list.
+
+    - A sorted array (kept with bisect) answers next-above / next-below
+      and lowest / highest in O(log n) or O(1).
+    - An insertion-ordered dict gives O(1) membership and removal, and
+      keeps iteration, indexing and repr in the order floors were added
+      (MYLIFT breaks priority ties on that order). It maps each floor to
+      an increasing sequence number, so schedulers can tell floors added
+      since they last looked (added_since) and re-added floors apart.
+
+    Floors are unique: adding a floor that is already present is a no-op,
+    matching Lift.add_request.
+    """
+
+    def __init__(self, floors: Iterable[int] = ()):
+        self._order = {}
+        self._sorted = []
+        self._next_seq = 0
+        for floor in floors:
+            self.add(floor)
+
+    def add(self, floor: int) -> bool:
+        """
+        Adds a floor. Returns True if it was not already present.
+        """
+        if floor in self._order:
+            return False
+        self._order[floor] = self._next_seq
+        self._next_seq += 1
+        insort(self._sorted, floor)
+        return True
+
+    # list compatibility: callers used requests.append(floor)
+    append = add
+
+    def remove(self, floor: int) -> None:
+        """
+        Removes a floor. Raises ValueError if it is not present (like list.remove).
+        """
+        if floor not in self._order:
+            raise ValueError(f"floor {floor} not in requests")
+        del self._order[floor]
+        del self._sorted[bisect_left(self._sorted, floor)]
+
+    def discard(self, floor: int) -> None:
+        """
+        Removes a floor if present.
+        """
+        if floor in self._order:
+            self.remove(floor)
+
+    def clear(self) -> None:
+        self._order.clear()
+        self._sorted.clear()
+
+    def seq(self, floor: int) -> Optional[int]:
+        """
+        Sequence number the floor was added with, or None if not present.
+        """
+        return self._order.get(floor)
+
+    def added_since(self, seq: int) -> Iterator[Tuple[int, int]]:
+        """
+        Yields (floor, seq) for every floor added with a sequence number
+        >= seq, newest first. Costs O(number yielded).
+        """
+        for floor, floor_seq in reversed(self._order.items()):
+            if floor_seq < seq:
+                return
+            yield floor, floor_seq
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    def next_above(self, floor: int) -> Optional[int]:
+        """
+        Returns the lowest requested floor strictly above 'floor', or None.
+        """
+        i = bisect_right(self._sorted, floor)
+        return self._sorted[i] if i < len(self._sorted) else None
+
+    def next_below(self, floor: int) -> Optional[int]:
+        """
+        Returns the highest requested floor strictly below 'floor', or None.
+        """
+        i = bisect_left(self._sorted, floor)
+        return self._sorted[i - 1] if i > 0 else None
+
+    def has_above(self, floor: int) -> bool:
+        return bool(self._sorted) and self._sorted[-1] > floor
+
+    def has_below(self, floor: int) -> bool:
+        return bool(self._sorted) and self._sorted[0] < floor
+
+    def lowest(self) -> Optional[int]:
+        return self._sorted[0] if self._sorted else None
+
+    def highest(self) -> Optional[int]:
+        return self._sorted[-1] if self._sorted else None
+
+    def __contains__(self, floor) -> bool:
+        return floor in self._order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __iter__(self):
+        return iter(self._order)
+
+    def __getitem__(self, item):
+        return list(self._order)[item]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RequestIndex):
+            return list(self._order) == list(other._order)
+        if isinstance(other, list):
+            return list(self._order) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self._order))
+
+
+class Lift:
+    def __init__(self, lift_id: int, start_floor: int = 1, top_floor: int = 5,
+                 capacity: Optional[int] = None):
+        """
+        :param lift_id: An identifier (e.g., 0, 1, 2) for this lift.
+        :param start_floor: The floor this lift starts on.
+        :param top_floor: The highest floor in the building (for SCAN boundaries).
+        :param capacity: Most passengers on board at once (None or 0: no limit).
+        """
+        self.lift_id = lift_id
+        self.current_floor = start_floor
+        self.top_floor = top_floor   # used by SCAN-like logic
+        self.direction = "UP"       # either "UP" or "DOWN"
+        self.capacity = capacity or None
+        self.load = 0               # passengers on board (kept up to date by the engine)
+        
+        # Floors the lift needs to visit (see RequestIndex); assigning a
+        # plain list, e.g. lift.requests = [3, 5], still works.
+        self.requests = RequestIndex()
+
+        # Optional fields for performance tracking
+        self.floors_traveled = 0
+        self.serviced_requests = 0
+
+    @property
+    def requests(self) -> RequestIndex:
+        return self._requests
+
+    @requests.setter
+    def requests(self, floors: Iterable[int]) -> None:
+        self._requests = floors if isinstance(floors, RequestIndex) else RequestIndex(floors)
+
+    @property
+    def is_full(self) -> bool:
+        return self.capacity is not None and self.load >= self.capacity
+
+    def add_request(self, dest_floor: int):
+        """
+        Add a new destination request to this lift's list of requested floors.
+        """
+        self.requests.add(dest_floor)
+
+    def next_step(self):
+        """
+        Advance one "step" in a SCAN-like scheduling approach:
+          1) If we have no requests, do nothing.
+          2) Otherwise, find requests in the current direction if possible.
+          3) Move one floor closer to the next target.
+          4) If no requests exist in the current direction, reverse direction (classic SCAN).
+
+        Moves the lift exactly 1 floor at a time. The step is timed and
+        counted when instrumentation.METRICS is enabled.
+        """
+        if METRICS.enabled:
+            METRICS.time_step(self, self._scan_step)
+        else:
+            self._scan_step()
+
+    def _scan_step(self):
+        if TRACE.debug:
+            TRACE.event(DEBUG, "lift.step", lift=self.lift_id, floor=self.current_floor,
+                        direction=self.direction, pending=len(self.requests))
+
+        if not self.requests:
+            return  # No requests to process
+
+        # Are there requests above / below current_floor?
+        up_requests = self.requests.has_above(self.current_floor)
+        down_requests = self.requests.has_below(self.current_floor)
+
+        if self.direction == "UP":
+            if up_requests:
+                # Move up 1 floor
+                self._move_up()
+            else:
+                # No up requests, reverse direction (SCAN)
+                self.direction = "DOWN"
+                if down_requests:
+                    self._move_down()
+                # else no requests in either direction => might be exactly on a request
+        elif self.direction == "DOWN":
+            if down_requests:
+                self._move_down()
+            else:
+                # No down requests, reverse direction
+                self.direction = "UP"
+                if up_requests:
+                    self._move_up()
+
+        # Check if we've arrived at any request
+        if self.current_floor in self.requests:
+            if TRACE.debug:
+                TRACE.event(DEBUG, "lift.service", lift=self.lift_id, floor=self.current_floor)
+            self.requests.remove(self.current_floor)
+            self.serviced_requests += 1
+
+    def _move_up(self):
+        """
+        Move the lift 1 floor up, increment floors_traveled.
+        """
+        old_floor = self.current_floor
+        if self.current_floor < self.top_floor:
+            self.current_floor += 1
+            traveled = abs(self.current_floor - old_floor)
+            self.floors_traveled += traveled
+            if TRACE.debug:
+                TRACE.event(DEBUG, "lift.move", lift=self.lift_id, start=old_floor, floor=self.current_floor)
+        elif TRACE.debug:
+            TRACE.event(DEBUG, "lift.blocked", lift=self.lift_id, floor=self.current_floor, direction="UP")
+
+    def _move_down(self):
+        """
+        Move the lift 1 floor down, increment floors_traveled.
+        """
+        old_floor = self.current_floor
+        if self.current_floor > 1:
+            self.current_floor -= 1
+            traveled = abs(self.current_floor - old_floor)
+            self.floors_traveled += traveled
+            if TRACE.debug:
+                TRACE.event(DEBUG, "lift.move", lift=self.lift_id, start=old_floor, floor=self.current_floor)
+        elif TRACE.debug:
+            TRACE.event(DEBUG, "lift.blocked", lift=self.lift_id, floor=self.current_floor, direction="DOWN")
+
+    def __repr__(self):
+        return (f"<Lift id={self.lift_id}, floor={self.current_floor}, "
+                f"dir={self.direction}, requests={self.requests}>")
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+loadgen.py
+
+Load generator for the lift controller service (controller.py).
+
+Opens several connections and sends random hall calls (origin and
+destination) over each one, either at a fixed total rate or as fast as
+the service answers, keeping at most --window calls in flight per
+connection. For every call it measures the time from sending it to
+receiving the 'assigned' reply, and reports the sustained calls per
+second and the p50/p95/p99/max call-to-assignment latency (kept in a
+latency.StreamingHistogram, in microseconds).
+
+Examples:
+    python loadgen.py --connections 8 --rate 5000 --duration 10
+    python loadgen.py --port 8765 --rate 0 --window 64 --duration 5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, Optional
+
+from controller import DEFAULT_SOCKET, encode
+from latency import StreamingHistogram
+from utils import log_event
+
+async def _open(path: Optional[str], host: str, port: Optional[int]):
+    if port is not None:
+        return await asyncio.open_connection(host, port)
+    return await asyncio.open_unix_connection(path or DEFAULT_SOCKET)
+
+async def _building(path: Optional[str], host: str, port: Optional[int]) -> Dict[str, Any]:
+    """
+    Asks the service for its stats (number of floors and lifts).
+    """
+    reader, writer = await _open(path, host, port)
+    try:
+        writer.write(encode({"type": "stats"}))
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+async def _client(connection: int, path: Optional[str], host: str, port: Optional[int],
+                  num_floors: int, rate: float, window: int, duration: float,
+                  latency: StreamingHistogram, totals: Dict[str, int], seed: int) -> None:
+    """
+    One connection: sends calls until 'duration' is over, then waits
+    (briefly) for the replies still outstanding. Stops early if the
+    service closes the connection.
+    """
+    rng = random.Random(seed * 1000 + connection)
+    reader, writer = await _open(path, host, port)
+    in_flight: Dict[int, float] = {}
+    slots = asyncio.Semaphore(window)
+    done = asyncio.Event()
+    disconnected = asyncio.Event()
+
+    async def read_replies() -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                sent = in_flight.pop(message.get("id"), None)
+                if sent is None:
+                    continue
+                latency.add((time.perf_counter() - sent) * 1e6)
+                totals["answered" if message.get("type") == "assigned" else "errors"] += 1
+                slots.release()
+                if done.is_set() and not in_flight:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            # no more replies will free a slot: wake the sender so it stops
+            disconnected.set()
+            slots.release()
+
+    replies = asyncio.create_task(read_replies())
+    interval = 1.0 / rate if rate > 0 else 0.0
+    start = time.perf_counter()
+    next_send = start
+    call_id = 0
+    while time.perf_counter() - start < duration:
+        await slots.acquire()
+        if disconnected.is_set():
+            break
+        if interval:
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            next_send += interval
+        origin, destination = rng.sample(range(1, num_floors + 1), 2)
+        in_flight[call_id] = time.perf_counter()
+        writer.write(encode({"type": "hall", "floor": origin, "destination": destination, "id": call_id}))
+        call_id += 1
+        totals["sent"] += 1
+        try:
+            await writer.drain()
+        except ConnectionError:
+            break
+    done.set()
+    if in_flight and not disconnected.is_set():
+        try:
+            await asyncio.wait_for(replies, timeout=5)
+        except asyncio.TimeoutError:
+            pass
+    replies.cancel()
+    totals["unanswered"] += len(in_flight)
+    writer.close()
+
+async def run_load(path: Optional[str] = None, host: str = "127.0.0.1", port: Optional[int] = None,
+                   connections: int = 4, rate: float = 1000, window: int = 32,
+                   duration: float = 5.0, seed: int = 0) -> Dict[str, Any]:
+    """
+    Runs the load and returns {"sent", "answered", "errors", "unanswered",
+    "seconds", "calls_per_second", "latency_us": histogram summary}.
+
+    :param rate: Total calls per second over all connections (0: as fast
+                 as the service answers, limited by 'window').
+    """
+    building = await _building(path, host, port)
+    latency = StreamingHistogram()
+    totals = {"sent": 0, "answered": 0, "errors": 0, "unanswered": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(i, path, host, port, building["num_floors"], rate / connections if rate > 0 else 0,
+                window, duration, latency, totals, seed)
+        for i in range(connections)
+    ))
+    seconds = time.perf_counter() - start
+    return dict(totals, seconds=seconds, calls_per_second=totals["answered"] / seconds,
+                latency_us=latency.summary())
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Send hall calls to the lift controller service.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--port", type=int, default=None, help="connect to TCP localhost:PORT instead")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=1000,
+                        help="total calls per second (0: as fast as possible)")
+    parser.add_argument("--window", type=int, default=32, help="calls in flight per connection")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = asyncio.run(run_load(args.socket, port=args.port, connections=args.connections,
+                                  rate=args.rate, window=args.window, duration=args.duration,
+                                  seed=args.seed))
+    lat = result["latency_us"]
+    log_event(f"{result['answered']} calls assigned in {result['seconds']:.2f}s "
+              f"({result['calls_per_second']:.0f} calls/s); {result['errors']} errors, "
+              f"{result['unanswered']} unanswered")
+    if lat["count"]:
+        log_event(f"Call-to-assignment latency (us): p50={lat['p50']:.0f} p95={lat['p95']:.0f} "
+                  f"p99={lat['p99']:.0f} max={lat['max']:.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+main.py
+
+Entry point for the Intelligent Lift Control System simulation in a multi-lift setup,
+integrating a GUI (Approach 2). We:
+  1. Parse an input file or use a default configuration.
+  2. Prepare the lifts (from simulation.py) without a blocking loop.
+  3. Pass the lifts into the GUI, which handles scheduling steps visually.
+
+Pass --headless to skip the GUI and run the event-driven engine instead
+(useful for CI and batch jobs):
+    python main.py inputs/input_high.txt --headless
+
+Timestamped arrival files (.jsonl / .csv, see arrivals.py) are always run
+headless, with requests streamed into the simulation as time advances.
+
+Pass --trace=info or --trace=debug to log per-step trace events
+(see instrumentation.py); tracing is off by default. Pass --metrics to
+collect per-lift counters and step timings (instrumentation.METRICS) and
+print them to stderr when the run ends.
+
+Pass --record=PATH to run the event-driven engine without a window and
+save every tick of the run to a binary trace (see tracefile.py); this
+works for arrival streams too. Open it later with --replay=PATH to watch
+and scrub through it in the GUI:
+    python main.py inputs/input_high.txt --record=results/high.ltrc
+    python main.py day.jsonl --record=results/day.ltrc
+    python main.py --replay=results/high.ltrc
+"""
+
+import logging
+import sys
+from typing import Dict, Any, List
+from arrivals import is_timestamped, iter_text_floor_requests, read_building
+from instrumentation import METRICS, TRACE, parse_level
+from simulation import build_engine, prepare_lifts, run_simulation
+from tracefile import record_engine
+from utils import log_event
+
+import tkinter as tk
+from gui import MultiLiftGUI
+
+def parse_input_file(file_path: str) -> Dict[str, Any]:
+    """
+    Reads the original text format into a config dictionary with a static
+    {floor: [destinations]} request map. The file is streamed line by line
+    (see arrivals.py); timestamped JSONL/CSV files go through
+    timestamped_config instead.
+    """
+    config: Dict[str, Any] = {}
+    requests: Dict[int, list] = {}
+    try:
+        num_floors, capacity = read_building(file_path)
+        config["num_floors"] = num_floors
+        config["capacity"] = capacity
+        for floor, destinations in iter_text_floor_requests(file_path):
+            requests[floor] = destinations
+        config["requests"] = requests
+        config["algorithm"] = "SCAN"
+        config["simulation_time"] = 100
+        return config
+    except Exception as e:
+        raise ValueError(f"Error parsing input file '{file_path}': {e}")
+
+def timestamped_config(file_path: str) -> Dict[str, Any]:
+    """
+    Builds a config for a timestamped JSONL/CSV arrival file. Only the
+    building header is read here; the arrivals are streamed while the
+    simulation runs (config['arrivals_file']).
+    """
+    try:
+        num_floors, capacity = read_building(file_path)
+    except Exception as e:
+        raise ValueError(f"Error parsing input file '{file_path}': {e}")
+    return {
+        "num_floors": num_floors,
+        "capacity": capacity,
+        "requests": {},
+        "arrivals_file": file_path,
+        "algorithm": "SCAN",
+        "simulation_time": 100
+    }
+
+def main() -> None:
+    args = [a for a in sys.argv[1:] if a != "--metrics"]
+    metrics = len(args) != len(sys.argv) - 1
+    if metrics:
+        METRICS.reset()
+        METRICS.enabled = True
+    try:
+        _run(args)
+    finally:
+        if metrics:
+            METRICS.dump()
+            METRICS.enabled = False
+
+def _run(argv: List[str]) -> None:
+    """
+    Runs main() on the command-line arguments (without --metrics).
+    """
+    args = [a for a in argv if a != "--headless"]
+    headless = len(args) != len(argv)
+    for option in [a for a in args if a.startswith("--trace=")]:
+        args.remove(option)
+        try:
+            level = parse_level(option.split("=", 1)[1])
+            TRACE.configure(level=level, echo=True)
+            logging.getLogger().setLevel(min(level, logging.INFO))
+        except ValueError as ve:
+            log_event(f"[ERROR] {ve}")
+            sys.exit(1)
+    record_path = replay_path = None
+    for option in [a for a in args if a.startswith(("--record=", "--replay="))]:
+        args.remove(option)
+        if option.startswith("--record="):
+            record_path = option.split("=", 1)[1]
+        else:
+            replay_path = option.split("=", 1)[1]
+    if replay_path:
+        root = tk.Tk()
+        try:
+            gui = MultiLiftGUI.from_trace(root, replay_path)
+        except (OSError, ValueError) as e:
+            log_event(f"[ERROR] Cannot replay '{replay_path}': {e}")
+            root.destroy()
+            sys.exit(1)
+        root.mainloop()
+        gui.trace.close()
+        return
+    if args:
+        input_file = args[0]
+        try:
+            if is_timestamped(input_file):
+                config = timestamped_config(input_file)
+            else:
+                config = parse_input_file(input_file)
+        except ValueError as ve:
+            log_event(f"[ERROR] {ve}")
+            sys.exit(1)
+    else:
+        config = {
+            "num_floors": 5,
+            "capacity": 4,
+            "requests": {
+                1: [3, 5],
+                2: [4],
+                3: [],
+                4: [1],
+                5: []
+            },
+            "algorithm": "SCAN",
+            "simulation_time": 100
+        }
+    if "num_lifts" not in config:
+        config["num_lifts"] = 2
+    log_event(f"Starting simulation with configuration: {config}")
+    # arrival streams are validated as they are read, so bad input can
+    # still surface once the simulation is running
+    if record_path:
+        try:
+            results = record_engine(build_engine(config), record_path, num_floors=config["num_floors"])
+        except ValueError as ve:
+            log_event(f"[ERROR] {ve}")
+            sys.exit(1)
+        log_event(f"Recorded {results['total_time']} steps to {record_path}.")
+        return
+    if headless or "arrivals_file" in config:
+        # the GUI only replays a static request map; arrival streams run headless
+        try:
+            run_simulation(config)
+        except ValueError as ve:
+            log_event(f"[ERROR] {ve}")
+            sys.exit(1)
+        log_event("Simulation completed.")
+        return
+    lifts = prepare_lifts(config)
+    root = tk.Tk()
+    gui = MultiLiftGUI(root, lifts=lifts, algorithm=config.get("algorithm", "SCAN"),
+                       num_floors=config["num_floors"], num_lifts=config["num_lifts"])
+    root.mainloop()
+    log_event("GUI simulation completed.")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
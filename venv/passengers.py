@@ -0,0 +1,108 @@
+"""
+passengers.py
+
+Compact passenger records for the simulation engine.
+
+A day-long run can see millions of passengers, but only the ones in
+flight (waiting for a lift or riding in one) have to be remembered: once
+a passenger alights, their wait and ride go into the latency histograms
+and the record is no longer needed. PassengerTable stores the in-flight
+passengers as parallel typed arrays indexed by a small integer id rather
+than one object per passenger, and hands the id of every passenger that
+has alighted to the next one, so memory follows the peak number of
+passengers in the building, not the number served.
+
+Columns (index = passenger id):
+  - origin, destination       array('i')
+  - arrival_time, boarded_at  array('d')   (boarded_at is NaN while waiting)
+"""
+
+import math
+from array import array
+from typing import Tuple
+
+class PassengerTable:
+    """
+    In-flight passengers as parallel arrays with id reuse.
+
+    Usage:
+        table = PassengerTable()
+        pid = table.add(origin=1, destination=7, arrival_time=12.5)
+        wait = table.board(pid, now=15)
+        wait, ride = table.alight(pid, now=21)   # pid is free again
+    """
+
+    __slots__ = ("origin", "destination", "arrival_time", "boarded_at", "_free",
+                 "in_flight", "peak", "total")
+
+    def __init__(self):
+        self.origin = array('i')
+        self.destination = array('i')
+        self.arrival_time = array('d')
+        self.boarded_at = array('d')
+        self._free = array('i')  # ids of passengers who have alighted
+        self.in_flight = 0
+        self.peak = 0    # most passengers in flight at once
+        self.total = 0   # passengers ever added
+
+    def add(self, origin: int, destination: int, arrival_time: float) -> int:
+        """
+        Records a new waiting passenger and returns their id.
+        """
+        if origin == destination:
+            raise ValueError(f"Invalid passenger: origin and destination are both floor {origin}.")
+        if self._free:
+            pid = self._free.pop()
+            self.origin[pid] = origin
+            self.destination[pid] = destination
+            self.arrival_time[pid] = arrival_time
+            self.boarded_at[pid] = math.nan
+        else:
+            pid = len(self.origin)
+            self.origin.append(origin)
+            self.destination.append(destination)
+            self.arrival_time.append(arrival_time)
+            self.boarded_at.append(math.nan)
+        self.in_flight += 1
+        self.total += 1
+        if self.in_flight > self.peak:
+            self.peak = self.in_flight
+        return pid
+
+    def board(self, pid: int, now: float) -> float:
+        """
+        Marks a passenger as on board and returns how long they waited.
+        """
+        self.boarded_at[pid] = now
+        return now - self.arrival_time[pid]
+
+    def alight(self, pid: int, now: float) -> Tuple[float, float]:
+        """
+        Removes a passenger who has reached their destination and returns
+        (wait, ride). The id may be handed out again by add().
+        """
+        boarded_at = self.boarded_at[pid]
+        if math.isnan(boarded_at):
+            raise ValueError(f"Passenger {pid} cannot alight before boarding.")
+        self.boarded_at[pid] = math.nan
+        self._free.append(pid)
+        self.in_flight -= 1
+        return boarded_at - self.arrival_time[pid], now - boarded_at
+
+    def __len__(self) -> int:
+        return self.in_flight
+
+    @property
+    def slots(self) -> int:
+        """
+        Number of allocated records (never more than the peak in flight).
+        """
+        return len(self.origin)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the column arrays.
+        """
+        return sum(column.itemsize * len(column) for column in
+                   (self.origin, self.destination, self.arrival_time, self.boarded_at, self._free))
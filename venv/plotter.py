@@ -0,0 +1,114 @@
+from typing import Dict, Optional, Union
+
+import matplotlib.pyplot as plt
+
+from latency import PERCENTILES, LatencyRecorder
+
+def plot_metrics(
+    total_time: float,
+    total_distance: int,
+    serviced_count: int,
+    throughput: float,
+    output_file: str = "results/charts/metrics.png",
+    latency: Optional[Union[LatencyRecorder, Dict[str, LatencyRecorder]]] = None
+) -> None:
+    """
+    Generates a bar chart for the given performance metrics and saves the result.
+
+    :param total_time: Total simulation time in seconds.
+    :param total_distance: Total floors traveled by the lift.
+    :param serviced_count: Total number of serviced requests.
+    :param throughput: Throughput (requests per second).
+    :param output_file: The path to save the chart image.
+    :param latency: Optional latency histograms (one LatencyRecorder, or
+                    {algorithm: LatencyRecorder} to compare algorithms).
+                    Adds panels for the wait-time distribution, the
+                    p50/p95/p99/max of wait and ride time per algorithm,
+                    and the wait percentiles per lift.
+    """
+    # Prepare metrics for the bar chart
+    metrics = {
+        "Total Time (s)": total_time,
+        "Total Distance (floors)": total_distance,
+        "Serviced Requests": serviced_count,
+        "Throughput (req/s)": throughput
+    }
+
+    names = list(metrics.keys())
+    values = list(metrics.values())
+
+    if isinstance(latency, LatencyRecorder):
+        latency = {latency.algorithm or "run": latency}
+
+    # Create a figure and bar chart
+    if latency:
+        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        ax = axes[0][0]
+    else:
+        fig, ax = plt.subplots(figsize=(8, 6))
+    ax.bar(names, values, color="skyblue")
+    ax.set_title("Simulation Performance Metrics")
+    ax.set_ylabel("Value")
+
+    if latency:
+        _plot_wait_cdf(axes[0][1], latency)
+        _plot_percentiles_by_algorithm(axes[1][0], latency)
+        _plot_wait_by_lift(axes[1][1], latency)
+
+    # Adjust layout and save the figure
+    fig.tight_layout()
+    fig.savefig(output_file)
+    plt.close(fig)
+
+def _plot_wait_cdf(ax, latency: Dict[str, LatencyRecorder]) -> None:
+    """
+    Cumulative share of requests picked up within x ticks, per algorithm,
+    drawn from the histogram buckets.
+    """
+    for algorithm, recorder in latency.items():
+        histogram = recorder.overall["wait"]
+        if not histogram.count:
+            continue
+        xs, ys, seen = [0.0], [0.0], 0
+        for lower, upper, count in histogram.buckets():
+            seen += count
+            xs.append(min(upper, histogram.max))
+            ys.append(seen / histogram.count)
+        ax.step(xs, ys, where="post", label=algorithm)
+    ax.set_title("Wait Time Distribution")
+    ax.set_xlabel("Wait (ticks)")
+    ax.set_ylabel("Share of requests")
+    ax.legend()
+
+def _plot_percentiles_by_algorithm(ax, latency: Dict[str, LatencyRecorder]) -> None:
+    """
+    Grouped bars: p50/p95/p99/max of wait and ride time for each algorithm.
+    """
+    stats = [f"p{q}" for q in PERCENTILES] + ["max"]
+    groups = [(algorithm, kind) for algorithm in latency for kind in ("wait", "ride")]
+    width = 0.8 / len(stats)
+    for offset, stat in enumerate(stats):
+        heights = [latency[algorithm].overall[kind].summary()[stat] or 0 for algorithm, kind in groups]
+        ax.bar([i + offset * width for i in range(len(groups))], heights, width, label=stat)
+    ax.set_xticks([i + width * (len(stats) - 1) / 2 for i in range(len(groups))])
+    ax.set_xticklabels([f"{algorithm}\n{kind}" for algorithm, kind in groups])
+    ax.set_title("Wait / Ride Percentiles by Algorithm")
+    ax.set_ylabel("Ticks")
+    ax.legend()
+
+def _plot_wait_by_lift(ax, latency: Dict[str, LatencyRecorder]) -> None:
+    """
+    p50/p95/p99/max wait per lift, one line per statistic and algorithm.
+    """
+    stats = [f"p{q}" for q in PERCENTILES] + ["max"]
+    for algorithm, recorder in latency.items():
+        lift_ids = sorted(recorder.by_lift)
+        for stat in stats:
+            ax.plot(range(len(lift_ids)),
+                    [recorder.by_lift[lift_id]["wait"].summary()[stat] for lift_id in lift_ids],
+                    marker="o", label=f"{algorithm} {stat}")
+        ax.set_xticks(range(len(lift_ids)))
+        ax.set_xticklabels([f"Lift {lift_id}" for lift_id in lift_ids])
+    ax.set_title("Wait Percentiles by Lift")
+    ax.set_ylabel("Ticks")
+    ax.legend(fontsize="small")
@@ -0,0 +1,545 @@
+"""
+simulation.py
+
+This module prepares multiple lifts by:
+  - Defining a Request class (optional).
+  - Parsing the config (floors, requests, etc.).
+  - Creating multiple Lift objects (from lift.py).
+  - Distributing requests among them with a pluggable Dispatcher
+    (least-loaded, nearest-car or estimated time of arrival).
+
+prepare_lifts does NOT run SCAN/LOOK/MYLIFT; the GUI steps the lifts itself.
+run_simulation is the headless path: it runs the event-driven engine in
+engine.py, with the static request map streamed in as t=0 arrivals so
+passengers board at their origin and lift capacity applies, and logs the
+results.
+"""
+
+import heapq
+import itertools
+import math
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+from arrivals import Arrival, iter_arrivals, iter_request_map_arrivals
+from engine import SimulationEngine
+from lift import Lift
+from utils import log_event
+
+@dataclass
+class Request:
+    """
+    Represents a request from an origin floor to a destination floor.
+    You can keep or remove this if you like. It's optional:
+      - Because you might only need 'destination' in your multi-lift approach.
+      - Or you can keep origin/destination for advanced logic or logging.
+    Wait and ride times are not kept here: the engine records them per
+    passenger (passengers.PassengerTable) into latency.LatencyRecorder.
+    waiting_time is deprecated and kept only for existing callers; nothing
+    updates it.
+    """
+    origin: int
+    destination: int
+    direction: str = field(init=False)  # "UP" or "DOWN"
+    waiting_time: int = 0  # deprecated: never updated, see latency.LatencyRecorder
+    priority: int = 0      # used by MYLIFT if needed
+
+    def __post_init__(self) -> None:
+        if self.destination > self.origin:
+            self.direction = "UP"
+        elif self.destination < self.origin:
+            self.direction = "DOWN"
+        else:
+            raise ValueError(
+                f"Invalid request: origin {self.origin} and destination "
+                f"{self.destination} are the same."
+            )
+
+class Dispatcher:
+    """
+    Base class for dispatch strategies: picks which lift gets a new request.
+
+    Lifts are referred to by their index in the 'lifts' list. Every
+    strategy keeps incrementally updated structures instead of scanning
+    all lifts per request:
+      - min/max heaps of (load, index), invalidated lazily, for the least
+        and most loaded lifts;
+      - a sorted list of (floor, index) of the floor each lift is at or
+        committed to (the target of its current leg), searched outwards
+        from the request's origin with bisect.
+    Whoever moves the lifts must call update() when a lift's load,
+    committed floor or direction changes (SimulationEngine does this).
+    """
+
+    name = ""
+
+    def __init__(self, lifts: List[Lift]):
+        self.lifts = lifts
+        self._loads = [len(lf.requests) for lf in lifts]
+        self._floors = [lf.current_floor for lf in lifts]
+        self._directions = [lf.direction for lf in lifts]
+        self._available_at: List[Optional[int]] = [None] * len(lifts)
+        self._min_heap = [(load, i) for i, load in enumerate(self._loads)]
+        self._max_heap = [(-load, i) for i, load in enumerate(self._loads)]
+        heapq.heapify(self._min_heap)
+        heapq.heapify(self._max_heap)
+        self._by_floor = sorted((floor, i) for i, floor in enumerate(self._floors))
+
+    def select(self, request: Request, now: int = 0) -> int:
+        """
+        Returns the index of the lift that should serve the request.
+        """
+        raise NotImplementedError
+
+    def assign(self, request: Request, now: int = 0) -> int:
+        """
+        Selects a lift, gives it the request's destination and returns its index.
+        """
+        index = self.select(request, now)
+        self.lifts[index].add_request(request.destination)
+        self.update(index)
+        return index
+
+    def update(self, index: int, floor: Optional[int] = None,
+               direction: Optional[str] = None, available_at: Optional[int] = None) -> None:
+        """
+        Records a change to one lift.
+
+        :param floor: The floor the lift is at, or the target of the leg it
+                      has committed to (defaults to lift.current_floor).
+        :param direction: Direction of travel (defaults to lift.direction).
+        :param available_at: Tick at which a moving lift reaches that floor
+                             (not in the past); None if it is already there.
+        """
+        lift = self.lifts[index]
+        floor = lift.current_floor if floor is None else floor
+        self._directions[index] = lift.direction if direction is None else direction
+        self._available_at[index] = available_at
+
+        load = len(lift.requests)
+        if load != self._loads[index]:
+            self._loads[index] = load
+            heapq.heappush(self._min_heap, (load, index))
+            heapq.heappush(self._max_heap, (-load, index))
+            if len(self._min_heap) > 4 * len(self.lifts) + 16:
+                self._compact()
+
+        if floor != self._floors[index]:
+            del self._by_floor[bisect_left(self._by_floor, (self._floors[index], index))]
+            insort(self._by_floor, (floor, index))
+            self._floors[index] = floor
+
+    def least_loaded(self) -> int:
+        """
+        Index of the lift with the fewest requests (lowest index on ties).
+        """
+        while self._min_heap[0][0] != self._loads[self._min_heap[0][1]]:
+            heapq.heappop(self._min_heap)
+        return self._min_heap[0][1]
+
+    def most_loaded(self) -> int:
+        """
+        Index of the lift with the most requests (lowest index on ties).
+        """
+        while -self._max_heap[0][0] != self._loads[self._max_heap[0][1]]:
+            heapq.heappop(self._max_heap)
+        return self._max_heap[0][1]
+
+    def rebalance(self, index: int) -> Optional[Tuple[int, int]]:
+        """
+        Called when lift 'index' runs out of work. Picks a pending floor of
+        the busiest lift (the one nearest to the idle lift, but not the
+        floor the busy lift is already heading to) to hand over.
+
+        :return: (floor, donor_index), or None if nothing is worth moving.
+        """
+        donor = self.most_loaded()
+        if donor == index or self._loads[donor] < 2:
+            return None
+        pending = self.lifts[donor].requests
+        here = self.lifts[index].current_floor
+        committed = self._floors[donor]
+        above = pending.next_above(here - 1)
+        if above == committed:
+            above = pending.next_above(committed)
+        below = pending.next_below(here)
+        if below == committed:
+            below = pending.next_below(committed)
+        candidates = [f for f in (above, below) if f is not None]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda f: abs(f - here)), donor
+
+    def _nearest_first(self, origin: int):
+        """
+        Yields (distance, index) for lifts in non-decreasing order of the
+        distance between their committed floor and 'origin'.
+        """
+        by_floor = self._by_floor
+        right = bisect_left(by_floor, (origin, -1))
+        left = right - 1
+        while left >= 0 or right < len(by_floor):
+            left_dist = origin - by_floor[left][0] if left >= 0 else None
+            right_dist = by_floor[right][0] - origin if right < len(by_floor) else None
+            if right_dist is None or (left_dist is not None and
+                                      (left_dist, by_floor[left][1]) < (right_dist, by_floor[right][1])):
+                yield left_dist, by_floor[left][1]
+                left -= 1
+            else:
+                yield right_dist, by_floor[right][1]
+                right += 1
+
+    def _compact(self) -> None:
+        self._min_heap = [(load, i) for i, load in enumerate(self._loads)]
+        self._max_heap = [(-load, i) for i, load in enumerate(self._loads)]
+        heapq.heapify(self._min_heap)
+        heapq.heapify(self._max_heap)
+
+
+class LeastLoadedDispatcher(Dispatcher):
+    """
+    Gives the request to the lift with the fewest pending requests
+    (the original prepare_lifts rule), in O(log L) instead of O(L).
+    """
+
+    name = "least_loaded"
+
+    def select(self, request: Request, now: int = 0) -> int:
+        return self.least_loaded()
+
+
+class NearestCarDispatcher(Dispatcher):
+    """
+    Gives the request to the lift whose committed floor is closest to the
+    request's origin (lowest index on ties).
+    """
+
+    name = "nearest"
+
+    def select(self, request: Request, now: int = 0) -> int:
+        best = None
+        for distance, index in self._nearest_first(request.origin):
+            if best is not None and distance > best[0]:
+                break
+            if best is None or (distance, index) < best:
+                best = (distance, index)
+        return best[1]
+
+
+class _FloorMinTree:
+    """
+    Segment tree giving the minimum (key, index) over a range of floors,
+    with any number of lifts per floor. Each floor keeps a small lazy heap
+    of its lifts' entries; the tree holds the best entry of each floor.
+    """
+
+    _EMPTY = (math.inf, -1)
+
+    def __init__(self, num_floors: int):
+        self.num_floors = num_floors
+        self._size = 1
+        while self._size < num_floors + 1:
+            self._size *= 2
+        self._tree = [self._EMPTY] * (2 * self._size)
+        self._entries: Dict[int, Dict[int, float]] = {}
+        self._heaps: Dict[int, List[Tuple[float, int]]] = {}
+
+    def set(self, floor: int, index: int, key: float) -> None:
+        self._entries.setdefault(floor, {})[index] = key
+        heap = self._heaps.setdefault(floor, [])
+        heapq.heappush(heap, (key, index))
+        if len(heap) > 2 * len(self._entries[floor]) + 8:
+            self._heaps[floor] = heap = [(k, i) for i, k in self._entries[floor].items()]
+            heapq.heapify(heap)
+        self._refresh(floor)
+
+    def discard(self, floor: int, index: int) -> None:
+        entries = self._entries.get(floor)
+        if entries and index in entries:
+            del entries[index]
+            self._refresh(floor)
+
+    def min_in(self, lo: int, hi: Optional[int] = None) -> Tuple[float, int]:
+        """
+        Minimum (key, index) over floors lo..hi inclusive (hi defaults to
+        the top floor).
+        """
+        if hi is None:
+            hi = self.num_floors
+        lo, hi = max(lo, 0) + self._size, min(hi, self._size - 1) + self._size + 1
+        best = self._EMPTY
+        while lo < hi:
+            if lo & 1:
+                best = min(best, self._tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                best = min(best, self._tree[hi])
+            lo >>= 1
+            hi >>= 1
+        return best
+
+    def _refresh(self, floor: int) -> None:
+        entries, heap = self._entries[floor], self._heaps[floor]
+        while heap and entries.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        tree, pos = self._tree, floor + self._size
+        tree[pos] = heap[0] if heap else self._EMPTY
+        pos >>= 1
+        while pos:
+            best = min(tree[2 * pos], tree[2 * pos + 1])
+            if tree[pos] == best:
+                break  # nothing above this node changes
+            tree[pos] = best
+            pos >>= 1
+
+
+class ETADispatcher(Dispatcher):
+    """
+    Gives the request to the lift with the lowest estimated time of arrival
+    at the request's origin:
+
+        ticks until the current leg ends (busy lifts only)
+        + floors to the origin, continuing to the furthest pending floor
+          first if the origin is behind the direction of travel
+        + stop_penalty per pending request
+
+    For a fixed lift this is linear in the origin on each side of the
+    lift's committed floor f: key_left + origin for origins above f,
+    key_right - origin for origins below f, and key_here at f. Lifts are
+    stored under f in range-minimum trees of those keys (idle and busy
+    lifts apart, because only busy lifts' wait depends on the clock), so
+    the best lift is found with a few O(log floors) range queries.
+    """
+
+    name = "eta"
+
+    def __init__(self, lifts: List[Lift], stop_penalty: int = 2):
+        super().__init__(lifts)
+        self.stop_penalty = stop_penalty
+        num_floors = max((lf.top_floor for lf in lifts), default=1)
+        # _trees[busy] = (left, right, here)
+        self._trees = {busy: tuple(_FloorMinTree(num_floors) for _ in range(3))
+                       for busy in (False, True)}
+        self._placed: List[Optional[Tuple[bool, int]]] = [None] * len(lifts)
+        for index in range(len(lifts)):
+            self._place(index)
+
+    def update(self, index: int, floor: Optional[int] = None,
+               direction: Optional[str] = None, available_at: Optional[int] = None) -> None:
+        super().update(index, floor, direction, available_at)
+        self._place(index)
+
+    def eta(self, index: int, origin: int, now: int = 0) -> int:
+        floor = self._floors[index]
+        pending = self.lifts[index].requests
+        if self._directions[index] == "UP" and origin < floor:
+            turn = max(floor, pending.highest() or floor)
+            travel = (turn - floor) + (turn - origin)
+        elif self._directions[index] == "DOWN" and origin > floor:
+            turn = min(floor, pending.lowest() or floor)
+            travel = (floor - turn) + (origin - turn)
+        else:
+            travel = abs(origin - floor)
+        available_at = self._available_at[index]
+        wait = available_at - now if available_at is not None else 0
+        return wait + travel + self.stop_penalty * len(pending)
+
+    def select(self, request: Request, now: int = 0) -> int:
+        origin = request.origin
+        best = None
+        for busy, shift in ((False, 0), (True, -now)):
+            left, right, here = self._trees[busy]
+            for (key, index), offset in ((left.min_in(1, origin - 1), origin),
+                                         (right.min_in(origin + 1), -origin),
+                                         (here.min_in(origin, origin), 0)):
+                if index >= 0:
+                    candidate = (key + offset + shift, index)
+                    if best is None or candidate < best:
+                        best = candidate
+        return best[1]
+
+    def _place(self, index: int) -> None:
+        """
+        (Re)inserts a lift's keys into the trees after any change.
+        """
+        if self._placed[index] is not None:
+            busy, floor = self._placed[index]
+            for tree in self._trees[busy]:
+                tree.discard(floor, index)
+
+        floor = self._floors[index]
+        pending = self.lifts[index].requests
+        available_at = self._available_at[index]
+        busy = available_at is not None
+        cost = self.stop_penalty * len(pending) + (available_at if busy else 0)
+        if self._directions[index] == "UP":
+            key_left = cost - floor
+            key_right = cost + 2 * max(floor, pending.highest() or floor) - floor
+        else:
+            key_left = cost + floor - 2 * min(floor, pending.lowest() or floor)
+            key_right = cost + floor
+        left, right, here = self._trees[busy]
+        left.set(floor, index, key_left)
+        right.set(floor, index, key_right)
+        here.set(floor, index, cost)
+        self._placed[index] = (busy, floor)
+
+
+DISPATCHERS = {
+    cls.name: cls for cls in (LeastLoadedDispatcher, NearestCarDispatcher, ETADispatcher)
+}
+
+def make_dispatcher(strategy, lifts: List[Lift]) -> Dispatcher:
+    """
+    Returns a Dispatcher for the lifts. 'strategy' is a Dispatcher
+    instance (returned as is) or one of the names in DISPATCHERS.
+    """
+    if isinstance(strategy, Dispatcher):
+        return strategy
+    if strategy not in DISPATCHERS:
+        raise ValueError(f"Unknown dispatcher '{strategy}'. Expected one of {sorted(DISPATCHERS)}.")
+    return DISPATCHERS[strategy](lifts)
+
+def prepare_lifts(config: Dict[str, Any]) -> List[Lift]:
+    """
+    Creates multiple Lift objects, distributes requests among them, 
+    and returns the list of lifts. We do NOT run SCAN/LOOK/MYLIFT 
+    or any step-based approach here. The GUI or other external code
+    will handle the scheduling logic (step by step or otherwise).
+
+    :param config: 
+      - 'num_floors': total floors
+      - 'num_lifts': how many Lift objects to create
+      - 'requests': mapping of floor -> list of destinations
+      - (optional) 'capacity': passengers per lift (0 or missing: no limit)
+      - (optional) 'dispatcher': a name in DISPATCHERS (default 'least_loaded')
+      - (optional) other config data
+
+    :return: A list of Lift instances (with assigned requests).
+    """
+    num_floors = config.get("num_floors", 5)
+    num_lifts = config.get("num_lifts", 1)
+    requests_dict: Dict[int, List[int]] = config.get("requests", {})
+
+    # 1) Create multiple Lift objects
+    lifts = [Lift(lift_id=i, start_floor=1, top_floor=num_floors, capacity=config.get("capacity"))
+             for i in range(num_lifts)]
+
+    # 2) Distribute requests among lifts
+    dispatcher = make_dispatcher(config.get("dispatcher", "least_loaded"), lifts)
+    for origin_floor, destinations in requests_dict.items():
+        for dest_floor in destinations:
+            try:
+                request = _building_request(origin_floor, dest_floor, num_floors)
+            except ValueError as ve:
+                log_event(f"[ERROR] {ve}")
+                continue  # skip invalid request
+            dispatcher.assign(request)
+
+    log_event(f"Prepared {len(lifts)} lifts and assigned requests among them.")
+    return lifts
+
+def _building_request(origin: int, destination: int, num_floors: int) -> Request:
+    """
+    A Request between two floors of a building with floors 1..num_floors.
+    Raises ValueError for the same floor or a floor outside the building.
+    """
+    request = Request(origin=origin, destination=destination)
+    if not (1 <= origin <= num_floors and 1 <= destination <= num_floors):
+        raise ValueError(f"Invalid request: floor {origin} to floor {destination} is "
+                         f"outside the building (floors 1..{num_floors}).")
+    return request
+
+def static_arrivals(requests: Dict[int, List[int]], num_floors: int) -> Iterator[Arrival]:
+    """
+    A static {floor: [destinations]} request map as t=0 arrivals, skipping
+    (and logging) invalid requests like prepare_lifts does.
+    """
+    for arrival in iter_request_map_arrivals(requests.items()):
+        try:
+            _building_request(arrival.origin, arrival.destination, num_floors)
+        except ValueError as ve:
+            log_event(f"[ERROR] {ve}")
+            continue
+        yield arrival
+
+def build_engine(config: Dict[str, Any]) -> SimulationEngine:
+    """
+    Sets up the headless engine for a config.
+
+    By default the static request map is spread over the lifts by
+    prepare_lifts, exactly as the GUI gets it: each destination is a plain
+    stop, so the floors travelled, stops serviced and ticks match stepping
+    the lifts in MultiLiftGUI. With config['passengers'] set, the lifts
+    start empty and the map arrives at t=0 instead, so every request is a
+    passenger: picked up at its origin, timed and subject to the lifts'
+    capacity. Online arrivals are always passengers.
+
+    :param config: Same dictionary as prepare_lifts, plus 'algorithm' and
+                   optionally 'passengers' (see above), an online arrival
+                   stream: either 'arrivals' (an iterable of
+                   arrivals.Arrival) or 'arrivals_file' (a path streamed
+                   with arrivals.iter_arrivals), and 'dispatcher' /
+                   'reassign' (see SimulationEngine).
+    """
+    passengers = config.get("passengers", False)
+    lifts = prepare_lifts(dict(config, requests={}) if passengers else config)
+    num_floors = config.get("num_floors", 5)
+    if "arrivals_file" in config:
+        online = iter_arrivals(config["arrivals_file"], num_floors=num_floors)
+    else:
+        online = config.get("arrivals") or ()
+    static = static_arrivals(config.get("requests", {}), num_floors) if passengers else ()
+    arrivals = itertools.chain(static, online)
+    return SimulationEngine(lifts, algorithm=config.get("algorithm", "SCAN"), arrivals=arrivals,
+                            dispatcher=config.get("dispatcher", "least_loaded"),
+                            reassign=config.get("reassign", False))
+
+def run_simulation(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs the whole simulation headless (no Tk) and returns the results.
+
+    Builds the engine for the config (see build_engine), runs
+    config['algorithm'] on it and logs the summary. Time is measured in
+    ticks, where one tick is one floor moved (one GUI simulation step).
+
+    :param config: See build_engine.
+    :return: The results dictionary from SimulationEngine.results().
+    """
+    results = build_engine(config).run()
+
+    log_event("Simulation complete.")
+    log_event(f"Total simulation time: {results['total_time']} ticks")
+    log_event(f"Total travel distance: {results['total_distance']} floors")
+    log_event(f"Total serviced requests: {results['serviced_requests']}")
+    log_event(f"Throughput: {results['throughput']:.3f} requests/tick")
+    if results["left_behind"]:
+        log_event(f"Full lifts left {results['left_behind']} passengers behind "
+                  f"and bypassed {results['bypassed_calls']} hall calls")
+    wait = results["latency"]["wait"]
+    if wait["count"]:
+        log_event(f"Wait time (ticks): p50={wait['p50']:.1f} p95={wait['p95']:.1f} "
+                  f"p99={wait['p99']:.1f} max={wait['max']:.1f} over {wait['count']} requests")
+    return results
+
+if __name__ == "__main__":
+    # Example usage
+    example_config = {
+        "num_floors": 5,
+        "num_lifts": 2,
+        "requests": {
+            1: [3, 5],
+            2: [4],
+            3: [],
+            4: [1],
+            5: []
+        },
+        "algorithm": "SCAN",
+        "simulation_time": 100
+    }
+    lifts = prepare_lifts(example_config)
+    for lf in lifts:
+        print(f"Lift {lf.lift_id} -> requests: {lf.requests}")
+    run_simulation(example_config)
\ No newline at end of file
@@ -0,0 +1,246 @@
+"""
+sweep.py
+
+Parallel parameter sweep over algorithm x num_lifts x workload x seed.
+
+Each grid point is one headless run of the event-driven engine (engine.py).
+The simulation is pure CPU and holds the GIL, so jobs are fanned out over a
+multiprocessing pool. Each result row is appended to one table (CSV, or
+JSON Lines for .jsonl/.json files) and flushed as soon as its job finishes.
+If the output file already has rows, those jobs are skipped, so a sweep
+that was interrupted can be resumed by running the same command again;
+jobs whose rows record an error, or whose row was cut off by the crash,
+are run again.
+
+Example:
+    python sweep.py --algorithms SCAN LOOK MYLIFT --lifts 1 2 4 \\
+        --workloads inputs/input_high.txt uniform:50:2000 --seeds 0 1 2 \\
+        --out results/sweep.csv --workers 4
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from engine import ALGORITHMS
+from simulation import build_engine
+from utils import log_event
+from workload import generate_config, is_generated
+
+FIELDS = [
+    "algorithm", "num_lifts", "workload", "seed",
+    "num_floors", "total_time", "total_distance", "serviced_requests",
+    "throughput", "wall_time_s", "error",
+]
+
+def build_grid(algorithms: Iterable[str], lift_counts: Iterable[int],
+               workloads: Iterable[str], seeds: Iterable[int]) -> List[Dict[str, Any]]:
+    """
+    Returns one job dictionary per combination of the four axes.
+    """
+    return [
+        {"algorithm": algorithm.upper(), "num_lifts": num_lifts, "workload": workload, "seed": seed}
+        for algorithm, num_lifts, workload, seed
+        in itertools.product(algorithms, lift_counts, workloads, seeds)
+    ]
+
+def job_key(job: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    """
+    Identifies a job; values are compared as strings so rows read back
+    from CSV match the jobs that produced them.
+    """
+    return (str(job["algorithm"]).upper(), str(job["num_lifts"]), str(job["workload"]), str(job["seed"]))
+
+def load_config(workload: str, seed: int) -> Dict[str, Any]:
+    """
+    Builds the config for a job: a generated workload or an input file.
+    """
+    if is_generated(workload):
+        return generate_config(workload, seed)
+    from main import parse_input_file  # main imports tkinter; keep it lazy
+    return parse_input_file(workload)
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs one grid point and returns its result row. Errors are reported
+    in the row instead of aborting the whole sweep.
+    """
+    row = {field: "" for field in FIELDS}
+    row.update(job)
+    start = time.perf_counter()
+    try:
+        config = load_config(job["workload"], job["seed"])
+        config["num_lifts"] = job["num_lifts"]
+        config["algorithm"] = job["algorithm"]
+        results = build_engine(config).run()
+        row.update({
+            "num_floors": config["num_floors"],
+            "total_time": results["total_time"],
+            "total_distance": results["total_distance"],
+            "serviced_requests": results["serviced_requests"],
+            "throughput": round(results["throughput"], 6),
+        })
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["wall_time_s"] = round(time.perf_counter() - start, 6)
+    return row
+
+def read_rows(out_path: str) -> List[Dict[str, Any]]:
+    """
+    Reads the complete rows of an existing results file (none if it does
+    not exist). A last row cut off by a crash is left out, so its job is
+    run again.
+    """
+    return _read_rows(out_path)[0]
+
+def _read_rows(out_path: str) -> Tuple[List[Dict[str, Any]], bool]:
+    # -> (complete rows, whether the file held anything else)
+    if not os.path.exists(out_path):
+        return [], False
+    with open(out_path, 'r', encoding='utf-8', newline='') as f:
+        lines = f.read().splitlines(keepends=True)
+    # every row is written with its line ending and flushed, so a last
+    # line without one was cut off mid-row
+    truncated = bool(lines) and not lines[-1].endswith(("\n", "\r"))
+    if truncated:
+        lines.pop()
+    if _is_json(out_path):
+        return [json.loads(line) for line in lines if line.strip()], truncated
+    rows = list(csv.DictReader(lines))
+    complete = [row for row in rows if None not in row and None not in row.values()]
+    return complete, truncated or len(complete) != len(rows)
+
+def completed_keys(out_path: str) -> Set[Tuple[str, str, str, str]]:
+    """
+    Reads an existing results file and returns the keys of jobs that
+    finished without an error (failed jobs are run again on resume).
+    """
+    return {job_key(row) for row in read_rows(out_path) if not row.get("error")}
+
+class ResultWriter:
+    """
+    Appends result rows to a CSV or JSON Lines file, flushing after each row.
+    """
+
+    def __init__(self, out_path: str):
+        self.out_path = out_path
+        self.json = _is_json(out_path)
+        directory = os.path.dirname(out_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        new_file = not os.path.exists(out_path) or os.path.getsize(out_path) == 0
+        self._file = open(out_path, 'a', encoding='utf-8', newline='')
+        self._csv = None
+        if not self.json:
+            self._csv = csv.DictWriter(self._file, fieldnames=FIELDS)
+            if new_file:
+                self._csv.writeheader()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        if self.json:
+            self._file.write(json.dumps(row) + "\n")
+        else:
+            self._csv.writerow(row)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def run_sweep(jobs: List[Dict[str, Any]], out_path: str,
+              workers: Optional[int] = None, resume: bool = True) -> int:
+    """
+    Runs every job not already present in out_path and streams the rows
+    into it as they finish.
+
+    :param workers: Pool size (defaults to the number of CPUs). 1 runs in-process.
+    :param resume: Skip jobs whose rows are already in out_path.
+    :return: The number of jobs run.
+    """
+    done = completed_keys(out_path) if resume else set()
+    if not resume and os.path.exists(out_path):
+        _replace_rows(out_path, [])
+    elif resume:
+        _drop_incomplete_rows(out_path)
+    pending = [job for job in jobs if job_key(job) not in done]
+    log_event(f"Sweep: {len(jobs)} jobs, {len(jobs) - len(pending)} already done, "
+              f"{len(pending)} to run.")
+    if not pending:
+        return 0
+
+    with ResultWriter(out_path) as writer:
+        if workers == 1:
+            for job in pending:
+                writer.write(run_job(job))
+        else:
+            with multiprocessing.Pool(processes=workers, initializer=_quiet_worker) as pool:
+                for row in pool.imap_unordered(run_job, pending):
+                    writer.write(row)
+    log_event(f"Sweep finished: results in {out_path}")
+    return len(pending)
+
+def _drop_incomplete_rows(out_path: str) -> None:
+    # failed jobs are retried, so their old rows would end up next to the
+    # new ones; a cut-off last row would have the next row appended to it
+    rows, truncated = _read_rows(out_path)
+    kept = [row for row in rows if not row.get("error")]
+    if truncated or len(kept) != len(rows):
+        _replace_rows(out_path, kept)
+
+def _replace_rows(out_path: str, rows: List[Dict[str, Any]]) -> None:
+    """
+    Rewrites a results file with the given rows. They are written to a
+    temporary file next to it first and moved over it in one step, so a
+    crash never leaves the table missing or half written.
+    """
+    directory, name = os.path.split(out_path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=name + ".",
+                                    suffix=os.path.splitext(name)[1])
+    os.close(fd)
+    try:
+        with ResultWriter(tmp_path) as writer:
+            for row in rows:
+                writer.write(row)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def _quiet_worker() -> None:
+    # prepare_lifts logs once per job; keep the workers quiet
+    logging.getLogger().setLevel(logging.WARNING)
+
+def _is_json(path: str) -> bool:
+    return path.endswith((".jsonl", ".json"))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a parallel parameter sweep of lift simulations.")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS))
+    parser.add_argument("--lifts", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--workloads", nargs="+", required=True,
+                        help="input files and/or generated specs like uniform:50:2000")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--out", default="results/sweep.csv",
+                        help="results table (.csv, or .jsonl/.json for JSON Lines)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-resume", action="store_true",
+                        help="discard existing results instead of resuming")
+    args = parser.parse_args()
+
+    jobs = build_grid(args.algorithms, args.lifts, args.workloads, args.seeds)
+    run_sweep(jobs, args.out, workers=args.workers, resume=not args.no_resume)
+
+if __name__ == "__main__":
+    main()
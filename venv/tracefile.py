@@ -0,0 +1,236 @@
+"""
+tracefile.py
+
+Compact binary traces of per-step lift states, for replaying a run in
+MultiLiftGUI without simulating it again.
+
+Layout (little-endian):
+  - header (24 bytes): magic b"LTRC", version (u16), num_lifts (u16),
+    num_floors (u32), reserved (u32), algorithm (8 ASCII bytes, padded)
+  - one frame per step, starting with the state before the first step;
+    a frame is num_lifts records of 12 bytes:
+        floor (u16), flags (u8), padding, floors_traveled (u32),
+        serviced_requests (u32)
+    flags: FLAG_UP (direction), FLAG_MOVED (moved during the step),
+    FLAG_SERVICED (serviced a stop during the step)
+
+Every frame has the same size, so step k starts at a fixed offset and
+TraceReader can memory-map the file and jump to any step without reading
+the ones before it. Only the pages of the frames actually looked at are
+loaded, so overnight traces can be scrubbed without holding them in RAM.
+
+Traces are written either by the event-driven engine (record_engine,
+which is what python main.py --record uses, for static maps and arrival
+streams alike) or by stepping lifts floor by floor as the GUI does
+(record_trace).
+
+Examples:
+    results = record_engine(build_engine(config), "results/run.ltrc", num_floors=20)
+    steps = record_trace(prepare_lifts(config), "LOOK", "results/run.ltrc", num_floors=20)
+    with TraceReader("results/run.ltrc") as trace:
+        floors = trace.floors(trace.num_steps - 1)
+"""
+
+import mmap
+import os
+import struct
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from algorithms import single_step
+from lift import Lift
+
+MAGIC = b"LTRC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII8s")
+RECORD = struct.Struct("<HBxII")
+
+FLAG_UP = 1
+FLAG_MOVED = 2
+FLAG_SERVICED = 4
+
+class TraceWriter:
+    """
+    Appends one frame per step to a trace file.
+
+    Usage:
+        with TraceWriter(path, lifts, num_floors, "SCAN") as writer:
+            writer.write(lifts)            # state before the first step
+            while any(lf.requests for lf in lifts):
+                ...                        # step every lift
+                writer.write(lifts)
+    """
+
+    def __init__(self, path: str, lifts: List[Lift], num_floors: int, algorithm: str = ""):
+        if len(lifts) > 0xFFFF:
+            raise ValueError(f"A trace holds at most {0xFFFF} lifts, got {len(lifts)}.")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.num_lifts = len(lifts)
+        self.num_steps = 0
+        self._frame = bytearray(RECORD.size * self.num_lifts)
+        self._last: Optional[List[Tuple[int, int]]] = None  # (floor, serviced) per lift
+        self._file: BinaryIO = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.num_lifts, num_floors, 0,
+                                     algorithm.upper().encode("ascii")[:8]))
+
+    def write(self, lifts: List[Lift]) -> None:
+        """
+        Appends the current state of every lift as the next frame.
+        """
+        self.write_states([(lf.current_floor, lf.direction, lf.floors_traveled, lf.serviced_requests)
+                           for lf in lifts])
+
+    def write_states(self, states: List[Tuple[int, str, int, int]]) -> None:
+        """
+        Appends a frame from (floor, direction, floors_traveled,
+        serviced_requests) per lift, for callers that know where the
+        lifts are without Lift objects in that state (SimulationEngine).
+        """
+        if len(states) != self.num_lifts:
+            raise ValueError(f"Trace has {self.num_lifts} lifts, got {len(states)}.")
+        frame, last = self._frame, self._last
+        for i, (floor, direction, floors_traveled, serviced) in enumerate(states):
+            flags = FLAG_UP if direction == "UP" else 0
+            if last is not None:
+                last_floor, last_serviced = last[i]
+                if floor != last_floor:
+                    flags |= FLAG_MOVED
+                if serviced != last_serviced:
+                    flags |= FLAG_SERVICED
+            RECORD.pack_into(frame, i * RECORD.size, floor, flags, floors_traveled, serviced)
+        self._last = [(floor, serviced) for floor, _, _, serviced in states]
+        self._file.write(frame)
+        self.num_steps += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TraceReader:
+    """
+    Read-only, memory-mapped view of a trace file.
+
+    frame(step) / floors(step) only touch that step's bytes, so seeking is
+    O(num_lifts) wherever the step is in the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path} is too short to be a lift trace.")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        magic, version, self.num_lifts, self.num_floors, _, algorithm = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} lift trace.")
+        self.algorithm = algorithm.rstrip(b"\0").decode("ascii")
+        self.frame_size = RECORD.size * self.num_lifts
+        # a partly written last frame (e.g. a run that was killed) is ignored
+        self.num_steps = (size - HEADER.size) // self.frame_size if self.frame_size else 0
+
+    def _offset(self, step: int) -> int:
+        if not 0 <= step < self.num_steps:
+            raise IndexError(f"Step {step} is outside the trace (0..{self.num_steps - 1}).")
+        return HEADER.size + step * self.frame_size
+
+    def frame(self, step: int) -> List[Tuple[int, int, int, int]]:
+        """
+        (floor, flags, floors_traveled, serviced_requests) for every lift at 'step'.
+        """
+        offset = self._offset(step)
+        return list(RECORD.iter_unpack(self._map[offset:offset + self.frame_size]))
+
+    def floors(self, step: int) -> List[int]:
+        offset = self._offset(step)
+        return [floor for floor, _, _, _ in RECORD.iter_unpack(self._map[offset:offset + self.frame_size])]
+
+    def lifts(self, step: int = 0) -> List[Lift]:
+        """
+        Lift objects in the state recorded at 'step' (for display).
+        """
+        lifts = []
+        for i, record in enumerate(self.frame(step)):
+            lf = Lift(lift_id=i, start_floor=record[0], top_floor=self.num_floors)
+            apply_record(lf, record)
+            lifts.append(lf)
+        return lifts
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def apply_record(lift: Lift, record: Tuple[int, int, int, int]) -> None:
+    """
+    Copies a recorded state (floor, direction and counters) onto a Lift.
+    """
+    floor, flags, floors_traveled, serviced = record
+    lift.current_floor = floor
+    lift.direction = "UP" if flags & FLAG_UP else "DOWN"
+    lift.floors_traveled = floors_traveled
+    lift.serviced_requests = serviced
+
+
+def record_engine(engine, path: str, num_floors: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Runs a SimulationEngine to completion and writes its run to a trace
+    file, one frame per tick (the engine works out where each lift is
+    between stops). Unlike record_trace this follows exactly what the
+    engine did, including streamed arrivals and capacity.
+    Returns the engine's results; results["total_time"] + 1 frames are written.
+
+    :param num_floors: Stored in the header (defaults to the highest top_floor).
+    """
+    if num_floors is None:
+        num_floors = max((lf.top_floor for lf in engine.lifts), default=1)
+    with TraceWriter(path, engine.lifts, num_floors, engine.algorithm) as writer:
+        engine.trace = writer
+        try:
+            return engine.run()
+        finally:
+            engine.trace = None
+
+
+def record_trace(lifts: List[Lift], algorithm: str, path: str,
+                 num_floors: Optional[int] = None, max_steps: Optional[int] = None) -> int:
+    """
+    Steps the lifts one floor per tick, exactly as MultiLiftGUI does, and
+    writes every step to a trace file. Returns the number of steps run.
+
+    :param num_floors: Stored in the header (defaults to the highest top_floor).
+    :param max_steps: Stop after this many steps even if requests remain.
+    """
+    if num_floors is None:
+        num_floors = max((lf.top_floor for lf in lifts), default=1)
+    schedulers: Dict[Any, Any] = {}
+    steps = 0
+    with TraceWriter(path, lifts, num_floors, algorithm) as writer:
+        writer.write(lifts)
+        while any(lf.requests for lf in lifts) and (max_steps is None or steps < max_steps):
+            for lf in lifts:
+                if lf.requests:
+                    single_step(lf, algorithm, schedulers)
+            writer.write(lifts)
+            steps += 1
+    return steps
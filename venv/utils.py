@@ -0,0 +1,64 @@
+"""
+utils.py
+
+Provides helper functions for logging, performance metrics, and other 
+utilities in a multi-lift scenario.
+"""
+
+import logging
+import time
+
+from instrumentation import METRICS
+
+# Setup basic logging if needed
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%H:%M:%S"
+)
+
+# Global counters live in instrumentation.METRICS; timed lift steps
+# (METRICS.enabled) add to them automatically.
+
+def log_event(message: str) -> None:
+    """
+    Logs a message using Python's logging module at INFO level.
+    For per-step messages use instrumentation.TRACE instead.
+    """
+    logging.info(message)
+
+def reset_total_distance() -> None:
+    """
+    Resets the global distance counter to zero.
+    """
+    METRICS.total_distance = 0
+
+def get_total_distance() -> int:
+    """
+    Returns the global distance traveled (floors).
+    """
+    return METRICS.total_distance
+
+def add_to_total_distance(amount: int) -> None:
+    """
+    Adds the given amount to the global distance counter.
+    """
+    METRICS.total_distance += amount
+
+def reset_serviced_count() -> None:
+    """
+    Resets the global serviced requests counter to zero.
+    """
+    METRICS.total_serviced = 0
+
+def get_serviced_count() -> int:
+    """
+    Returns the global number of serviced requests (across all lifts).
+    """
+    return METRICS.total_serviced
+
+def increment_serviced_requests() -> None:
+    """
+    Increment the global serviced requests counter by 1.
+    """
+    METRICS.total_serviced += 1
@@ -0,0 +1,124 @@
+"""
+workload.py
+
+Seeded synthetic workloads, returned in the same {origin: [destinations]}
+shape as main.parse_input_file so they can be fed to prepare_lifts.
+
+A workload spec is either a path to an input file or
+'<generator>:<num_floors>:<num_requests>', e.g. 'uniform:50:2000'.
+Generators: uniform, up_peak (from the lobby), down_peak (to the lobby)
+and inter_floor (between upper floors).
+"""
+
+import random
+from typing import Any, Dict, List
+
+def uniform_requests(num_floors: int, num_requests: int, rng: random.Random) -> Dict[int, List[int]]:
+    """
+    Every request has a uniformly random origin and a different,
+    uniformly random destination.
+    """
+    if num_floors < 2:
+        raise ValueError("A generated workload needs at least 2 floors.")
+    requests: Dict[int, List[int]] = {}
+    for _ in range(num_requests):
+        origin, dest = _random_pair(num_floors, rng)
+        requests.setdefault(origin, []).append(dest)
+    return requests
+
+def up_peak_requests(num_floors: int, num_requests: int, rng: random.Random) -> Dict[int, List[int]]:
+    """
+    Morning rush: most requests start at the lobby (floor 1) and go up;
+    one in ten is inter-floor traffic.
+    """
+    if num_floors < 2:
+        raise ValueError("A generated workload needs at least 2 floors.")
+    requests: Dict[int, List[int]] = {}
+    for _ in range(num_requests):
+        if rng.random() < 0.9:
+            origin, dest = 1, rng.randint(2, num_floors)
+        else:
+            origin, dest = _random_pair(num_floors, rng)
+        requests.setdefault(origin, []).append(dest)
+    return requests
+
+def down_peak_requests(num_floors: int, num_requests: int, rng: random.Random) -> Dict[int, List[int]]:
+    """
+    Evening rush: most requests go from an upper floor down to the lobby;
+    one in ten is inter-floor traffic.
+    """
+    if num_floors < 2:
+        raise ValueError("A generated workload needs at least 2 floors.")
+    requests: Dict[int, List[int]] = {}
+    for _ in range(num_requests):
+        if rng.random() < 0.9:
+            origin, dest = rng.randint(2, num_floors), 1
+        else:
+            origin, dest = _random_pair(num_floors, rng)
+        requests.setdefault(origin, []).append(dest)
+    return requests
+
+def inter_floor_requests(num_floors: int, num_requests: int, rng: random.Random) -> Dict[int, List[int]]:
+    """
+    Mid-day traffic between upper floors: neither end is the lobby.
+    """
+    if num_floors < 3:
+        raise ValueError("Inter-floor traffic needs at least 3 floors.")
+    requests: Dict[int, List[int]] = {}
+    for _ in range(num_requests):
+        origin, dest = _random_pair(num_floors - 1, rng)
+        requests.setdefault(origin + 1, []).append(dest + 1)
+    return requests
+
+def _random_pair(num_floors: int, rng: random.Random):
+    origin = rng.randint(1, num_floors)
+    dest = rng.randint(1, num_floors - 1)
+    if dest >= origin:
+        dest += 1
+    return origin, dest
+
+GENERATORS = {
+    "uniform": uniform_requests,
+    "up_peak": up_peak_requests,
+    "down_peak": down_peak_requests,
+    "inter_floor": inter_floor_requests,
+}
+
+def is_generated(spec: str) -> bool:
+    """
+    True if the spec names a generator rather than an input file.
+    """
+    return spec.split(":", 1)[0] in GENERATORS
+
+def generate_config(spec: str, seed: int) -> Dict[str, Any]:
+    """
+    Builds a config dictionary from a '<generator>:<floors>:<requests>' spec.
+
+    The random stream is seeded from both the spec and the seed, so the
+    same (spec, seed) pair gives the same requests in any process.
+    """
+    parts = spec.split(":")
+    if len(parts) != 3 or parts[0] not in GENERATORS:
+        raise ValueError(f"Workload spec must be '<generator>:<floors>:<requests>' "
+                         f"with generator in {sorted(GENERATORS)}, got '{spec}'.")
+    name, num_floors, num_requests = parts[0], int(parts[1]), int(parts[2])
+    rng = random.Random(f"{spec}:{seed}")
+    return {
+        "num_floors": num_floors,
+        "capacity": 4,
+        "requests": GENERATORS[name](num_floors, num_requests, rng),
+        "algorithm": "SCAN",
+        "simulation_time": 100,
+    }
+
+def write_input_file(config: Dict[str, Any], file_path: str) -> None:
+    """
+    Writes a config's request map in the original text input format
+    ('num_floors, capacity' then 'floor: dest, dest' lines), so generated
+    workloads can be fed to main.parse_input_file.
+    """
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(f"{config['num_floors']}, {config.get('capacity', 4)}\n")
+        for floor in range(1, config["num_floors"] + 1):
+            destinations = config["requests"].get(floor, [])
+            f.write(f"{floor}: {', '.join(str(d) for d in destinations)}\n")